@@ -21,8 +21,10 @@ Architecture:
 # IMPORTANT: Fix Tkinter path issue BEFORE importing tkinter
 import fix_tkinter  # This sets TCL_LIBRARY and TK_LIBRARY
 
+import os
 import tkinter as tk
 from Controllers import MainController
+from Services import Tracing
 
 
 def main():
@@ -32,7 +34,14 @@ def main():
 
     # Create and run controller (which initializes Model, View, and Services)
     controller = MainController(root)
-    controller.run()
+
+    # IMAGE_EDITOR_TRACE=trace.json records the whole session as a Chrome trace
+    trace_path = os.environ.get(Tracing.PATH_ENV)
+    if trace_path:
+        with Tracing.recording(trace_path):
+            controller.run()
+    else:
+        controller.run()
 
 
 if __name__ == "__main__":
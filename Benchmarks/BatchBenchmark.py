@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+BatchBenchmark.py - process_batch on a stack vs process() per image
+
+Runs each processor operation over N same-size images (thumbnails, a
+camera burst), once as N process() calls plus np.stack and once as one
+process_batch call on the (N, H, W, C) stack, and checks both agree.
+
+Usage:
+    python -m Benchmarks.BatchBenchmark [--count 64] [--width 320 --height 240] [--repeat 5]
+"""
+
+import argparse
+import numpy as np
+from Benchmarks.Metrics import max_abs_error, time_call
+from Benchmarks.Synthetic import make_image
+from Models.Processors import BrightnessProcessor, BrightnessOperation, BlurProcessor, BlurType
+from Models.Processors import TransformProcessor, TransformType
+
+OPERATIONS = [
+    (BrightnessProcessor, BrightnessOperation.INCREASE),
+    (BrightnessProcessor, BrightnessOperation.CONTRAST),
+    (BrightnessProcessor, BrightnessOperation.GAMMA),
+    (BrightnessProcessor, BrightnessOperation.AUTO),
+    (TransformProcessor, TransformType.FLIP_HORIZONTAL),
+    (TransformProcessor, TransformType.FLIP_VERTICAL),
+    (TransformProcessor, TransformType.ROTATE_180),
+    (TransformProcessor, TransformType.ROTATE_90_CW),
+    (BlurProcessor, BlurType.GAUSSIAN),
+]
+
+
+def run(count, width, height, repeat):
+    stack = np.stack([make_image(width, height, seed=i) for i in range(count)])
+    rows = []
+    for processor_class, operation in OPERATIONS:
+        processor = processor_class(operation)
+        loop_time, reference = time_call(lambda: np.stack([processor.process(image) for image in stack]), repeat)
+        batch_time, result = time_call(lambda: processor.process_batch(stack), repeat)
+        rows.append({
+            'op': f"{processor_class.__name__.replace('Processor', '')}.{operation.name}",
+            'vectorised': operation in processor.BATCH_STRATEGIES,
+            'loop_ms': loop_time * 1000,
+            'batch_ms': batch_time * 1000,
+            'speedup': loop_time / batch_time if batch_time > 0 else float('inf'),
+            'max_err': max_abs_error(reference, result),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=64)
+    parser.add_argument('--width', type=int, default=320)
+    parser.add_argument('--height', type=int, default=240)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'op':>26} {'vectorised':>10} {'loop ms':>8} {'batch ms':>9} {'speedup':>8} {'max_err':>7}")
+    for row in run(args.count, args.width, args.height, args.repeat):
+        print(f"{row['op']:>26} {'yes' if row['vectorised'] else 'no':>10} {row['loop_ms']:>8.2f} "
+              f"{row['batch_ms']:>9.2f} {row['speedup']:>7.1f}x {row['max_err']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+BlurBenchmark.py - Speed and accuracy of Gaussian blur engines by kernel size
+
+Compares every engine in BlurEngine.ENGINES (and the auto choice) against
+cv2.GaussianBlur for a range of kernel sizes.
+
+Usage:
+    python -m Benchmarks.BlurBenchmark [--width 4000 --height 3000] [--ksizes 5 21 61] [--repeat 3]
+"""
+
+import argparse
+from Benchmarks.Metrics import max_abs_error, psnr, time_call
+from Benchmarks.Synthetic import make_image
+from Models.Processors.Engines import BlurEngine
+
+
+def run(width, height, ksizes, repeat):
+    image = make_image(width, height)
+    rows = []
+    for ksize in ksizes:
+        ref_time, reference = time_call(lambda: BlurEngine.direct(image, ksize), repeat)
+        auto_choice = BlurEngine.select_engine(ksize)
+
+        for name, engine in BlurEngine.ENGINES.items():
+            elapsed, result = time_call(lambda: engine(image, ksize), repeat)
+            rows.append({
+                'ksize': ksize,
+                'engine': name + (' (auto)' if name == auto_choice else ''),
+                'ms': elapsed * 1000,
+                'speedup': ref_time / elapsed if elapsed > 0 else float('inf'),
+                'max_err': max_abs_error(reference, result),
+                'psnr': psnr(reference, result),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    parser.add_argument('--ksizes', type=int, nargs='+', default=[3, 5, 9, 15, 21, 31, 61, 101, 201],
+                        help='Odd Gaussian kernel sizes (sigma derived like OpenCV)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'ksize':>5} {'engine':>20} {'ms':>9} {'speedup':>8} {'max_err':>7} {'psnr':>7}")
+    for row in run(args.width, args.height, args.ksizes, args.repeat):
+        print(f"{row['ksize']:>5} {row['engine']:>20} {row['ms']:>9.2f} {row['speedup']:>7.1f}x "
+              f"{row['max_err']:>7} {row['psnr']:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
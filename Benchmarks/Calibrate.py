@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Calibrate.py - Measure the cost per megapixel of every processor operation
+
+Runs each operation type of every processor (default config) on a
+synthetic frame, or a synthetic face for FaceBeautify, and writes the
+best-of-N ms/MP to the cost model file that BaseProcessor.capabilities
+reads (cost_model.json at the project root unless --output is given).
+
+Usage:
+    python -m Benchmarks.Calibrate [--width 1600 --height 1200] [--repeat 3] [--output PATH]
+"""
+
+import argparse
+from Benchmarks.Synthetic import make_face, make_image
+from Models.Processors import PROCESSOR_TYPES, CostModel, FaceBeautifyProcessor
+from Models.Processors.CostModel import DEFAULT_PATH
+
+
+def run(width, height, repeat):
+    image = make_image(width, height)
+    face_image, _ = make_face(width, height)
+    model = CostModel()
+    rows = []
+    for processor_class, operation_types in PROCESSOR_TYPES:
+        frame = face_image if processor_class is FaceBeautifyProcessor else image
+        for operation in operation_types:
+            processor = processor_class(operation)
+            cost = model.measure(processor, frame, repeat)
+            caps = processor.capabilities
+            rows.append({'key': model.key(processor), 'op_class': caps.op_class.value,
+                         'radius': caps.radius, 'ms_per_mp': cost})
+    return model, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=1600)
+    parser.add_argument('--height', type=int, default=1200)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    model, rows = run(args.width, args.height, args.repeat)
+    print(f"{'operation':>40} {'class':>9} {'radius':>6} {'ms/MP':>9}")
+    for row in rows:
+        radius = '-' if row['radius'] is None else row['radius']
+        print(f"{row['key']:>40} {row['op_class']:>9} {radius:>6} {row['ms_per_mp']:>9.2f}")
+    model.save(args.output)
+    CostModel.set_default(None)
+    print(f"Saved {len(rows)} costs to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
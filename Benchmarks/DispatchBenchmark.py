@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+DispatchBenchmark.py - Per-call overhead of processor dispatch on small frames
+
+Compares BaseProcessor.process() (strategy prepared at construction) with the
+previous per-call dispatch: walk an if/elif ladder over the enum, read every
+parameter with config.get() and rebuild derived values (gamma table, sharpen
+kernel) before calling the same strategy. On tiny frames the kernel itself is
+cheap, so the difference is the dispatch overhead.
+
+Usage:
+    python -m Benchmarks.DispatchBenchmark [--size 32] [--calls 2000] [--repeat 5]
+"""
+
+import argparse
+from Benchmarks.Metrics import time_call
+from Benchmarks.Synthetic import make_image
+from Models.Processors import (
+    BlurProcessor, BlurType, BrightnessProcessor, BrightnessOperation,
+    EdgeDetectionProcessor, EdgeDetectionType, SharpenProcessor, SharpenType,
+    TransformProcessor, TransformType,
+)
+from Models.Processors.BrightnessProcessor import _gamma_table
+
+PROCESSORS = (
+    (BlurProcessor, BlurType),
+    (BrightnessProcessor, BrightnessOperation),
+    (EdgeDetectionProcessor, EdgeDetectionType),
+    (SharpenProcessor, SharpenType),
+    (TransformProcessor, TransformType),
+)
+
+
+def legacy_process(processor, image):
+    """Per-call work done by the old if/elif process() implementations"""
+    processor.validate_image(image)
+    config = processor.resolve_config(None)
+    key = processor.strategy_key
+    for member in type(key):
+        if key == member:
+            break
+    method_name, defaults = processor.STRATEGIES[key]
+    params = {name: config.get(name, default) for name, default in defaults.items()}
+    # Derived values (gamma table, sharpen kernel) were rebuilt on every call
+    if key == BrightnessOperation.GAMMA:
+        params = {'table': _gamma_table.__wrapped__(float(params['gamma']))}
+    else:
+        params = processor._resolve_params(key, params)
+    return getattr(processor, method_name)(image, **params)
+
+
+def per_call(func, calls: int, repeat: int) -> float:
+    """Best mean seconds per call over repeat batches of calls"""
+    elapsed, _ = time_call(lambda: [func() for _ in range(calls)], repeat)
+    return elapsed / calls
+
+
+def run(size, calls, repeat):
+    image = make_image(size, size)
+    rows = []
+    for processor_cls, type_enum in PROCESSORS:
+        for member in type_enum:
+            processor = processor_cls(member)
+            kernel = processor.prepare(processor.config)
+            kernel_s = per_call(lambda: kernel(image), calls, repeat)
+            legacy_s = per_call(lambda: legacy_process(processor, image), calls, repeat)
+            prepared_s = per_call(lambda: processor.process(image), calls, repeat)
+            rows.append({
+                'op': processor.name,
+                'kernel_us': kernel_s * 1e6,
+                'legacy_us': (legacy_s - kernel_s) * 1e6,
+                'prepared_us': (prepared_s - kernel_s) * 1e6,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=32, help='Square frame size in pixels')
+    parser.add_argument('--calls', type=int, default=2000, help='Calls per timed batch')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'operation':>36} {'kernel us':>10} {'legacy +us':>11} {'prepared +us':>13}")
+    for row in run(args.size, args.calls, args.repeat):
+        print(f"{row['op']:>36} {row['kernel_us']:>10.2f} {row['legacy_us']:>11.2f} {row['prepared_us']:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+EdgeBenchmark.py - Speed, peak memory and accuracy of edge engines
+
+Runs Sobel, Scharr and Laplacian through every engine in EdgeEngine.ENGINES
+on a grayscale frame and compares against the float64 reference. Peak
+memory is measured with tracemalloc, which sees the numpy buffers OpenCV
+returns.
+
+Usage:
+    python -m Benchmarks.EdgeBenchmark [--width 4000 --height 3000] [--repeat 3]
+"""
+
+import argparse
+import tracemalloc
+import cv2
+from Benchmarks.Metrics import max_abs_error, time_call
+from Benchmarks.Synthetic import make_image
+from Models.Processors.Engines import EdgeEngine
+
+OPERATIONS = {
+    'sobel': lambda gray, engine: EdgeEngine.gradient_magnitude(gray, "sobel", 3, engine),
+    'scharr': lambda gray, engine: EdgeEngine.gradient_magnitude(gray, "scharr", engine=engine),
+    'laplacian': lambda gray, engine: EdgeEngine.laplacian_abs(gray, 3, engine),
+}
+
+
+def peak_bytes(func) -> int:
+    """Peak traced allocation while func runs"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(width, height, repeat):
+    gray = cv2.cvtColor(make_image(width, height), cv2.COLOR_BGR2GRAY)
+    rows = []
+    for op_name, operation in OPERATIONS.items():
+        ref_time, reference = time_call(lambda: operation(gray, "reference"), repeat)
+        ref_peak = peak_bytes(lambda: operation(gray, "reference"))
+
+        for engine in EdgeEngine.ENGINES:
+            elapsed, result = time_call(lambda: operation(gray, engine), repeat)
+            peak = peak_bytes(lambda: operation(gray, engine))
+            rows.append({
+                'op': op_name,
+                'engine': engine,
+                'ms': elapsed * 1000,
+                'speedup': ref_time / elapsed if elapsed > 0 else float('inf'),
+                'peak_mb': peak / 2**20,
+                'memory_ratio': ref_peak / peak if peak else float('inf'),
+                'max_err': max_abs_error(reference, result),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'op':>9} {'engine':>10} {'ms':>9} {'speedup':>8} {'peak MB':>8} {'mem':>6} {'max_err':>7}")
+    for row in run(args.width, args.height, args.repeat):
+        print(f"{row['op']:>9} {row['engine']:>10} {row['ms']:>9.2f} {row['speedup']:>7.1f}x "
+              f"{row['peak_mb']:>8.1f} {row['memory_ratio']:>5.1f}x {row['max_err']:>7}")
+
+
+if __name__ == '__main__':
+    main()
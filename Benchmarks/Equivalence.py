@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Equivalence.py - Golden-output check of optimised engines against the processors
+
+The reference output of every case is the processor's process() with
+each engine parameter pinned to its reference engine (cv2.GaussianBlur,
+cv2.medianBlur, float64 gradients, full bilateral, full NLM). Every
+alternate path is run on the same fixed synthetic corpus and compared:
+
+    <param>=<name>   each other engine of BlurEngine, MedianEngine,
+                     EdgeEngine, SkinSmoothing and BlemishRemoval
+    into             process_into into a fresh output
+    into_inplace     process_into with the input as output
+    batch            process_batch on a stack of the corpus image
+    regions          process_regions patches pasted on a copy (face ops)
+    orientation      Orientation.apply (rotations and flips)
+    geometry         GeometryPipeline (rotations, flips, zooms)
+
+Each variant reports its worst max abs error, PSNR and SSIM over the
+corpus and must stay within its tolerance. Point operations and
+transforms must be bit-exact unless a tolerance says otherwise. Face
+region operations also run an "overlap" case whose detector reports
+overlapping rectangles, as the Haar cascade often does; its execution
+paths must stack the effects exactly as process() does.
+Tolerances are looked up in DEFAULT_TOLERANCES, then in the optional
+--tolerances JSON file, by fnmatch pattern on "<case>|<variant>"; the
+last matching entry wins. Exits with status 1 when any variant fails.
+
+Usage:
+    python -m Benchmarks.Equivalence [--only Blur] [--tolerances FILE] [--output report.json]
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatch
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from Benchmarks.Metrics import max_abs_error, psnr, ssim
+from Benchmarks.Synthetic import make_face, make_image
+from Models.Processors import PROCESSOR_TYPES, FaceBeautifyProcessor, TransformProcessor, TransformType
+from Models.Processors import BlurType, OpClass, ScratchBuffers
+from Models.Processors.Engines import BlemishRemoval, BlurEngine, EdgeEngine, MedianEngine, SkinSmoothing
+from Models.Processors.Engines.Geometry import GeometryPipeline
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    """Limits an alternate output must meet (None = not checked)"""
+    max_abs_error: Optional[int] = 0
+    min_psnr: Optional[float] = None
+    min_ssim: Optional[float] = None
+
+    def accepts(self, error: int, psnr_db: float, ssim_index: float) -> bool:
+        return ((self.max_abs_error is None or error <= self.max_abs_error) and
+                (self.min_psnr is None or psnr_db >= self.min_psnr) and
+                (self.min_ssim is None or ssim_index >= self.min_ssim))
+
+    def describe(self) -> str:
+        if self.max_abs_error == 0:
+            return "exact"
+        parts = []
+        if self.max_abs_error is not None:
+            parts.append(f"err<={self.max_abs_error}")
+        if self.min_psnr is not None:
+            parts.append(f"psnr>={self.min_psnr:g}")
+        if self.min_ssim is not None:
+            parts.append(f"ssim>={self.min_ssim:g}")
+        return ",".join(parts) or "any"
+
+
+EXACT = Tolerance()
+# Default for approximate engines: visually equivalent, not pixel-identical
+APPROXIMATE = Tolerance(max_abs_error=None, min_psnr=30.0, min_ssim=0.90)
+
+# Engine parameter -> (engine module, reference engine name)
+ENGINE_PARAMS = {
+    'blur_engine': (BlurEngine, 'direct'),
+    'median_engine': (MedianEngine, 'direct'),
+    'edge_engine': (EdgeEngine, 'reference'),
+    'smooth_engine': (SkinSmoothing, 'bilateral'),
+    'blemish_engine': (BlemishRemoval, 'nlm'),
+}
+
+# Extra configs probing engines beyond the defaults (large radii switch "auto" engines)
+PROBES = {
+    BlurType.GAUSSIAN: {'sigma8': {'kernel_size': (0, 0), 'sigma': 8},
+                        # Explicit kernels cutting the Gaussian off must stay exact under "auto"
+                        'k5_sigma5': {'kernel_size': (5, 5), 'sigma': 5},
+                        'k3_sigma8': {'kernel_size': (3, 3), 'sigma': 8}},
+    BlurType.MEDIAN: {'k9': {'kernel_size': 9}},
+}
+
+# Pattern on "<case>|<variant>" -> Tolerance; later entries win. Engines
+# documented as exact must stay exact; everything else not listed here is
+# APPROXIMATE, except point ops and transforms (see default_tolerance).
+DEFAULT_TOLERANCES: List[Tuple[str, Tolerance]] = [
+    ('*|into', EXACT),
+    ('*|into_inplace', EXACT),
+    ('*|batch', EXACT),
+    ('*|regions', EXACT),
+    ('*|orientation', EXACT),
+    ('*|median_engine=tiled', EXACT),
+    # Truncated kernels are only reproduced by direct, so every engine must fall back to it
+    ('BlurProcessor.GAUSSIAN/k*_sigma*|blur_engine=*', EXACT),
+    ('*|edge_engine=float32', EXACT),
+    ('*|edge_engine=magnitude', Tolerance(max_abs_error=1)),  # rounds instead of truncating
+    # |gx| + |gy| overstates diagonal edges by up to sqrt(2): same edges, brighter
+    ('*|edge_engine=l1', Tolerance(max_abs_error=None, min_ssim=0.90)),
+    # Repairs only the detected spots and leaves the rest of the skin texture
+    ('*|blemish_engine=spot_inpaint', Tolerance(max_abs_error=None, min_psnr=30.0, min_ssim=0.80)),
+    # One warpAffine instead of resize + crop/pad: different fixed-point rounding
+    ('TransformProcessor.ZOOM_*|geometry', Tolerance(max_abs_error=None, min_psnr=35.0, min_ssim=0.97)),
+]
+
+
+class OverlappingFaces(FaceBeautifyProcessor):
+    """Detector reporting a shifted, overlapping copy of every face"""
+
+    def _detect_faces(self, image):
+        faces = [tuple(int(v) for v in face) for face in super()._detect_faces(image)]
+        return faces + [(x + w // 3, y + h // 4, w, h) for (x, y, w, h) in faces]
+
+
+@dataclass
+class Result:
+    case: str
+    variant: str
+    max_abs_error: int
+    psnr: float
+    ssim: float
+    tolerance: str
+    passed: bool
+    note: str = ''
+
+
+def corpus() -> Dict[str, np.ndarray]:
+    """Fixed synthetic images: colour, odd-sized colour, grayscale and a face"""
+    return {
+        'scene': make_image(480, 360, 3, seed=0),
+        'scene_odd': make_image(333, 257, 3, seed=1),
+        'scene_gray': make_image(480, 360, 1, seed=2),
+        'face': make_face(800, 600, seed=3)[0],
+    }
+
+
+def _engine_variants(processor) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+    """(reference engine overrides, variant name -> engine overrides) of processor's operation"""
+    _, defaults = processor.STRATEGIES[processor.strategy_key]
+    reference, variants = {}, {}
+    for param in defaults:
+        if param not in ENGINE_PARAMS:
+            continue
+        module, reference_name = ENGINE_PARAMS[param]
+        reference[param] = reference_name
+        names = list(module.ENGINES)
+        if module.DEFAULT_ENGINE not in names:
+            names.append(module.DEFAULT_ENGINE)  # "auto"
+        for name in names:
+            if name != reference_name:
+                variants[f"{param}={name}"] = {param: name}
+    return reference, variants
+
+
+def _path_variants(processor, overrides) -> Dict[str, Callable[[np.ndarray], np.ndarray]]:
+    """Alternate execution paths of the same operation and config"""
+    def into(image):
+        dst = np.empty(processor.output_shape(image), image.dtype)
+        return processor.process_into(image, dst, ScratchBuffers(), overrides)
+
+    def into_inplace(image):
+        if tuple(processor.output_shape(image)) != image.shape:
+            return into(image)
+        buffer = image.copy()
+        return processor.process_into(buffer, buffer, ScratchBuffers(), overrides)
+
+    def batch(image):
+        return processor.process_batch(np.stack([image, image]), overrides)[1]
+
+    variants = {'into': into, 'into_inplace': into_inplace, 'batch': batch}
+    if isinstance(processor, FaceBeautifyProcessor) and processor.beautify_type in processor.REGION_TYPES:
+        def regions(image):
+            result = image.copy()
+            for patch in processor.process_regions(image, overrides):
+                x, y, w, h = patch.rect
+                result[y:y+h, x:x+w] = patch.pixels
+            return result
+
+        variants['regions'] = regions
+    if isinstance(processor, TransformProcessor):
+        step = processor.orientation_step()
+        if step is not None:
+            variants['orientation'] = step.apply
+            variants['geometry'] = lambda image: GeometryPipeline.for_image(image).orient(step).apply(image)
+        elif processor.transform_type in (TransformType.ZOOM_IN, TransformType.ZOOM_OUT):
+            factor = processor.resolve_config(overrides).get(
+                'zoom_factor', processor.STRATEGIES[processor.transform_type][1]['zoom_factor'])
+            zoom = 'zoom_in' if processor.transform_type == TransformType.ZOOM_IN else 'zoom_out'
+            variants['geometry'] = lambda image: getattr(GeometryPipeline.for_image(image), zoom)(factor).apply(image)
+    return variants
+
+
+def default_tolerance(processor, key: str, tolerances: List[Tuple[str, Tolerance]]) -> Tolerance:
+    """Tolerance of "<case>|<variant>": exact for point ops and transforms, else APPROXIMATE, then overrides"""
+    op_class = processor.capabilities.op_class
+    tolerance = EXACT if op_class in (OpClass.POINT, OpClass.GEOMETRIC) else APPROXIMATE
+    for pattern, candidate in tolerances:
+        if fnmatch(key, pattern):
+            tolerance = candidate
+    return tolerance
+
+
+def _compare(reference: np.ndarray, candidate: np.ndarray) -> Tuple[int, float, float, str]:
+    if candidate.shape != reference.shape or candidate.dtype != reference.dtype:
+        return 255, 0.0, 0.0, f"shape {candidate.shape} != {reference.shape}"
+    return max_abs_error(reference, candidate), psnr(reference, candidate), ssim(reference, candidate), ''
+
+
+def run(only=None, tolerances: Optional[List[Tuple[str, Tolerance]]] = None, log=print) -> List[Result]:
+    """
+    Args:
+        only: Substrings; run only cases whose name contains one of them
+        tolerances: (pattern, Tolerance) entries applied after DEFAULT_TOLERANCES
+    """
+    tolerances = DEFAULT_TOLERANCES + list(tolerances or [])
+    images = corpus()
+    results = []
+    for processor_class, operation_types in PROCESSOR_TYPES:
+        face = processor_class is FaceBeautifyProcessor
+        for operation in operation_types:
+            probes = {'': (processor_class(operation), {})}
+            probes.update({name: (probes[''][0], overrides) for name, overrides in PROBES.get(operation, {}).items()})
+            if face and operation in FaceBeautifyProcessor.REGION_TYPES:
+                probes['overlap'] = (OverlappingFaces(operation), {})
+            for probe, (processor, probe_overrides) in probes.items():
+                case = f"{processor_class.__name__}.{operation.name}" + (f"/{probe}" if probe else '')
+                if only and not any(part in case for part in only):
+                    continue
+                reference_engines, engine_variants = _engine_variants(processor)
+                if isinstance(processor, OverlappingFaces):
+                    engine_variants = {}  # Engines are compared on the plain case
+                reference_overrides = {**probe_overrides, **reference_engines}
+
+                variants = {name: (lambda image, o={**probe_overrides, **engines}: processor.process(image, o))
+                            for name, engines in engine_variants.items()}
+                variants.update(_path_variants(processor, reference_overrides))
+
+                worst = {name: [0, float('inf'), 1.0, ''] for name in variants}
+                for image_name, image in images.items():
+                    if (image_name == 'face') != face or not processor.capabilities.accepts(image):
+                        continue
+                    reference = processor.process(image, reference_overrides)
+                    for name, variant in variants.items():
+                        error, psnr_db, ssim_index, note = _compare(reference, variant(image))
+                        w = worst[name]
+                        w[0], w[1], w[2] = max(w[0], error), min(w[1], psnr_db), min(w[2], ssim_index)
+                        w[3] = w[3] or (f"{image_name}: {note}" if note else '')
+
+                for name, (error, psnr_db, ssim_index, note) in worst.items():
+                    tolerance = default_tolerance(processor, f"{case}|{name}", tolerances)
+                    result = Result(case, name, error, psnr_db, ssim_index, tolerance.describe(),
+                                    tolerance.accepts(error, psnr_db, ssim_index), note)
+                    results.append(result)
+                    log(format_result(result))
+    return results
+
+
+def format_result(result: Result) -> str:
+    status = 'ok  ' if result.passed else 'FAIL'
+    psnr_text = 'inf' if result.psnr == float('inf') else f"{result.psnr:.1f}"
+    return (f"{status} {result.case:>40} {result.variant:>30} err={result.max_abs_error:>3} "
+            f"psnr={psnr_text:>5} ssim={result.ssim:.4f} [{result.tolerance}] {result.note}").rstrip()
+
+
+def load_tolerances(path: str) -> List[Tuple[str, Tolerance]]:
+    """
+    JSON object: pattern -> {"max_abs_error": int|null, "min_psnr": float|null, "min_ssim": float|null}
+
+    Raises:
+        OSError, ValueError: If the file is missing or malformed
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Not a tolerance file: {path}")
+    try:
+        return [(pattern, Tolerance(**limits)) for pattern, limits in data.items()]
+    except TypeError as e:
+        raise ValueError(f"Bad tolerance in {path}: {e}") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', help="Run only cases whose name contains one of these")
+    parser.add_argument('--tolerances', help="JSON file of extra pattern -> tolerance entries")
+    parser.add_argument('--output', help="Write the results as JSON")
+    parser.add_argument('--failures', action='store_true', help="Print failing variants only")
+    args = parser.parse_args()
+
+    tolerances = load_tolerances(args.tolerances) if args.tolerances else None
+    def log(line):
+        if not args.failures or line.startswith('FAIL'):
+            print(line)
+
+    results = run(args.only, tolerances, log)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([asdict(r) for r in results], f, indent=2, default=str)
+    failed = sum(not r.passed for r in results)
+    print(f"{len(results) - failed}/{len(results)} variants within tolerance")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+GeometryBenchmark.py - Chained Features/Transform passes vs one GeometryPipeline
+
+Each chain runs once as separate Features/Transform calls (one resample and
+one intermediate per step) and once as a GeometryPipeline (one resample,
+or a slice/rotate fast path). The chained result is the reference. For
+warped chains it is not ground truth, because it interpolates several
+times, so PSNR/SSIM show how close the single resample stays.
+
+Usage:
+    python -m Benchmarks.GeometryBenchmark [--width 4000 --height 3000] [--repeat 3]
+"""
+
+import argparse
+from Benchmarks.Metrics import max_abs_error, psnr, ssim, time_call
+from Benchmarks.Synthetic import make_image
+from Features import Transform
+from Models.Processors.Engines.Geometry import GeometryPipeline
+
+
+def _chains(width, height):
+    """name -> (chained Features calls, equivalent pipeline builder)"""
+    w, h = width // 2, height // 2
+    quad = [[0, 0], [w - 1, 0], [w - 1, h - 1], [0, h - 1]]
+    tilted = [[w // 40, h // 60], [w - 1 - w // 50, 0], [w - 1, h - 1], [0, h - 1 - h // 40]]
+    return {
+        'crop': (
+            lambda img: Transform.crop_rectangle(img, width // 4, height // 4, w, h),
+            lambda img: GeometryPipeline.for_image(img).crop(width // 4, height // 4, w, h)),
+        'crop+rot90+flip': (
+            lambda img: Transform.flip_horizontal(Transform.rotate_90_clockwise(
+                Transform.crop_rectangle(img, width // 4, height // 4, w, h))),
+            lambda img: GeometryPipeline.for_image(img).crop(width // 4, height // 4, w, h)
+            .rotate_90().flip_horizontal()),
+        'crop+zoom+rotate': (
+            lambda img: Transform.rotate_custom(Transform.zoom_in(
+                Transform.crop_rectangle(img, width // 4, height // 4, w, h), 1.3), 12),
+            lambda img: GeometryPipeline.for_image(img).crop(width // 4, height // 4, w, h)
+            .zoom_in(1.3).rotate(12)),
+        'crop+zoom+rotate+persp': (
+            lambda img: Transform.perspective_transform(Transform.rotate_custom(Transform.zoom_in(
+                Transform.crop_rectangle(img, width // 4, height // 4, w, h), 1.3), 12), quad, tilted),
+            lambda img: GeometryPipeline.for_image(img).crop(width // 4, height // 4, w, h)
+            .zoom_in(1.3).rotate(12).perspective(quad, tilted)),
+    }
+
+
+def run(width, height, repeat):
+    image = make_image(width, height)
+    rows = []
+    for name, (chained, build) in _chains(width, height).items():
+        chain_time, reference = time_call(lambda: chained(image), repeat)
+        pipe_time, result = time_call(lambda: build(image).apply(image), repeat)
+        rows.append({
+            'chain': name,
+            'chained_ms': chain_time * 1000,
+            'pipeline_ms': pipe_time * 1000,
+            'speedup': chain_time / pipe_time if pipe_time > 0 else float('inf'),
+            'max_err': max_abs_error(reference, result),
+            'psnr': psnr(reference, result),
+            'ssim': ssim(reference, result),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'chain':>24} {'chained ms':>11} {'pipeline ms':>12} {'speedup':>8} {'max_err':>7} {'PSNR':>7} {'SSIM':>7}")
+    for row in run(args.width, args.height, args.repeat):
+        print(f"{row['chain']:>24} {row['chained_ms']:>11.2f} {row['pipeline_ms']:>12.2f} "
+              f"{row['speedup']:>7.1f}x {row['max_err']:>7} {row['psnr']:>7.2f} {row['ssim']:>7.4f}")
+
+
+if __name__ == '__main__':
+    main()
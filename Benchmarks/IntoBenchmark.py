@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+IntoBenchmark.py - Allocations of process() vs process_into() in a frame loop
+
+Streams frames of one size through each processor operation, once with
+process() (a new result per frame) and once with process_into() reusing
+one output array and one ScratchBuffers. tracemalloc reports the bytes
+allocated by the steady-state loop (numpy registers its buffers with
+tracemalloc) after a warm-up frame has filled tables, caches and scratch.
+
+Usage:
+    python -m Benchmarks.IntoBenchmark [--width 1280 --height 720] [--frames 20] [--all]
+"""
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from Benchmarks.Synthetic import make_image
+from Models.Processors import PROCESSOR_TYPES, ScratchBuffers, FaceBeautifyProcessor
+
+
+def _measure(loop, frames):
+    """(ms per frame, peak bytes allocated) of loop over frames, after one warm-up frame"""
+    loop(frames[:1])
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    loop(frames)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - start_bytes
+    tracemalloc.stop()
+    return elapsed * 1000 / len(frames), peak
+
+
+def run(width, height, frame_count, native_only=True):
+    frames = [make_image(width, height, seed=i) for i in range(min(frame_count, 4))]
+    frames = (frames * frame_count)[:frame_count]
+    rows = []
+    for processor_class, types in PROCESSOR_TYPES:
+        if processor_class is FaceBeautifyProcessor:
+            continue  # Face detection dominates; nothing to reuse
+        for operation in types:
+            processor = processor_class(operation)
+            native = operation in processor.INTO_STRATEGIES
+            if native_only and not native:
+                continue
+            dst = np.empty(processor.output_shape(frames[0]), frames[0].dtype)
+            scratch = ScratchBuffers()
+
+            def with_process(batch):
+                for frame in batch:
+                    processor.process(frame)
+
+            def with_into(batch):
+                for frame in batch:
+                    processor.process_into(frame, dst, scratch)
+
+            process_ms, process_peak = _measure(with_process, frames)
+            into_ms, into_peak = _measure(with_into, frames)
+            rows.append({
+                'op': f"{processor_class.__name__.replace('Processor', '')}.{operation.name}",
+                'native': native,
+                'process_ms': process_ms,
+                'into_ms': into_ms,
+                'process_peak_mb': process_peak / 2**20,
+                'into_peak_mb': into_peak / 2**20,
+                'scratch_mb': scratch.nbytes / 2**20,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--all', action='store_true', help="Include operations that fall back to process()")
+    args = parser.parse_args()
+
+    print(f"{'op':>28} {'native':>6} {'process ms':>10} {'into ms':>8} "
+          f"{'process peak MB':>15} {'into peak MB':>12} {'scratch MB':>10}")
+    for row in run(args.width, args.height, args.frames, native_only=not args.all):
+        print(f"{row['op']:>28} {'yes' if row['native'] else 'no':>6} {row['process_ms']:>10.2f} "
+              f"{row['into_ms']:>8.2f} {row['process_peak_mb']:>15.2f} {row['into_peak_mb']:>12.2f} "
+              f"{row['scratch_mb']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
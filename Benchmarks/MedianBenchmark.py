@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+MedianBenchmark.py - Speed and accuracy of median filter engines by kernel size
+
+Compares every engine in MedianEngine.ENGINES (and the auto choice) against
+cv2.medianBlur. The tiled engine only gains on machines with several cores.
+
+Usage:
+    python -m Benchmarks.MedianBenchmark [--width 4000 --height 3000] [--ksizes 5 7 31] [--repeat 3]
+"""
+
+import argparse
+from Benchmarks.Metrics import max_abs_error, psnr, time_call
+from Benchmarks.Synthetic import make_image
+from Models.Processors.Engines import MedianEngine
+
+
+def run(width, height, ksizes, repeat):
+    image = make_image(width, height)
+    rows = []
+    for ksize in ksizes:
+        ref_time, reference = time_call(lambda: MedianEngine.direct(image, ksize), repeat)
+        auto_choice = MedianEngine.select_engine(image, ksize)
+
+        for name, engine in MedianEngine.ENGINES.items():
+            elapsed, result = time_call(lambda: engine(image, ksize), repeat)
+            rows.append({
+                'ksize': ksize,
+                'engine': name + (' (auto)' if name == auto_choice else ''),
+                'ms': elapsed * 1000,
+                'speedup': ref_time / elapsed if elapsed > 0 else float('inf'),
+                'max_err': max_abs_error(reference, result),
+                'psnr': psnr(reference, result),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    parser.add_argument('--ksizes', type=int, nargs='+', default=[3, 5, 7, 15, 31, 61, 101],
+                        help='Odd median kernel sizes')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'ksize':>5} {'engine':>20} {'ms':>9} {'speedup':>8} {'max_err':>7} {'psnr':>7}")
+    for row in run(args.width, args.height, args.ksizes, args.repeat):
+        print(f"{row['ksize']:>5} {row['engine']:>20} {row['ms']:>9.2f} {row['speedup']:>7.1f}x "
+              f"{row['max_err']:>7} {row['psnr']:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
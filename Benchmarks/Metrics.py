@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Metrics.py - Image quality metrics and timing helpers for benchmarks"""
+
+import time
+import cv2
+import numpy as np
+from typing import Callable, Tuple
+
+
+def max_abs_error(reference: np.ndarray, candidate: np.ndarray) -> int:
+    """Largest per-pixel absolute difference"""
+    return int(cv2.absdiff(reference, candidate).max())
+
+
+def psnr(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Peak signal-to-noise ratio in dB (inf for identical images)"""
+    diff = reference.astype(np.float64) - candidate.astype(np.float64)
+    mse = float(np.mean(diff * diff))
+    if mse == 0:
+        return float("inf")
+    return 10.0 * np.log10(255.0 ** 2 / mse)
+
+
+def ssim(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean structural similarity (Wang et al. 2004, 11x11 Gaussian window, sigma 1.5)"""
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    x = reference.astype(np.float32)
+    y = candidate.astype(np.float32)
+
+    def blur(image):
+        return cv2.GaussianBlur(image, (11, 11), 1.5)
+
+    mu_x, mu_y = blur(x), blur(y)
+    sigma_x = blur(x * x) - mu_x * mu_x
+    sigma_y = blur(y * y) - mu_y * mu_y
+    sigma_xy = blur(x * y) - mu_x * mu_y
+
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * sigma_xy + c2)) / \
+               ((mu_x * mu_x + mu_y * mu_y + c1) * (sigma_x + sigma_y + c2))
+    return float(ssim_map.mean())
+
+
+def time_call(func: Callable, repeat: int = 5, warmup: int = 1) -> Tuple[float, object]:
+    """
+    Time a zero-argument callable
+
+    Returns:
+        Tuple of (best wall time in seconds, last result)
+    """
+    result = None
+    for _ in range(warmup):
+        result = func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+RemapBenchmark.py - Per-frame cost of cached remap tables vs warp calls
+
+Streams frames of one size through Features/Transform.rotate_custom and
+perspective_transform, once as plain warps and once with a shared
+RemapCache. The first cached frame builds the tables; it is reported
+separately from the steady-state per-frame time.
+
+Usage:
+    python -m Benchmarks.RemapBenchmark [--width 1280 --height 720] [--frames 30]
+"""
+
+import argparse
+import time
+from Benchmarks.Metrics import max_abs_error
+from Benchmarks.Synthetic import make_image
+from Features import Transform
+from Models.Processors.Engines import RemapCache
+
+
+def _operations(width, height):
+    quad = [[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]]
+    tilted = [[width // 40, height // 60], [width - 1 - width // 50, 0],
+              [width - 1, height - 1], [0, height - 1 - height // 40]]
+    return {
+        'rotate_custom': lambda img, cache: Transform.rotate_custom(img, 12, 1.05, cache=cache),
+        'perspective': lambda img, cache: Transform.perspective_transform(img, quad, tilted, cache=cache),
+    }
+
+
+def _per_frame(operation, frames, cache):
+    start = time.perf_counter()
+    for frame in frames:
+        result = operation(frame, cache)
+    return (time.perf_counter() - start) / len(frames), result
+
+
+def run(width, height, frame_count):
+    frames = [make_image(width, height, seed=i) for i in range(min(frame_count, 4))]
+    frames = (frames * frame_count)[:frame_count]
+    rows = []
+    for name, operation in _operations(width, height).items():
+        warp_time, reference = _per_frame(operation, frames, None)
+
+        cache = RemapCache()
+        start = time.perf_counter()
+        operation(frames[0], cache)
+        build_time = time.perf_counter() - start
+        cached_time, result = _per_frame(operation, frames, cache)
+
+        rows.append({
+            'op': name,
+            'warp_ms': warp_time * 1000,
+            'first_ms': build_time * 1000,
+            'cached_ms': cached_time * 1000,
+            'speedup': warp_time / cached_time if cached_time > 0 else float('inf'),
+            'table_mb': cache.stats()['bytes'] / 2**20,
+            'max_err': max_abs_error(reference, result),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'op':>14} {'warp ms':>8} {'1st ms':>7} {'cached ms':>10} {'speedup':>8} {'maps MB':>8} {'max_err':>7}")
+    for row in run(args.width, args.height, args.frames):
+        print(f"{row['op']:>14} {row['warp_ms']:>8.2f} {row['first_ms']:>7.2f} {row['cached_ms']:>10.2f} "
+              f"{row['speedup']:>7.1f}x {row['table_mb']:>8.1f} {row['max_err']:>7}")
+
+
+if __name__ == '__main__':
+    main()
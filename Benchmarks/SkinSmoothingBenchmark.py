@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+SkinSmoothingBenchmark.py - Speed and quality of skin smoothing engines
+
+Compares every engine in SkinSmoothing.ENGINES against the bilateral reference
+for several face sizes and smooth levels.
+
+Usage:
+    python -m Benchmarks.SkinSmoothingBenchmark [--sizes 128 256 512] [--repeat 5]
+"""
+
+import argparse
+from Benchmarks.Metrics import psnr, ssim, time_call
+from Benchmarks.Synthetic import make_face
+from Models.Processors.Engines import SkinSmoothing
+
+
+def smoothing_params(smooth_level: float):
+    """Same mapping as FaceBeautifyProcessor._smooth_roi"""
+    d = int(9 + smooth_level * 20)
+    sigma = int(50 + smooth_level * 100)
+    return d, sigma, sigma
+
+
+def run(sizes, levels, repeat):
+    rows = []
+    for size in sizes:
+        image, [(x, y, w, h)] = make_face(size * 2, size * 2)
+        roi = image[y:y+h, x:x+w].copy()
+
+        for level in levels:
+            d, sigma_color, sigma_space = smoothing_params(level)
+            ref_time, reference = time_call(
+                lambda: SkinSmoothing.bilateral(roi, d, sigma_color, sigma_space), repeat)
+
+            for name, engine in SkinSmoothing.ENGINES.items():
+                elapsed, result = time_call(lambda: engine(roi, d, sigma_color, sigma_space), repeat)
+                rows.append({
+                    'face': f"{w}x{h}",
+                    'level': level,
+                    'engine': name,
+                    'ms': elapsed * 1000,
+                    'speedup': ref_time / elapsed if elapsed > 0 else float('inf'),
+                    'psnr': psnr(reference, result),
+                    'ssim': ssim(reference, result),
+                })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[128, 256, 512], help='Face sizes in pixels')
+    parser.add_argument('--levels', type=float, nargs='+', default=[0.0, 0.5, 1.0], help='smooth_level values')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'face':>9} {'level':>5} {'engine':>16} {'ms':>9} {'speedup':>8} {'psnr':>7} {'ssim':>6}")
+    for row in run(args.sizes, args.levels, args.repeat):
+        print(f"{row['face']:>9} {row['level']:>5.2f} {row['engine']:>16} {row['ms']:>9.2f} "
+              f"{row['speedup']:>7.1f}x {row['psnr']:>7.2f} {row['ssim']:>6.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Suite.py - Throughput and peak memory of every processor operation by size class
+
+Runs every operation type of every processor (PROCESSOR_TYPES, default
+config) on synthetic 1- and 3-channel images of 0.3, 2, 12 and 48 MP and
+stores MP/s and peak traced memory per case as a JSON baseline. Compare
+mode checks a new run against a baseline and exits with status 1 when a
+case lost more than --threshold percent of its throughput or grew its
+peak memory by as much. Headless: needs neither Tk nor a camera.
+
+Each case runs once under tracemalloc (warm-up and peak memory), then is
+timed up to --repeat times, stopping early once --max-seconds is spent.
+Operations that do not accept a channel count are recorded as skipped.
+
+Usage:
+    python -m Benchmarks.Suite [--sizes 0.3 2 12 48] [--channels 1 3] [--only Blur]
+                               [--repeat 3] [--max-seconds 3] [--output benchmark.json]
+    python -m Benchmarks.Suite --compare baseline.json benchmark.json [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import cv2
+import numpy as np
+from Benchmarks.Synthetic import make_face, make_image
+from Models.Processors import PROCESSOR_TYPES, CostModel, FaceBeautifyProcessor
+
+# Size class (MP) -> (width, height), 4:3
+SIZES = {
+    '0.3': (640, 480),
+    '2': (1632, 1224),
+    '12': (4000, 3000),
+    '48': (8000, 6000),
+}
+
+# Larger synthetic images are tiled from this one (generating 48 MP directly
+# needs several GB of float temporaries); faces are scaled up from it instead
+_TILE = (1632, 1224)
+
+# Memory changes smaller than this are noise, whatever the percentage
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+def synthetic(width, height, channels, face=False):
+    """Deterministic test image of the given size (a centred face if face=True)"""
+    tile_w, tile_h = min(width, _TILE[0]), min(height, _TILE[1])
+    if face:
+        image, _ = make_face(tile_w, tile_h)
+        if (tile_w, tile_h) != (width, height):
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+        return image if channels == 3 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    tile = make_image(tile_w, tile_h, channels)
+    reps = (-(-height // tile_h), -(-width // tile_w)) + (1,) * (tile.ndim - 2)
+    return np.ascontiguousarray(np.tile(tile, reps)[:height, :width])
+
+
+def case_key(processor_class, operation, size, channels):
+    return f"{processor_class.__name__}.{operation.name}@{size}MP/{channels}ch"
+
+
+def measure(processor, image, repeat, max_seconds):
+    """(best seconds, timed runs, peak traced bytes) of processor.process(image)"""
+    tracemalloc.start()
+    processor.process(image)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best, runs, spent = float('inf'), 0, 0.0
+    while runs < max(1, repeat) and (runs == 0 or spent < max_seconds):
+        start = time.perf_counter()
+        processor.process(image)
+        elapsed = time.perf_counter() - start
+        best, runs, spent = min(best, elapsed), runs + 1, spent + elapsed
+    return best, runs, peak
+
+
+def run(sizes, channel_counts, only=None, repeat=3, max_seconds=3.0, log=print):
+    """
+    Returns:
+        Dict of case key -> result (mp_per_s, best_ms, peak_mb, ...; or skipped/error)
+    """
+    results = {}
+    for size in sizes:
+        width, height = SIZES[size]
+        megapixels = width * height / 1e6
+        for channels in channel_counts:
+            images = {}
+            for processor_class, operation_types in PROCESSOR_TYPES:
+                face = processor_class is FaceBeautifyProcessor
+                for operation in operation_types:
+                    key = case_key(processor_class, operation, size, channels)
+                    if only and not any(part in key for part in only):
+                        continue
+                    processor = processor_class(operation)
+                    result = {'processor': processor_class.__name__, 'operation': operation.name,
+                              'size': size, 'megapixels': megapixels, 'channels': channels}
+                    if channels not in processor.capabilities.channels:
+                        result['skipped'] = f"accepts {processor.capabilities.channels} channels"
+                    else:
+                        if face not in images:
+                            images[face] = synthetic(width, height, channels, face)
+                        try:
+                            best, runs, peak = measure(processor, images[face], repeat, max_seconds)
+                            result.update({'best_ms': best * 1000, 'mp_per_s': megapixels / best,
+                                           'peak_mb': peak / 2**20, 'runs': runs})
+                        except (cv2.error, MemoryError, ValueError) as e:
+                            result['error'] = f"{type(e).__name__}: {e}".splitlines()[0]
+                    results[key] = result
+                    log(format_result(key, result))
+            images.clear()
+    return results
+
+
+def format_result(key, result):
+    if 'skipped' in result:
+        return f"{key:>52}  skipped ({result['skipped']})"
+    if 'error' in result:
+        return f"{key:>52}  error: {result['error']}"
+    return (f"{key:>52} {result['mp_per_s']:>9.1f} MP/s {result['best_ms']:>10.1f} ms "
+            f"{result['peak_mb']:>8.1f} MB peak")
+
+
+def save(results, path, config):
+    data = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': CostModel.describe_machine(),
+        'config': config,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def load(path):
+    """
+    Raises:
+        OSError, ValueError: If the file is missing or not a suite result
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or 'results' not in data:
+        raise ValueError(f"Not a benchmark suite file: {path}")
+    return data
+
+
+def compare(baseline, current, threshold):
+    """
+    Cases measured in both runs whose throughput fell, or peak memory rose,
+    by more than threshold percent
+
+    Returns:
+        List of (key, kind, old value, new value, change in percent)
+    """
+    regressions = []
+    limit = threshold / 100.0
+    for key, new in current['results'].items():
+        old = baseline['results'].get(key)
+        if not old or 'mp_per_s' not in old or 'mp_per_s' not in new:
+            continue
+        change = new['mp_per_s'] / old['mp_per_s'] - 1.0
+        if change < -limit:
+            regressions.append((key, 'throughput', old['mp_per_s'], new['mp_per_s'], change * 100))
+        grown = new['peak_mb'] - old['peak_mb']
+        if grown > MIN_MEMORY_DELTA_MB and grown > limit * old['peak_mb']:
+            regressions.append((key, 'peak memory', old['peak_mb'], new['peak_mb'],
+                                grown / old['peak_mb'] * 100 if old['peak_mb'] else float('inf')))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--channels', nargs='+', type=int, choices=[1, 3], default=[1, 3])
+    parser.add_argument('--only', nargs='+', help="Run only cases whose key contains one of these")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-seconds', type=float, default=3.0,
+                        help="Stop repeating a case once its timed runs took this long")
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Compare two saved runs instead of running")
+    parser.add_argument('--threshold', type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, current = (load(path) for path in args.compare)
+        regressions = compare(baseline, current, args.threshold)
+        common = len(set(baseline['results']) & set(current['results']))
+        for key, kind, old, new, change in regressions:
+            unit = 'MP/s' if kind == 'throughput' else 'MB'
+            print(f"REGRESSION {key:>52} {kind:>11}: {old:.1f} -> {new:.1f} {unit} ({change:+.1f}%)")
+        print(f"{len(regressions)} regression(s) above {args.threshold:g}% in {common} common cases")
+        sys.exit(1 if regressions else 0)
+
+    config = {'sizes': args.sizes, 'channels': args.channels, 'only': args.only,
+              'repeat': args.repeat, 'max_seconds': args.max_seconds}
+    results = run(args.sizes, args.channels, args.only, args.repeat, args.max_seconds)
+    save(results, args.output, config)
+    print(f"Saved {len(results)} cases to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
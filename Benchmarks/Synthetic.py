@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Synthetic.py - Deterministic synthetic test images (no files, no camera)"""
+
+import cv2
+import numpy as np
+from typing import List, Tuple
+
+
+def make_image(width: int, height: int, channels: int = 3, seed: int = 0) -> np.ndarray:
+    """
+    Natural-looking test image: smooth gradients, hard edges, texture and noise
+
+    Args:
+        width: Image width
+        height: Image height
+        channels: 1 or 3
+        seed: Random seed (same seed -> same image)
+    """
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = 90 + 60 * np.sin(xx / max(1, width) * 6.0) * np.cos(yy / max(1, height) * 4.0)
+
+    image = np.empty((height, width, 3), dtype=np.float32)
+    image[..., 0] = base + 20
+    image[..., 1] = base
+    image[..., 2] = base + 40
+
+    # Hard-edged shapes
+    step = max(8, min(width, height) // 6)
+    for i in range(0, width, step * 2):
+        cv2.rectangle(image, (i, height // 4), (i + step, height // 2), (200, 180, 160), -1)
+    cv2.circle(image, (width // 3, 2 * height // 3), max(2, step // 2), (30, 40, 50), -1)
+
+    image += rng.normal(0, 8, image.shape).astype(np.float32)
+    image = np.clip(image, 0, 255).astype(np.uint8)
+
+    if channels == 1:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def make_face(width: int, height: int, seed: int = 0) -> Tuple[np.ndarray, List[Tuple[int, int, int, int]]]:
+    """
+    Image with a skin-toned face-like region containing small dark blemishes
+
+    Returns:
+        Tuple of (image, [face_rect])
+    """
+    rng = np.random.default_rng(seed)
+    image = make_image(width, height, 3, seed)
+
+    fw, fh = width // 2, height // 2
+    fx, fy = (width - fw) // 2, (height - fh) // 2
+    face = np.full((fh, fw, 3), (140, 170, 215), dtype=np.float32)
+    yy, xx = np.mgrid[0:fh, 0:fw].astype(np.float32)
+    face += (15 * np.sin(xx / 9.0) * np.cos(yy / 11.0))[..., None]
+    face += rng.normal(0, 12, face.shape).astype(np.float32)
+
+    # Eyes and mouth as real edges that should survive smoothing
+    cv2.ellipse(face, (fw // 3, fh // 3), (fw // 10, fh // 20), 0, 0, 360, (40, 40, 60), -1)
+    cv2.ellipse(face, (2 * fw // 3, fh // 3), (fw // 10, fh // 20), 0, 0, 360, (40, 40, 60), -1)
+    cv2.ellipse(face, (fw // 2, 3 * fh // 4), (fw // 6, fh // 25), 0, 0, 360, (60, 60, 150), -1)
+
+    # Blemishes: small dark spots
+    for _ in range(max(4, fw * fh // 4000)):
+        cx, cy = int(rng.integers(0, fw)), int(rng.integers(0, fh))
+        cv2.circle(face, (cx, cy), int(rng.integers(1, 4)), (90, 100, 150), -1)
+
+    image[fy:fy+fh, fx:fx+fw] = np.clip(face, 0, 255).astype(np.uint8)
+    return image, [(fx, fy, fw, fh)]
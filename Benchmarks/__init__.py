@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks Package - Headless speed/quality measurements for processors and engines
+Run a module directly, e.g. python -m Benchmarks.SkinSmoothingBenchmark
+"""
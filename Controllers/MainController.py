@@ -12,7 +12,7 @@ from Models.Processors import (
     TransformProcessor, TransformType,
     ProcessorConfig
 )
-from Services import ImageService, FileService, FaceDetectionService
+from Services import ImageService, FileService, FaceDetectionService, PerformanceMonitor, Tracing
 from Views import MainView
 
 
@@ -40,6 +40,9 @@ class MainController:
         self.file_service = FileService()
         self.face_service = FaceDetectionService()
 
+        # Measurements are kept while recording is toggled off; off by default
+        self.performance_monitor = PerformanceMonitor()
+
         # Initialize View
         self.view = MainView(root)
 
@@ -101,6 +104,9 @@ class MainController:
             # Face beautify
             'open_face_beautify_image': self.open_face_beautify_image,
             'open_face_beautify_camera': self.open_face_beautify_camera,
+
+            # Performance panel
+            'open_performance_panel': self.open_performance_panel,
         }
 
         self.view.create_ui(callbacks)
@@ -159,7 +165,12 @@ class MainController:
             if success:
                 self._update_ui()
                 self.view.update_status(status_message)
+                self.refresh_performance_panel()
                 return True
+            elif self.image_service.last_error is not None:
+                self.view.show_error("Lỗi", f"Không thể áp dụng thao tác:\n{self.image_service.last_error}")
+                self.refresh_performance_panel()
+                return False
             else:
                 self.view.show_warning("Cảnh báo", "Không có thay đổi nào được áp dụng cho ảnh.")
                 return False
@@ -182,6 +193,7 @@ class MainController:
 
         image, path = result
         self.image_service.load_image(image, path)
+        self.view.reset_zoom()
         self._update_ui()
         self.view.update_status(f"Đã mở ảnh: {path}")
 
@@ -194,8 +206,12 @@ class MainController:
         if not file_path:
             return
 
-        image = self.image_service.get_current_image()
-        success = self.file_service.save_image(image, file_path)
+        # Rotated/flipped but otherwise unedited JPEGs only get a new EXIF orientation
+        success = self.file_service.save_jpeg_lossless(
+            self.image_model.file_path, file_path, self.image_model.source_orientation)
+        if not success:
+            image = self.image_service.get_current_image()
+            success = self.file_service.save_image(image, file_path)
 
         if success:
             self.view.show_info("Thành công", f"Đã lưu ảnh: {file_path}")
@@ -209,6 +225,7 @@ class MainController:
             return
 
         self.image_service.reset_to_original()
+        self.view.reset_zoom()
         self._update_ui()
         self.view.update_status("Đã reset ảnh về trạng thái ban đầu")
 
@@ -262,9 +279,7 @@ class MainController:
 
     def increase_contrast(self):
         """Increase contrast"""
-        config = ProcessorConfig()
-        config.set('alpha', 1.3)
-        config.set('beta', 0)
+        config = ProcessorConfig.of(alpha=1.3, beta=0)
         processor = BrightnessProcessor(BrightnessOperation.CONTRAST, config)
         self._apply_processor(processor, "Đã tăng độ tương phản")
 
@@ -350,14 +365,18 @@ class MainController:
         self._apply_processor(processor, "Đã lật dọc")
 
     def zoom_in_image(self):
-        """Zoom in"""
-        processor = TransformProcessor(TransformType.ZOOM_IN)
-        self._apply_processor(processor, "Đã phóng to")
+        """Zoom in (display only; the image and history are unchanged)"""
+        if not self._check_image_loaded():
+            return
+        self.view.zoom_in()
+        self.view.update_status(f"Đã phóng to ({self.view.get_zoom():.0%})")
 
     def zoom_out_image(self):
-        """Zoom out"""
-        processor = TransformProcessor(TransformType.ZOOM_OUT)
-        self._apply_processor(processor, "Đã thu nhỏ")
+        """Zoom out (display only; the image and history are unchanged)"""
+        if not self._check_image_loaded():
+            return
+        self.view.zoom_out()
+        self.view.update_status(f"Đã thu nhỏ ({self.view.get_zoom():.0%})")
 
     # === FACE BEAUTIFY ===
 
@@ -381,6 +400,73 @@ class MainController:
         except Exception as e:
             self.view.show_error("Lỗi", f"Không thể mở cửa sổ camera:\n{e}")
 
+    # === PERFORMANCE ===
+
+    def open_performance_panel(self):
+        """Open the Performance panel (timings of applied operations)"""
+        self.view.show_performance_panel({
+            'toggle': self.toggle_performance_recording,
+            'refresh': self.refresh_performance_panel,
+            'clear': self.clear_performance_data,
+            'export_csv': lambda: self.export_performance_data('csv'),
+            'export_json': lambda: self.export_performance_data('json'),
+            'toggle_trace': self.toggle_trace_recording,
+        })
+        self.refresh_performance_panel()
+
+    def toggle_performance_recording(self):
+        """Start/stop measuring operations (no cost while stopped)"""
+        recording = self.image_service.instrumentation is not None
+        self.image_service.set_instrumentation(None if recording else self.performance_monitor)
+        self.refresh_performance_panel()
+        self.view.update_status("Đã tắt đo hiệu năng" if recording else "Đang đo hiệu năng các thao tác")
+
+    def refresh_performance_panel(self):
+        """Redraw the Performance panel if it is open"""
+        self.view.update_performance_panel(self.performance_monitor.store.summary(),
+                                           self.image_service.instrumentation is not None,
+                                           Tracing.is_recording())
+
+    def clear_performance_data(self):
+        self.performance_monitor.store.clear()
+        self.refresh_performance_panel()
+
+    def export_performance_data(self, fmt: str):
+        """Save all measurements as CSV (one row per run) or JSON (summary and runs)"""
+        file_path = self.file_service.export_file_dialog(f"performance.{fmt}")
+        if not file_path:
+            return
+        store = self.performance_monitor.store
+        try:
+            if fmt == 'csv':
+                store.to_csv(file_path)
+            else:
+                store.to_json(file_path)
+        except OSError as e:
+            self.view.show_error("Lỗi", f"Không thể xuất dữ liệu:\n{e}")
+            return
+        self.view.update_status(f"Đã xuất dữ liệu hiệu năng: {file_path}")
+
+    def toggle_trace_recording(self):
+        """Start recording a trace, or stop and save it as trace.json (Chrome/Perfetto format)"""
+        if not Tracing.is_recording():
+            Tracing.TraceRecorder.start()
+            self.refresh_performance_panel()
+            self.view.update_status("Đang ghi trace (decode, xử lý, khuôn mặt, hiển thị)")
+            return
+
+        recorder = Tracing.TraceRecorder.stop()
+        self.refresh_performance_panel()
+        file_path = self.file_service.export_file_dialog("trace.json")
+        if not file_path:
+            return
+        try:
+            recorder.to_json(file_path)
+        except OSError as e:
+            self.view.show_error("Lỗi", f"Không thể lưu trace:\n{e}")
+            return
+        self.view.update_status(f"Đã lưu trace (mở bằng ui.perfetto.dev): {file_path}")
+
     def run(self):
         """Start the application"""
         self.view.run()
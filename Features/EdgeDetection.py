@@ -6,6 +6,7 @@ Bao gồm: Roberts, Prewitt, Sobel, Canny
 
 import cv2
 import numpy as np
+from Models.Processors.Engines import Histogram
 
 
 def roberts_edge_detection(img):
@@ -191,9 +192,132 @@ def scharr_edge_detection(img):
     return edges
 
 
+class EdgeAnalysis:
+    """
+    Phân tích biên nhiều đầu ra trên cùng một ảnh
+
+    Ảnh xám và gradient Sobel (int16) chỉ được tính một lần rồi dùng chung
+    cho độ lớn gradient, hướng gradient và Canny. Kết quả giống hệt các hàm
+    riêng lẻ trong module này.
+
+    Ví dụ:
+        analysis = EdgeAnalysis(img)
+        maps = analysis.compute(['magnitude', 'direction', 'canny'])
+    """
+
+    OUTPUTS = ('magnitude', 'direction', 'canny', 'laplacian', 'roberts', 'prewitt', 'scharr')
+
+    def __init__(self, img, ksize=3):
+        """
+        Args:
+            img: Ảnh đầu vào (grayscale hoặc color)
+            ksize: Kích thước kernel Sobel dùng chung
+        """
+        self.img = img
+        self.ksize = ksize
+        self._gray = None
+        self._gradients = None
+        self._canny_gradients = None
+
+    @property
+    def gray(self):
+        """Ảnh xám (tính một lần)"""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.img, cv2.COLOR_BGR2GRAY) if len(self.img.shape) == 3 else self.img
+        return self._gray
+
+    @property
+    def gradients(self):
+        """Cặp gradient Sobel (gx, gy) kiểu int16, tính một lần"""
+        if self._gradients is None:
+            ddepth = cv2.CV_16S if self.ksize <= 5 else cv2.CV_32F
+            self._gradients = (cv2.Sobel(self.gray, ddepth, 1, 0, ksize=self.ksize),
+                               cv2.Sobel(self.gray, ddepth, 0, 1, ksize=self.ksize))
+        return self._gradients
+
+    def _gradients_for_canny(self):
+        """
+        Gradient Sobel 3x3 theo biên BORDER_REPLICATE như cv2.Canny.
+        Chỉ khác gradient dùng chung ở viền 1 pixel, nên chỉ tính lại viền.
+        """
+        if self._canny_gradients is None:
+            gray = self.gray
+            h, w = gray.shape[:2]
+            if self.ksize != 3 or h < 2 or w < 2:
+                return None
+            gx, gy = (g.copy() for g in self.gradients)
+            strips = (
+                (np.s_[0:2, :], np.s_[0:1, :], np.s_[0:1, :]),
+                (np.s_[h-2:h, :], np.s_[1:2, :], np.s_[h-1:h, :]),
+                (np.s_[:, 0:2], np.s_[:, 0:1], np.s_[:, 0:1]),
+                (np.s_[:, w-2:w], np.s_[:, 1:2], np.s_[:, w-1:w]),
+            )
+            for source, keep, target in strips:
+                part = gray[source]
+                gx[target] = cv2.Sobel(part, cv2.CV_16S, 1, 0, ksize=3, borderType=cv2.BORDER_REPLICATE)[keep]
+                gy[target] = cv2.Sobel(part, cv2.CV_16S, 0, 1, ksize=3, borderType=cv2.BORDER_REPLICATE)[keep]
+            self._canny_gradients = (gx, gy)
+        return self._canny_gradients
+
+    def magnitude(self):
+        """Độ lớn gradient Sobel (giống sobel_edge_detection)"""
+        gx, gy = self.gradients
+        return cv2.convertScaleAbs(cv2.magnitude(gx.astype(np.float32), gy.astype(np.float32)))
+
+    def direction(self):
+        """Hướng gradient (giống gradient_direction)"""
+        gx, gy = self.gradients
+        direction = np.arctan2(gy.astype(np.float64), gx.astype(np.float64)) * 180 / np.pi
+        direction = (direction + 360) % 360
+        return direction.astype(np.uint8)
+
+    def canny(self, threshold1=50, threshold2=150):
+        """Canny từ gradient dùng chung (giống canny_edge_detection)"""
+        gradients = self._gradients_for_canny()
+        if gradients is None:
+            return cv2.Canny(self.gray, threshold1, threshold2)
+        return cv2.Canny(gradients[0], gradients[1], threshold1, threshold2)
+
+    def laplacian(self, ksize=3):
+        """Laplacian (giống laplacian_edge_detection)"""
+        ddepth = cv2.CV_16S if ksize <= 5 else cv2.CV_64F
+        return cv2.convertScaleAbs(cv2.Laplacian(self.gray, ddepth, ksize=ksize))
+
+    def roberts(self):
+        """Toán tử Roberts trên ảnh xám dùng chung"""
+        return roberts_edge_detection(self.gray)
+
+    def prewitt(self):
+        """Toán tử Prewitt trên ảnh xám dùng chung"""
+        return prewitt_edge_detection(self.gray)
+
+    def scharr(self):
+        """Toán tử Scharr (gradient int16, giống scharr_edge_detection)"""
+        gx = cv2.Scharr(self.gray, cv2.CV_16S, 1, 0)
+        gy = cv2.Scharr(self.gray, cv2.CV_16S, 0, 1)
+        return cv2.convertScaleAbs(cv2.magnitude(gx.astype(np.float32), gy.astype(np.float32)))
+
+    def compute(self, outputs=None):
+        """
+        Tính một tập con các bản đồ biên
+
+        Args:
+            outputs: Danh sách tên trong OUTPUTS (mặc định: tất cả)
+
+        Returns:
+            Dictionary {tên: ảnh}
+        """
+        outputs = self.OUTPUTS if outputs is None else outputs
+        unknown = [name for name in outputs if name not in self.OUTPUTS]
+        if unknown:
+            raise ValueError(f"Unknown edge outputs: {unknown}")
+        return {name: getattr(self, name)() for name in outputs}
+
+
 def compare_edge_detection_methods(img):
     """
     So sánh các phương pháp phát hiện biên
+    (ảnh xám và gradient được tính một lần qua EdgeAnalysis)
     
     Args:
         img: Ảnh đầu vào
@@ -201,14 +325,15 @@ def compare_edge_detection_methods(img):
     Returns:
         Dictionary chứa các kết quả
     """
+    analysis = EdgeAnalysis(img)
     results = {
         'original': img,
-        'roberts': roberts_edge_detection(img),
-        'prewitt': prewitt_edge_detection(img),
-        'sobel': sobel_edge_detection(img),
-        'canny': canny_edge_detection(img),
-        'laplacian': laplacian_edge_detection(img),
-        'scharr': scharr_edge_detection(img)
+        'roberts': analysis.roberts(),
+        'prewitt': analysis.prewitt(),
+        'sobel': analysis.magnitude(),
+        'canny': analysis.canny(),
+        'laplacian': analysis.laplacian(),
+        'scharr': analysis.scharr()
     }
     return results
 
@@ -230,12 +355,8 @@ def auto_canny(img, sigma=0.33):
     else:
         gray = img.copy()
     
-    # Tính median
-    median = np.median(gray)
-    
-    # Tính ngưỡng tự động
-    lower = int(max(0, (1.0 - sigma) * median))
-    upper = int(min(255, (1.0 + sigma) * median))
+    # Tính ngưỡng tự động quanh median (lấy từ histogram 256 bin)
+    lower, upper = Histogram.canny_thresholds(Histogram.histogram(gray), sigma)
     
     # Áp dụng Canny
     edges = cv2.Canny(gray, lower, upper)
@@ -47,7 +47,7 @@ def rotate_180(img):
     return cv2.rotate(img, cv2.ROTATE_180)
 
 
-def rotate_custom(img, angle, scale=1.0):
+def rotate_custom(img, angle, scale=1.0, cache=None):
     """
     Xoay ảnh theo góc tùy chỉnh
     
@@ -55,6 +55,8 @@ def rotate_custom(img, angle, scale=1.0):
         img: Ảnh đầu vào
         angle: Góc xoay (độ)
         scale: Tỷ lệ zoom (1.0 = giữ nguyên)
+        cache: RemapCache tùy chọn - dùng lại bảng remap cho các khung hình
+               cùng kích thước và cùng góc (camera, xử lý hàng loạt)
     
     Returns:
         Ảnh sau khi xoay
@@ -66,6 +68,8 @@ def rotate_custom(img, angle, scale=1.0):
     rotation_matrix = cv2.getRotationMatrix2D(center, angle, scale)
     
     # Áp dụng xoay
+    if cache is not None:
+        return cache.warp(img, rotation_matrix, (width, height))
     rotated = cv2.warpAffine(img, rotation_matrix, (width, height))
     
     return rotated
@@ -241,7 +245,7 @@ def add_border(img, border_size=10, border_color=(0, 0, 0)):
     )
 
 
-def perspective_transform(img, src_points, dst_points):
+def perspective_transform(img, src_points, dst_points, cache=None):
     """
     Biến đổi phối cảnh (perspective transform)
     
@@ -249,6 +253,8 @@ def perspective_transform(img, src_points, dst_points):
         img: Ảnh đầu vào
         src_points: 4 điểm nguồn [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
         dst_points: 4 điểm đích [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+        cache: RemapCache tùy chọn - mỗi khung hình chỉ còn một lần cv2.remap
+               (kết quả giống hệt warpPerspective)
     
     Returns:
         Ảnh sau biến đổi
@@ -261,6 +267,8 @@ def perspective_transform(img, src_points, dst_points):
     
     # Áp dụng biến đổi
     height, width = img.shape[:2]
+    if cache is not None:
+        return cache.warp(img, matrix, (width, height))
     transformed = cv2.warpPerspective(img, matrix, (width, height))
     
     return transformed
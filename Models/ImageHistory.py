@@ -2,16 +2,84 @@
 """ImageHistory.py - Undo/Redo management (Command Pattern)"""
 
 import numpy as np
-from typing import Optional
+from typing import List, Optional
 from collections import deque
+from .Orientation import Orientation
+
+
+class RegionDelta:
+    """
+    History entry for an edit that only touched some rectangles.
+    Stores the before/after pixels of each rectangle instead of a full frame.
+    """
+
+    def __init__(self, before: list, after: list):
+        """
+        Args:
+            before: RegionPatch list with the pixels prior to the edit
+            after: RegionPatch list with the pixels after the edit
+        """
+        self.before = before
+        self.after = after
+
+    @property
+    def nbytes(self) -> int:
+        return sum(p.pixels.nbytes for p in self.before) + sum(p.pixels.nbytes for p in self.after)
+
+    def revert(self, model):
+        # Restore in reverse order so overlapping rectangles unwind correctly
+        model.apply_patches(list(reversed(self.before)))
+
+    def reapply(self, model):
+        model.apply_patches(self.after)
+
+    def apply_to(self, image: np.ndarray) -> np.ndarray:
+        """Apply the edit to a plain array in place (used when rebasing history)"""
+        for patch in self.after:
+            patch.write_into(image)
+        return image
+
+
+class OrientationDelta:
+    """
+    History entry for a lossless rotate/flip. Undo and redo only change the
+    model's pending orientation; no pixels are stored or copied.
+    """
+
+    def __init__(self, step: Orientation):
+        """
+        Args:
+            step: Orientation applied on top of the entry below
+        """
+        self.step = step
+
+    @property
+    def nbytes(self) -> int:
+        return 0
+
+    def revert(self, model):
+        model.set_orientation(model.orientation.then(self.step.inverse()))
+
+    def reapply(self, model):
+        model.set_orientation(model.orientation.then(self.step))
+
+    def apply_to(self, image: np.ndarray) -> np.ndarray:
+        """Return the rotated/flipped image (used when rebasing history)"""
+        return self.step.apply(image)
 
 
 class ImageHistory:
-    """Manages undo/redo history. Single Responsibility: History only."""
+    """
+    Manages undo/redo history. Single Responsibility: History only.
+
+    The undo stack holds full snapshots, region deltas and orientation deltas.
+    A delta is always
+    relative to the entry below it, and the bottom entry is always a snapshot.
+    """
 
     def __init__(self, max_history: int = 20):
         self.max_history = max_history
-        self.undo_stack: deque = deque(maxlen=max_history)
+        self.undo_stack: deque = deque()
         self.redo_stack: deque = deque(maxlen=max_history)
 
     def clear(self):
@@ -26,10 +94,20 @@ class ImageHistory:
     def push(self, image: np.ndarray):
         if image is None:
             return
-        if self.undo_stack and np.array_equal(image, self.undo_stack[-1]):
+        top = self.undo_stack[-1] if self.undo_stack else None
+        if isinstance(top, np.ndarray) and np.array_equal(image, top):
             return
         self.undo_stack.append(image.copy())
         self.redo_stack.clear()
+        self._trim()
+
+    def push_delta(self, delta):
+        """Record an edit that only changed part of the image, or its orientation"""
+        if not self.undo_stack:
+            return
+        self.undo_stack.append(delta)
+        self.redo_stack.clear()
+        self._trim()
 
     def can_undo(self) -> bool:
         return len(self.undo_stack) > 1
@@ -37,17 +115,55 @@ class ImageHistory:
     def can_redo(self) -> bool:
         return len(self.redo_stack) > 0
 
-    def undo(self, current_image: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    def undo(self, model) -> bool:
+        """
+        Step the model back one entry
+
+        Args:
+            model: ImageModel whose current image is the top of the undo stack
+
+        Returns:
+            True if the model was changed
+        """
         if not self.can_undo():
-            return None
-        if current_image is not None:
-            self.redo_stack.append(current_image.copy())
-        self.undo_stack.pop()
-        return self.undo_stack[-1].copy()
+            return False
+        entry = self.undo_stack.pop()
+        self.redo_stack.append(entry)
+
+        if isinstance(entry, np.ndarray):
+            model.update_current(self._reconstruct_top(), copy=False)
+        else:
+            entry.revert(model)
+        return True
 
-    def redo(self) -> Optional[np.ndarray]:
+    def redo(self, model) -> bool:
+        """Re-apply the last undone entry to the model"""
         if not self.can_redo():
-            return None
-        restored = self.redo_stack.pop()
-        self.undo_stack.append(restored.copy())
-        return restored.copy()
+            return False
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(entry)
+
+        if isinstance(entry, np.ndarray):
+            model.update_current(entry)
+        else:
+            entry.reapply(model)
+        return True
+
+    def _reconstruct_top(self) -> np.ndarray:
+        """Build the image at the top of the undo stack from its last snapshot"""
+        entries: List = []
+        for entry in reversed(self.undo_stack):
+            if isinstance(entry, np.ndarray):
+                image = entry.copy()
+                break
+            entries.append(entry)
+        for delta in reversed(entries):
+            image = delta.apply_to(image)
+        return image
+
+    def _trim(self):
+        """Drop the oldest entries, folding a delta that becomes the bottom into a snapshot"""
+        while len(self.undo_stack) > self.max_history:
+            base = self.undo_stack.popleft()
+            if not isinstance(self.undo_stack[0], np.ndarray):
+                self.undo_stack[0] = self.undo_stack[0].apply_to(base)
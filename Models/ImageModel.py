@@ -3,19 +3,33 @@
 
 import cv2
 import numpy as np
-from typing import Optional
-from dataclasses import dataclass
+from typing import List, Optional
+from dataclasses import dataclass, field
+from .Orientation import Orientation, IDENTITY
+from .Processors.ImageStats import ImageStats
 
 
 @dataclass
 class ImageModel:
-    """Represents image data and state. Single Responsibility: Data only."""
+    """
+    Represents image data and state. Single Responsibility: Data only.
+
+    Rotations and flips are kept as an Orientation on top of the stored
+    pixels (current) and only applied when the pixels are needed.
+    get_copy() and the dimensions always describe the oriented image.
+    """
     original: Optional[np.ndarray] = None
     current: Optional[np.ndarray] = None
     file_path: Optional[str] = None
     width: int = 0
     height: int = 0
     channels: int = 0
+    version: int = 0  # Incremented on every change of the current image
+    orientation: Orientation = IDENTITY  # Pending lossless rotate/flip of current
+    # Orientation of the image relative to the loaded file, None once pixels were edited
+    source_orientation: Optional[Orientation] = field(default=IDENTITY, repr=False)
+    _stats: Optional[ImageStats] = field(default=None, init=False, repr=False, compare=False)
+    _stats_version: int = field(default=-1, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.current is not None:
@@ -27,29 +41,96 @@ class ImageModel:
         self.original = image.copy()
         self.current = image.copy()
         self.file_path = file_path
+        self.orientation = IDENTITY
+        self.source_orientation = IDENTITY
         self._update_dimensions()
+        self.version += 1
 
-    def update_current(self, image: np.ndarray):
+    def update_current(self, image: np.ndarray, copy: bool = True):
+        """Replace the current image (given as displayed, so the orientation is reset)"""
         if image is None:
             raise ValueError("Image cannot be None")
-        self.current = image.copy()
+        self.current = image.copy() if copy else image
+        self.orientation = IDENTITY
+        self.source_orientation = None
+        self._update_dimensions()
+        self.version += 1
+
+    def set_orientation(self, orientation: Orientation):
+        """Change the pending orientation without touching any pixels"""
+        if self.source_orientation is not None:
+            self.source_orientation = self.source_orientation.then(self.orientation.inverse()).then(orientation)
+        self.orientation = orientation
+        self._update_dimensions()
+        self.version += 1
+
+    def materialize(self):
+        """Apply the pending orientation to the stored pixels"""
+        if self.current is None or self.orientation.is_identity:
+            return
+        self.current = self.orientation.apply(self.current)
+        self.orientation = IDENTITY
         self._update_dimensions()
+        self.version += 1
+
+    def apply_patches(self, patches: List) -> List:
+        """
+        Write region patches into the current image in place
+
+        Args:
+            patches: RegionPatch list
+
+        Returns:
+            RegionPatch list holding the pixels that were overwritten
+        """
+        if self.current is None:
+            raise ValueError("Image cannot be None")
+        # Patch coordinates refer to the displayed image
+        self.materialize()
+        before = []
+        for patch in patches:
+            before.append(patch.read_from(self.current))
+            patch.write_into(self.current)
+        self.source_orientation = None
+        self.version += 1
+        return before
 
     def reset_to_original(self):
         if self.original is not None:
             self.current = self.original.copy()
+            self.orientation = IDENTITY
+            self.source_orientation = IDENTITY
             self._update_dimensions()
+            self.version += 1
 
     def _update_dimensions(self):
         if self.current is not None:
-            self.height, self.width = self.current.shape[:2]
+            height, width = self.current.shape[:2]
+            self.width, self.height = self.orientation.apply_size(width, height)
             self.channels = self.current.shape[2] if len(self.current.shape) > 2 else 1
 
+    @property
+    def stats(self) -> Optional[ImageStats]:
+        """Statistics of the displayed image, recreated lazily when the version changes"""
+        if self.current is None:
+            return None
+        if self._stats is None or self._stats_version != self.version:
+            self._stats = ImageStats(self.get_display_image())
+            self._stats_version = self.version
+        return self._stats
+
     def has_image(self) -> bool:
         return self.current is not None
 
     def get_copy(self) -> Optional[np.ndarray]:
-        return self.current.copy() if self.current is not None else None
+        """Copy of the displayed (oriented) image"""
+        return self.orientation.apply(self.current) if self.current is not None else None
+
+    def get_display_image(self) -> Optional[np.ndarray]:
+        """Displayed image for read-only use; no copy when nothing is pending"""
+        if self.current is None or self.orientation.is_identity:
+            return self.current
+        return self.orientation.apply(self.current)
 
     def get_original_copy(self) -> Optional[np.ndarray]:
         return self.original.copy() if self.original is not None else None
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Orientation.py - Lossless rotations and flips as one D4 state (Value Object)"""
+
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Tuple
+
+# (quarter turns clockwise, mirrored) -> EXIF Orientation tag (TIFF 6.0 / Exif 2.3)
+_EXIF_TAGS = {
+    (0, False): 1, (0, True): 2, (2, False): 3, (2, True): 4,
+    (3, True): 5, (1, False): 6, (1, True): 7, (3, False): 8,
+}
+_FROM_EXIF = {tag: key for key, tag in _EXIF_TAGS.items()}
+
+
+@dataclass(frozen=True)
+class Orientation:
+    """
+    Element of the dihedral group D4: an optional horizontal mirror followed
+    by `rotation` clockwise quarter turns. Any sequence of 90° rotations and
+    flips composes into one of these eight states, so the pixels only need
+    to be moved once, when they are actually needed.
+    """
+    rotation: int = 0
+    mirrored: bool = False
+
+    def __post_init__(self):
+        object.__setattr__(self, 'rotation', self.rotation % 4)
+
+    @classmethod
+    def rotate_cw(cls, quarter_turns: int = 1) -> 'Orientation':
+        return cls(quarter_turns)
+
+    @classmethod
+    def flip_horizontal(cls) -> 'Orientation':
+        return cls(0, True)
+
+    @classmethod
+    def flip_vertical(cls) -> 'Orientation':
+        return cls(2, True)
+
+    @classmethod
+    def from_exif(cls, tag: int) -> 'Orientation':
+        """Orientation for an EXIF Orientation tag (invalid tags count as 1)"""
+        rotation, mirrored = _FROM_EXIF.get(tag, (0, False))
+        return cls(rotation, mirrored)
+
+    @property
+    def exif_tag(self) -> int:
+        return _EXIF_TAGS[(self.rotation, self.mirrored)]
+
+    @property
+    def is_identity(self) -> bool:
+        return self.rotation == 0 and not self.mirrored
+
+    @property
+    def swaps_axes(self) -> bool:
+        return self.rotation % 2 == 1
+
+    def then(self, other: 'Orientation') -> 'Orientation':
+        """Orientation equal to applying self, then other"""
+        # A mirror reverses the direction of the rotations before it
+        rotation = other.rotation + (-self.rotation if other.mirrored else self.rotation)
+        return Orientation(rotation, self.mirrored != other.mirrored)
+
+    def inverse(self) -> 'Orientation':
+        if self.mirrored:
+            return self  # mirror-then-rotate elements are involutions
+        return Orientation(-self.rotation, False)
+
+    def apply_size(self, width: int, height: int) -> Tuple[int, int]:
+        """(width, height) after applying this orientation"""
+        return (height, width) if self.swaps_axes else (width, height)
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        """New array with the orientation applied (a copy for the identity)"""
+        key = (self.rotation, self.mirrored)
+        if key == (0, False):
+            return image.copy()
+        if key == (1, False):
+            return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+        if key == (2, False):
+            return cv2.rotate(image, cv2.ROTATE_180)
+        if key == (3, False):
+            return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        if key == (0, True):
+            return cv2.flip(image, 1)
+        if key == (2, True):
+            return cv2.flip(image, 0)
+        if key == (3, True):
+            return cv2.transpose(image)
+        return cv2.flip(cv2.transpose(image), -1)
+
+
+IDENTITY = Orientation()
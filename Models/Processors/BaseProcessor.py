@@ -2,35 +2,380 @@
 """BaseProcessor.py - Abstract base for all processors (OCP, DIP)"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-from dataclasses import dataclass, field
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, field, replace
 import numpy as np
+from .Capabilities import Capabilities, UNKNOWN
+from .CostModel import CostModel
 
 
-@dataclass
+def _freeze(value: Any) -> Any:
+    """Convert a config value into a hashable equivalent"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    return value
+
+
+@dataclass(frozen=True, eq=False)
 class ProcessorConfig:
-    """Configuration for processors"""
-    params: Dict[str, Any] = field(default_factory=dict)
+    """
+    Immutable configuration for processors (Value Object).
+    Hashable, so it can be shared between threads and used as a cache key.
+    """
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'params', MappingProxyType(dict(self.params)))
+        object.__setattr__(self, '_key', tuple(sorted((k, _freeze(v)) for k, v in self.params.items())))
+
+    @classmethod
+    def of(cls, **params: Any) -> 'ProcessorConfig':
+        """Build a config from keyword arguments"""
+        return cls(params)
 
     def get(self, key: str, default: Any = None) -> Any:
         return self.params.get(key, default)
 
-    def set(self, key: str, value: Any):
-        self.params[key] = value
+    def with_overrides(self, overrides: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> 'ProcessorConfig':
+        """Return a new config with some parameters replaced (self is unchanged)"""
+        merged = dict(self.params)
+        merged.update(overrides or {})
+        merged.update(kwargs)
+        return ProcessorConfig(merged)
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ProcessorConfig):
+            return NotImplemented
+        return self._key == other._key
+
+    def __repr__(self) -> str:
+        return f"ProcessorConfig({dict(self.params)!r})"
+
+
+@dataclass
+class RegionPatch:
+    """Pixels for one rectangle of an image, placed at (x, y)"""
+    x: int
+    y: int
+    pixels: np.ndarray
+
+    @property
+    def rect(self) -> Tuple[int, int, int, int]:
+        h, w = self.pixels.shape[:2]
+        return self.x, self.y, w, h
+
+    def read_from(self, image: np.ndarray) -> 'RegionPatch':
+        """Copy the same rectangle out of another image"""
+        x, y, w, h = self.rect
+        return RegionPatch(x, y, image[y:y+h, x:x+w].copy())
+
+    def write_into(self, image: np.ndarray):
+        x, y, w, h = self.rect
+        image[y:y+h, x:x+w] = self.pixels
+
+
+class ScratchBuffers:
+    """
+    Named temporary arrays reused across process_into calls.
+
+    A buffer is reallocated only when the requested shape or dtype changes,
+    so a loop over same-size frames allocates its temporaries once. Not
+    thread-safe: use one instance per worker thread.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Uninitialised array for name with this shape and dtype"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != np.dtype(dtype):
+            buffer = self._buffers[name] = np.empty(shape, dtype)
+        return buffer
+
+    def like(self, name: str, image: np.ndarray) -> np.ndarray:
+        return self.get(name, image.shape, image.dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def clear(self):
+        self._buffers.clear()
 
 
 class BaseProcessor(ABC):
-    """Abstract base for all image processors. Follows SOLID principles."""
+    """
+    Abstract base for all image processors. Follows SOLID principles.
+
+    Processors are stateless: name and config are fixed at construction and
+    per-call changes go through explicit overrides, so one instance can be
+    shared by many worker threads.
+
+    Subclasses describe their operations in STRATEGIES, a dispatch table
+    mapping each operation type to (method name, parameter defaults). The
+    selected method is bound to its resolved parameters once, at
+    construction, so a plain process() call is a single prepared call.
+    CAPABILITIES describes each operation type for schedulers.
+
+    INTO_STRATEGIES optionally maps operation types to methods that write
+    into a caller-provided output (see process_into), and BATCH_STRATEGIES
+    to methods handling a whole (N, H, W[, C]) stack in one call (see
+    process_batch); both receive the same parameters as the STRATEGIES method.
+    """
+
+    STRATEGIES: Dict[Any, Tuple[str, Dict[str, Any]]] = {}
+
+    # Operation type -> Capabilities (radius may be refined by _capability_radius)
+    CAPABILITIES: Dict[Any, Capabilities] = {}
+
+    # Operation types whose strategy also accepts stats= (an ImageStats of the input)
+    STATS_CONSUMERS: frozenset = frozenset()
+
+    # Operation type -> name of a method (src, dst, scratch, **params) writing into dst
+    INTO_STRATEGIES: Dict[Any, str] = {}
+
+    # Operation type -> name of a method (stack, **params) returning the processed stack
+    BATCH_STRATEGIES: Dict[Any, str] = {}
 
     def __init__(self, name: str, config: ProcessorConfig = None):
         self.name = name
         self.config = config if config is not None else ProcessorConfig()
+        self._prepared = self.prepare(self.config)
+        self._prepared_into = self.prepare_into(self.config)
+        self._prepared_batch = self.prepare_batch(self.config)
+
+    def process(self, image: np.ndarray, overrides: Optional[Mapping[str, Any]] = None,
+                stats: Any = None) -> np.ndarray:
+        """
+        Process image and return result (Template Method)
+
+        Args:
+            image: Input image (not modified)
+            overrides: Optional parameters replacing config values for this call only
+            stats: Optional ImageStats of image, reused by adaptive operations
+        """
+        self.validate_image(image)
+        return self._process(image, self.resolve_config(overrides), stats)
+
+    def _process(self, image: np.ndarray, config: ProcessorConfig, stats: Any = None) -> np.ndarray:
+        """Process a validated image with the effective config"""
+        prepared = self._prepared_for(config)
+        if stats is not None and self.strategy_key in self.STATS_CONSUMERS:
+            return prepared(image, stats=stats)
+        return prepared(image)
 
+    def process_into(self, src: np.ndarray, dst: np.ndarray, scratch: Optional[ScratchBuffers] = None,
+                     overrides: Optional[Mapping[str, Any]] = None, stats: Any = None) -> np.ndarray:
+        """
+        Process src into a preallocated output
+
+        Operations listed in INTO_STRATEGIES write straight into dst through
+        OpenCV's dst= parameters and keep their temporaries in scratch, so a
+        loop over same-size frames allocates nothing after the first frame.
+        Other operations run process() and copy the result into dst.
+
+        Args:
+            src: Input image (not modified unless dst is src)
+            dst: Output array of shape output_shape(src) and the input dtype;
+                may be src itself
+            scratch: Temporaries reused across calls (a fresh set if None)
+            overrides: Optional parameters replacing config values for this call only
+            stats: Optional ImageStats of src, reused by adaptive operations
+
+        Returns:
+            dst
+
+        Raises:
+            ValueError: If dst does not have the output shape and dtype
+        """
+        self.validate_image(src)
+        expected = self.output_shape(src)
+        if not isinstance(dst, np.ndarray) or dst.shape != expected or dst.dtype != src.dtype:
+            got = None if not isinstance(dst, np.ndarray) else (dst.shape, dst.dtype)
+            raise ValueError(f"{self.name}: dst must have shape {expected} and dtype {src.dtype}, got {got}")
+
+        config = self.resolve_config(overrides)
+        native = self._prepared_into if config is self.config else self.prepare_into(config)
+        if native is None:
+            np.copyto(dst, self._process(src, config, stats))
+            return dst
+
+        scratch = scratch if scratch is not None else ScratchBuffers()
+        key = self.strategy_key
+        if np.shares_memory(src, dst) and not self.CAPABILITIES.get(key, UNKNOWN).inplace:
+            # Neighbourhood and geometric ops must not read pixels they already wrote
+            source = scratch.like('_source', src)
+            np.copyto(source, src)
+            src = source
+        if stats is not None and key in self.STATS_CONSUMERS:
+            native(src, dst, scratch, stats=stats)
+        else:
+            native(src, dst, scratch)
+        return dst
+
+    def process_batch(self, stack: np.ndarray, overrides: Optional[Mapping[str, Any]] = None) -> np.ndarray:
+        """
+        Process N same-size images at once
+
+        Operations listed in BATCH_STRATEGIES handle the whole stack in one
+        vectorised call; the others process each image into one output
+        stack, sharing one set of scratch buffers where process_into is native.
+
+        Args:
+            stack: (N, H, W, C) colour or (N, H, W) grayscale images (not modified)
+            overrides: Optional parameters replacing config values for this call only
+
+        Returns:
+            New (N, ...) stack of results
+
+        Raises:
+            ValueError: If stack is not a non-empty 3- or 4-dimensional array
+        """
+        if not isinstance(stack, np.ndarray) or stack.ndim not in (3, 4) or stack.size == 0:
+            raise ValueError(f"{self.name}: Expected a non-empty (N, H, W[, C]) stack")
+
+        config = self.resolve_config(overrides)
+        native = self._prepared_batch if config is self.config else self.prepare_batch(config)
+        if native is not None:
+            return native(np.ascontiguousarray(stack))
+
+        # Bind once: per-image validation and config resolution would dominate small images
+        out = np.empty((len(stack),) + tuple(self.output_shape(stack[0])), stack.dtype)
+        into = self._prepared_into if config is self.config else self.prepare_into(config)
+        if into is None:
+            # Through _process: processors such as FaceBeautify do per-image work around the strategy
+            for image, result in zip(stack, out):
+                np.copyto(result, self._process(image, config))
+        else:
+            scratch = ScratchBuffers()
+            for image, result in zip(stack, out):
+                into(image, result, scratch)
+        return out
+
+    @staticmethod
+    def _stack_rows(stack: np.ndarray) -> np.ndarray:
+        """
+        View of a contiguous (N, H, W[, C]) stack as one (N*H, W[, C]) image
+
+        Per-pixel and per-row operations (LUTs, scaling, horizontal flips)
+        give the same result on this tall image as on each image separately.
+        """
+        return stack.reshape((stack.shape[0] * stack.shape[1],) + stack.shape[2:])
+
+    def output_shape(self, image: np.ndarray) -> Tuple[int, ...]:
+        """Shape of the result for image (same as the input unless overridden)"""
+        return image.shape
+
+    def _prepared_for(self, config: ProcessorConfig) -> Callable[..., np.ndarray]:
+        """Prepared strategy bound at construction, or a fresh one for overridden configs"""
+        return self._prepared if config is self.config else self.prepare(config)
+
+    @property
     @abstractmethod
-    def process(self, image: np.ndarray) -> np.ndarray:
-        """Process image and return result"""
+    def strategy_key(self) -> Any:
+        """Operation type used to look up the strategy in STRATEGIES"""
         pass
 
+    def prepare(self, config: ProcessorConfig) -> Callable[..., np.ndarray]:
+        """
+        Bind the strategy for this processor's operation to its parameters
+
+        Returns:
+            Callable taking the image (plus any strategy-specific positional
+            arguments) and returning the result
+        """
+        key = self.strategy_key
+        try:
+            method_name, defaults = self.STRATEGIES[key]
+        except KeyError:
+            raise ValueError(f"{type(self).__name__}: Unknown operation {key}") from None
+        params = {name: config.get(name, default) for name, default in defaults.items()}
+        return partial(getattr(self, method_name), **self._resolve_params(key, params))
+
+    def prepare_into(self, config: ProcessorConfig) -> Optional[Callable[..., None]]:
+        """
+        Bind the native process_into method of this operation, if it has one
+
+        Returns:
+            Callable (src, dst, scratch) or None to fall back to process()
+        """
+        return self._prepare_variant(self.INTO_STRATEGIES, config)
+
+    def prepare_batch(self, config: ProcessorConfig) -> Optional[Callable[..., np.ndarray]]:
+        """
+        Bind the vectorised process_batch method of this operation, if it has one
+
+        Returns:
+            Callable (stack) or None to fall back to per-image processing
+        """
+        return self._prepare_variant(self.BATCH_STRATEGIES, config)
+
+    def _prepare_variant(self, methods: Dict[Any, str], config: ProcessorConfig) -> Optional[Callable]:
+        """Bind methods[operation] to the parameters of the STRATEGIES entry"""
+        key = self.strategy_key
+        method_name = methods.get(key)
+        if method_name is None:
+            return None
+        _, defaults = self.STRATEGIES[key]
+        params = {name: config.get(name, default) for name, default in defaults.items()}
+        return partial(getattr(self, method_name), **self._resolve_params(key, params))
+
+    def _resolve_params(self, key: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Hook for precomputing derived values (tables, kernels) from raw parameters"""
+        return params
+
+    @property
+    def capabilities(self) -> Capabilities:
+        """Scheduling metadata of this operation with the current config and calibrated cost"""
+        key = self.strategy_key
+        caps = self.CAPABILITIES.get(key, UNKNOWN)
+        _, defaults = self.STRATEGIES.get(key, (None, {}))
+        params = {name: self.config.get(name, default) for name, default in defaults.items()}
+        radius = self._capability_radius(key, params)
+        return replace(caps, radius=caps.radius if radius is None else radius,
+                       cost_ms_per_mp=CostModel.default().cost_ms_per_mp(self))
+
+    def _capability_radius(self, key: Any, params: Dict[str, Any]) -> Optional[int]:
+        """Hook for neighbourhood radii that depend on parameters (kernel sizes)"""
+        return None
+
+    def resolve_config(self, overrides: Optional[Mapping[str, Any]] = None) -> ProcessorConfig:
+        """Effective config for one call"""
+        return self.config.with_overrides(overrides) if overrides else self.config
+
+    def process_regions(self, image: np.ndarray,
+                        overrides: Optional[Mapping[str, Any]] = None) -> Optional[List[RegionPatch]]:
+        """
+        Region-aware processing for operations that only touch some rectangles.
+
+        Returns:
+            List of patches to write over the (unmodified) input, or None if
+            this processor changes the whole frame
+        """
+        return None
+
+    def orientation_step(self) -> Any:
+        """
+        Lossless rotate/flip this operation amounts to.
+
+        Returns:
+            Orientation the image model can compose without touching pixels,
+            or None if this processor computes new pixels
+        """
+        return None
+
     def validate_image(self, image: np.ndarray):
         if image is None or not isinstance(image, np.ndarray) or image.size == 0:
             raise ValueError(f"{self.name}: Invalid image")
@@ -5,6 +5,8 @@ import cv2
 import numpy as np
 from enum import Enum
 from .BaseProcessor import BaseProcessor, ProcessorConfig
+from .Capabilities import Capabilities, OpClass, radius_of
+from .Engines import BlurEngine, MedianEngine
 
 
 class BlurType(Enum):
@@ -18,44 +20,86 @@ class BlurType(Enum):
 class BlurProcessor(BaseProcessor):
     """Blur processor implementing Strategy Pattern"""
 
+    STRATEGIES = {
+        BlurType.AVERAGE: ('_apply_average_blur', {'kernel_size': (5, 5)}),
+        BlurType.GAUSSIAN: ('_apply_gaussian_blur', {'kernel_size': (5, 5), 'sigma': 1,
+                                                 'blur_engine': BlurEngine.DEFAULT_ENGINE}),
+        BlurType.MEDIAN: ('_apply_median_blur', {'kernel_size': 5, 'median_engine': MedianEngine.DEFAULT_ENGINE}),
+        BlurType.BILATERAL: ('_apply_bilateral_blur', {'d': 9, 'sigma_color': 75, 'sigma_space': 75}),
+    }
+
+    INTO_STRATEGIES = {
+        BlurType.AVERAGE: '_apply_average_blur_into',
+        BlurType.GAUSSIAN: '_apply_gaussian_blur_into',
+        BlurType.MEDIAN: '_apply_median_blur_into',
+        BlurType.BILATERAL: '_apply_bilateral_blur_into',
+    }
+
+    CAPABILITIES = {
+        BlurType.AVERAGE: Capabilities(OpClass.LOCAL),
+        BlurType.GAUSSIAN: Capabilities(OpClass.LOCAL),
+        BlurType.MEDIAN: Capabilities(OpClass.LOCAL),
+        BlurType.BILATERAL: Capabilities(OpClass.LOCAL),
+    }
+
     def __init__(self, blur_type: BlurType, config: ProcessorConfig = None):
-        super().__init__(f"Blur_{blur_type.value}", config)
         self.blur_type = blur_type
+        super().__init__(f"Blur_{blur_type.value}", config)
 
-    def process(self, image: np.ndarray) -> np.ndarray:
-        """Apply blur based on type"""
-        self.validate_image(image)
-
-        if self.blur_type == BlurType.AVERAGE:
-            return self._apply_average_blur(image)
-        elif self.blur_type == BlurType.GAUSSIAN:
-            return self._apply_gaussian_blur(image)
-        elif self.blur_type == BlurType.MEDIAN:
-            return self._apply_median_blur(image)
-        elif self.blur_type == BlurType.BILATERAL:
-            return self._apply_bilateral_blur(image)
-        else:
-            raise ValueError(f"Unknown blur type: {self.blur_type}")
+    @property
+    def strategy_key(self) -> BlurType:
+        return self.blur_type
+
+    def _capability_radius(self, key, params):
+        if key == BlurType.BILATERAL:
+            # OpenCV derives the diameter from sigma_space when d <= 0
+            return params['d'] // 2 if params['d'] > 0 else int(round(params['sigma_space'] * 1.5))
+        radius = radius_of(params['kernel_size'])
+        if key == BlurType.GAUSSIAN and radius == 0:
+            radius = int(np.ceil(3 * params['sigma']))
+        return radius
 
-    def _apply_average_blur(self, image: np.ndarray) -> np.ndarray:
+    def _apply_average_blur(self, image: np.ndarray, kernel_size) -> np.ndarray:
         """Average blur using cv2.blur"""
-        kernel_size = self.config.get('kernel_size', (5, 5))
         return cv2.blur(image, kernel_size)
 
-    def _apply_gaussian_blur(self, image: np.ndarray) -> np.ndarray:
-        """Gaussian blur using cv2.GaussianBlur"""
-        kernel_size = self.config.get('kernel_size', (5, 5))
-        sigma = self.config.get('sigma', 1)
-        return cv2.GaussianBlur(image, kernel_size, sigma)
+    def _apply_gaussian_blur(self, image: np.ndarray, kernel_size, sigma,
+                             blur_engine: str = BlurEngine.DEFAULT_ENGINE) -> np.ndarray:
+        """Gaussian blur; large kernels use a constant-time engine (see BlurEngine)"""
+        return BlurEngine.gaussian_blur(image, kernel_size, sigma, blur_engine)
 
-    def _apply_median_blur(self, image: np.ndarray) -> np.ndarray:
-        """Median blur using cv2.medianBlur"""
-        kernel_size = self.config.get('kernel_size', 5)
-        return cv2.medianBlur(image, kernel_size)
+    def _apply_median_blur(self, image: np.ndarray, kernel_size: int,
+                           median_engine: str = MedianEngine.DEFAULT_ENGINE) -> np.ndarray:
+        """Median blur for any odd kernel_size; large kernels run in parallel bands (see MedianEngine)"""
+        return MedianEngine.median_blur(image, kernel_size, median_engine)
 
-    def _apply_bilateral_blur(self, image: np.ndarray) -> np.ndarray:
+    def _apply_bilateral_blur(self, image: np.ndarray, d: int, sigma_color: float,
+                              sigma_space: float) -> np.ndarray:
         """Bilateral blur using cv2.bilateralFilter - preserves edges"""
-        d = self.config.get('d', 9)
-        sigma_color = self.config.get('sigma_color', 75)
-        sigma_space = self.config.get('sigma_space', 75)
         return cv2.bilateralFilter(image, d, sigma_color, sigma_space)
+
+    # process_into variants: OpenCV filters write into dst; the approximate
+    # and banded engines build their own result, which is copied
+
+    def _apply_average_blur_into(self, src: np.ndarray, dst: np.ndarray, scratch, kernel_size):
+        cv2.blur(src, kernel_size, dst=dst)
+
+    def _apply_gaussian_blur_into(self, src: np.ndarray, dst: np.ndarray, scratch, kernel_size, sigma,
+                                  blur_engine: str = BlurEngine.DEFAULT_ENGINE):
+        engine = BlurEngine.select_engine(kernel_size, sigma) if blur_engine == "auto" else blur_engine
+        if engine == "direct":
+            BlurEngine.direct(src, kernel_size, sigma, dst=dst)
+        else:
+            np.copyto(dst, BlurEngine.gaussian_blur(src, kernel_size, sigma, engine))
+
+    def _apply_median_blur_into(self, src: np.ndarray, dst: np.ndarray, scratch, kernel_size: int,
+                                median_engine: str = MedianEngine.DEFAULT_ENGINE):
+        engine = MedianEngine.select_engine(src, kernel_size) if median_engine == "auto" else median_engine
+        if engine == "direct":
+            MedianEngine.direct(src, kernel_size, dst=dst)
+        else:
+            np.copyto(dst, MedianEngine.median_blur(src, kernel_size, engine))
+
+    def _apply_bilateral_blur_into(self, src: np.ndarray, dst: np.ndarray, scratch, d: int,
+                                   sigma_color: float, sigma_space: float):
+        cv2.bilateralFilter(src, d, sigma_color, sigma_space, dst=dst)
@@ -4,7 +4,10 @@
 import cv2
 import numpy as np
 from enum import Enum
+from functools import lru_cache
 from .BaseProcessor import BaseProcessor, ProcessorConfig
+from .Capabilities import Capabilities, OpClass
+from .ImageStats import ImageStats
 
 
 class BrightnessOperation(Enum):
@@ -16,29 +19,75 @@ class BrightnessOperation(Enum):
     AUTO = "auto"
 
 
+@lru_cache(maxsize=32)
+def _gamma_table(gamma: float) -> np.ndarray:
+    """Lookup table for gamma correction (read-only, shared between calls)"""
+    inv_gamma = 1.0 / gamma
+    table = np.array([((i / 255.0) ** inv_gamma) * 255
+                      for i in range(256)]).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=64)
+def _offset_table(value) -> np.ndarray:
+    """Lookup table equal to _adjust_brightness(image, value) per pixel (read-only)"""
+    table = np.clip(np.arange(256, dtype=np.int16) + value, 0, 255).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
 class BrightnessProcessor(BaseProcessor):
     """Brightness/Contrast processor implementing Strategy Pattern"""
 
+    STRATEGIES = {
+        BrightnessOperation.INCREASE: ('_increase_brightness', {'value': 50}),
+        BrightnessOperation.DECREASE: ('_decrease_brightness', {'value': 50}),
+        BrightnessOperation.CONTRAST: ('_adjust_contrast', {'alpha': 1.0, 'beta': 0}),
+        BrightnessOperation.GAMMA: ('_gamma_correction', {'gamma': 1.0}),
+        BrightnessOperation.AUTO: ('_auto_brightness', {'target_mean': 128, 'histogram_step': 1}),
+    }
+
+    STATS_CONSUMERS = frozenset({BrightnessOperation.AUTO})
+
+    INTO_STRATEGIES = {
+        BrightnessOperation.INCREASE: '_increase_brightness_into',
+        BrightnessOperation.DECREASE: '_decrease_brightness_into',
+        BrightnessOperation.CONTRAST: '_adjust_contrast_into',
+        BrightnessOperation.GAMMA: '_gamma_correction_into',
+        BrightnessOperation.AUTO: '_auto_brightness_into',
+    }
+
+    # AUTO needs each image's own mean, so it runs per image
+    BATCH_STRATEGIES = {
+        BrightnessOperation.INCREASE: '_increase_brightness_batch',
+        BrightnessOperation.DECREASE: '_decrease_brightness_batch',
+        BrightnessOperation.CONTRAST: '_adjust_contrast_batch',
+        BrightnessOperation.GAMMA: '_gamma_correction_batch',
+    }
+
+    CAPABILITIES = {
+        BrightnessOperation.INCREASE: Capabilities(OpClass.POINT, inplace=True),
+        BrightnessOperation.DECREASE: Capabilities(OpClass.POINT, inplace=True),
+        BrightnessOperation.CONTRAST: Capabilities(OpClass.POINT, inplace=True),
+        BrightnessOperation.GAMMA: Capabilities(OpClass.POINT, inplace=True),
+        # A point op once the image mean is known
+        BrightnessOperation.AUTO: Capabilities(OpClass.GLOBAL, inplace=True),
+    }
+
     def __init__(self, operation: BrightnessOperation, config: ProcessorConfig = None):
-        super().__init__(f"Brightness_{operation.value}", config)
         self.operation = operation
+        super().__init__(f"Brightness_{operation.value}", config)
+
+    @property
+    def strategy_key(self) -> BrightnessOperation:
+        return self.operation
 
-    def process(self, image: np.ndarray) -> np.ndarray:
-        """Apply brightness/contrast adjustment based on operation"""
-        self.validate_image(image)
-
-        if self.operation == BrightnessOperation.INCREASE:
-            return self._increase_brightness(image)
-        elif self.operation == BrightnessOperation.DECREASE:
-            return self._decrease_brightness(image)
-        elif self.operation == BrightnessOperation.CONTRAST:
-            return self._adjust_contrast(image)
-        elif self.operation == BrightnessOperation.GAMMA:
-            return self._gamma_correction(image)
-        elif self.operation == BrightnessOperation.AUTO:
-            return self._auto_brightness(image)
-        else:
-            raise ValueError(f"Unknown brightness operation: {self.operation}")
+    def _resolve_params(self, key, params):
+        """Build the gamma lookup table once instead of on every call"""
+        if key == BrightnessOperation.GAMMA:
+            return {'table': _gamma_table(float(params['gamma']))}
+        return params
 
     def _adjust_brightness(self, image: np.ndarray, value: int) -> np.ndarray:
         """Core brightness adjustment - preserves exact behavior from Features/Brightness.py"""
@@ -51,37 +100,60 @@ class BrightnessProcessor(BaseProcessor):
 
         return adjusted.astype(np.uint8)
 
-    def _increase_brightness(self, image: np.ndarray) -> np.ndarray:
+    def _increase_brightness(self, image: np.ndarray, value: int) -> np.ndarray:
         """Increase brightness"""
-        value = self.config.get('value', 50)
         return self._adjust_brightness(image, abs(value))
 
-    def _decrease_brightness(self, image: np.ndarray) -> np.ndarray:
+    def _decrease_brightness(self, image: np.ndarray, value: int) -> np.ndarray:
         """Decrease brightness"""
-        value = self.config.get('value', 50)
         return self._adjust_brightness(image, -abs(value))
 
-    def _adjust_contrast(self, image: np.ndarray) -> np.ndarray:
-        """Adjust contrast using cv2.convertScaleAbs"""
-        alpha = self.config.get('alpha', 1.0)  # Contrast control
-        beta = self.config.get('beta', 0)       # Brightness control
+    def _adjust_contrast(self, image: np.ndarray, alpha: float, beta: float) -> np.ndarray:
+        """Adjust contrast using cv2.convertScaleAbs (alpha: contrast, beta: brightness)"""
         return cv2.convertScaleAbs(image, alpha=alpha, beta=beta)
 
-    def _gamma_correction(self, image: np.ndarray) -> np.ndarray:
-        """Gamma correction using lookup table"""
-        gamma = self.config.get('gamma', 1.0)
-
-        # Create lookup table
-        inv_gamma = 1.0 / gamma
-        table = np.array([((i / 255.0) ** inv_gamma) * 255
-                          for i in range(256)]).astype(np.uint8)
-
-        # Apply lookup table
+    def _gamma_correction(self, image: np.ndarray, table: np.ndarray) -> np.ndarray:
+        """Gamma correction using a precomputed lookup table"""
         return cv2.LUT(image, table)
 
-    def _auto_brightness(self, image: np.ndarray) -> np.ndarray:
-        """Auto brightness to target mean"""
-        target_mean = self.config.get('target_mean', 128)
-        current_mean = np.mean(image)
+    def _auto_brightness(self, image: np.ndarray, target_mean: float, histogram_step: int = 1,
+                         stats: ImageStats = None) -> np.ndarray:
+        """Auto brightness to target mean (mean from a histogram, subsampled if histogram_step > 1)"""
+        stats = stats if stats is not None else ImageStats(image)
+        current_mean = stats.mean(histogram_step)
         diff = target_mean - current_mean
         return self._adjust_brightness(image, int(diff))
+
+    # process_into variants: one table lookup or scaled copy straight into dst
+
+    def _increase_brightness_into(self, src: np.ndarray, dst: np.ndarray, scratch, value: int):
+        cv2.LUT(src, _offset_table(abs(value)), dst=dst)
+
+    def _decrease_brightness_into(self, src: np.ndarray, dst: np.ndarray, scratch, value: int):
+        cv2.LUT(src, _offset_table(-abs(value)), dst=dst)
+
+    def _adjust_contrast_into(self, src: np.ndarray, dst: np.ndarray, scratch, alpha: float, beta: float):
+        cv2.convertScaleAbs(src, dst=dst, alpha=alpha, beta=beta)
+
+    def _gamma_correction_into(self, src: np.ndarray, dst: np.ndarray, scratch, table: np.ndarray):
+        cv2.LUT(src, table, dst=dst)
+
+    def _auto_brightness_into(self, src: np.ndarray, dst: np.ndarray, scratch, target_mean: float,
+                              histogram_step: int = 1, stats: ImageStats = None):
+        stats = stats if stats is not None else ImageStats(src)
+        diff = target_mean - stats.mean(histogram_step)
+        cv2.LUT(src, _offset_table(int(diff)), dst=dst)
+
+    # process_batch variants: the stack viewed as one tall image, one call
+
+    def _increase_brightness_batch(self, stack: np.ndarray, value: int) -> np.ndarray:
+        return cv2.LUT(self._stack_rows(stack), _offset_table(abs(value))).reshape(stack.shape)
+
+    def _decrease_brightness_batch(self, stack: np.ndarray, value: int) -> np.ndarray:
+        return cv2.LUT(self._stack_rows(stack), _offset_table(-abs(value))).reshape(stack.shape)
+
+    def _adjust_contrast_batch(self, stack: np.ndarray, alpha: float, beta: float) -> np.ndarray:
+        return cv2.convertScaleAbs(self._stack_rows(stack), alpha=alpha, beta=beta).reshape(stack.shape)
+
+    def _gamma_correction_batch(self, stack: np.ndarray, table: np.ndarray) -> np.ndarray:
+        return cv2.LUT(self._stack_rows(stack), table).reshape(stack.shape)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Capabilities.py - What a processor operation needs and how it can be scheduled"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Tuple
+import numpy as np
+
+
+class OpClass(Enum):
+    """How an output pixel depends on the input"""
+    POINT = "point"          # Only on the same input pixel (LUT, add, scale)
+    LOCAL = "local"          # On a neighbourhood of `radius` pixels (filters)
+    GLOBAL = "global"        # On a whole-image statistic or search (histogram, faces)
+    GEOMETRIC = "geometric"  # On a moved position; may change the size
+    REGION = "region"        # Only pixels inside detected regions change
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """
+    Scheduling metadata of one processor operation (Value Object).
+
+    Schedulers use it to decide tiling (POINT and bounded LOCAL ops can run
+    on tiles with a `radius` overlap), fusion (consecutive in-place POINT
+    ops), proxy rendering and thread counts. cost_ms_per_mp comes from the
+    calibrated CostModel and is None on an uncalibrated machine.
+    """
+    op_class: OpClass
+    radius: Optional[int] = 0            # Neighbourhood radius; None = unbounded
+    inplace: bool = False                # Output may overwrite the input buffer
+    channels: Tuple[int, ...] = (1, 3)   # Accepted channel counts
+    preserves_size: bool = True
+    cost_ms_per_mp: Optional[float] = None
+
+    @property
+    def tileable(self) -> bool:
+        """Can run independently on tiles overlapped by `radius` pixels"""
+        return self.op_class is OpClass.POINT or (self.op_class is OpClass.LOCAL and self.radius is not None)
+
+    @property
+    def fusable(self) -> bool:
+        """Can be chained with other fusable ops in one pass over the pixels"""
+        return self.op_class is OpClass.POINT and self.inplace
+
+    def accepts(self, image: np.ndarray) -> bool:
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        return channels in self.channels
+
+    def estimate_ms(self, image_shape: Tuple[int, ...]) -> Optional[float]:
+        """Expected run time for an image of this shape (None if uncalibrated)"""
+        if self.cost_ms_per_mp is None:
+            return None
+        return self.cost_ms_per_mp * image_shape[0] * image_shape[1] / 1e6
+
+
+# Conservative default for operations that declare nothing
+UNKNOWN = Capabilities(OpClass.GLOBAL, radius=None)
+
+
+def radius_of(kernel_size) -> int:
+    """Radius of an OpenCV kernel size given as int or (w, h)"""
+    if isinstance(kernel_size, (tuple, list)):
+        return max(int(k) for k in kernel_size) // 2
+    return int(kernel_size) // 2
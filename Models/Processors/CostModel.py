@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""CostModel.py - Measured cost per megapixel of each processor operation"""
+
+import json
+import os
+import platform
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+# Calibration written by `python -m Benchmarks.Calibrate`, at the project root
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            'cost_model.json')
+PATH_ENV = 'IMAGE_EDITOR_COST_MODEL'
+
+
+class CostModel:
+    """
+    Milliseconds per megapixel for each (processor class, operation type),
+    measured with the default config on this machine. Estimates scale
+    linearly with the pixel count, which holds for everything but face
+    operations (those scale with the face area).
+    """
+
+    _default: Optional['CostModel'] = None
+    _default_lock = Lock()
+
+    def __init__(self, costs: Optional[Dict[str, float]] = None, machine: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            costs: Key (see key()) -> ms per megapixel
+            machine: Description of the machine the costs were measured on
+        """
+        self.costs: Dict[str, float] = dict(costs or {})
+        self.machine = machine if machine is not None else self.describe_machine()
+
+    @staticmethod
+    def key(processor) -> str:
+        """e.g. 'BlurProcessor.GAUSSIAN'"""
+        operation = processor.strategy_key
+        return f"{type(processor).__name__}.{getattr(operation, 'name', operation)}"
+
+    @staticmethod
+    def describe_machine() -> Dict[str, Any]:
+        return {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'opencv_threads': cv2.getNumThreads(),
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+        }
+
+    def cost_ms_per_mp(self, processor) -> Optional[float]:
+        return self.costs.get(self.key(processor))
+
+    def estimate_ms(self, processor, image_shape) -> Optional[float]:
+        """Expected run time of processor on an image of this shape (None if not calibrated)"""
+        cost = self.cost_ms_per_mp(processor)
+        if cost is None:
+            return None
+        return cost * image_shape[0] * image_shape[1] / 1e6
+
+    def measure(self, processor, image: np.ndarray, repeat: int = 3) -> float:
+        """
+        Time processor.process on image, store and return the best ms per megapixel
+        """
+        processor.process(image)  # warm-up: lazy tables, cascades, thread pools
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            processor.process(image)
+            best = min(best, time.perf_counter() - start)
+        cost = best * 1000 / (image.shape[0] * image.shape[1] / 1e6)
+        self.costs[self.key(processor)] = cost
+        return cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'machine': self.machine, 'costs_ms_per_mp': dict(sorted(self.costs.items()))}
+
+    def save(self, path: str = DEFAULT_PATH):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> 'CostModel':
+        """
+        Raises:
+            OSError, ValueError: If the file is missing or not a cost model
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or 'costs_ms_per_mp' not in data:
+            raise ValueError(f"Not a cost model file: {path}")
+        return cls(data['costs_ms_per_mp'], data.get('machine', {}))
+
+    @classmethod
+    def default(cls) -> 'CostModel':
+        """Process-wide model, loaded on first use ($IMAGE_EDITOR_COST_MODEL or DEFAULT_PATH); empty if absent"""
+        with cls._default_lock:
+            if cls._default is None:
+                path = os.environ.get(PATH_ENV, DEFAULT_PATH)
+                try:
+                    cls._default = cls.load(path)
+                except (OSError, ValueError):
+                    cls._default = cls()
+            return cls._default
+
+    @classmethod
+    def set_default(cls, model: Optional['CostModel']):
+        """Replace the process-wide model (None reloads from disk on next use)"""
+        with cls._default_lock:
+            cls._default = model
@@ -7,6 +7,9 @@ import cv2
 import numpy as np
 from enum import Enum
 from .BaseProcessor import BaseProcessor, ProcessorConfig
+from .Capabilities import Capabilities, OpClass
+from .Engines import EdgeEngine
+from .ImageStats import ImageStats
 
 
 class EdgeDetectionType(Enum):
@@ -25,28 +28,40 @@ class EdgeDetectionProcessor(BaseProcessor):
     Preserves exact behavior from original Features/EdgeDetection.py
     """
 
+    STRATEGIES = {
+        EdgeDetectionType.ROBERTS: ('_roberts_edge', {}),
+        EdgeDetectionType.PREWITT: ('_prewitt_edge', {}),
+        EdgeDetectionType.SOBEL: ('_sobel_edge', {'ksize': 3, 'edge_engine': EdgeEngine.DEFAULT_ENGINE}),
+        EdgeDetectionType.CANNY: ('_canny_edge', {'sigma': 0.33, 'histogram_step': 1}),
+        EdgeDetectionType.LAPLACIAN: ('_laplacian_edge', {'ksize': 3, 'edge_engine': EdgeEngine.DEFAULT_ENGINE}),
+        EdgeDetectionType.SCHARR: ('_scharr_edge', {'edge_engine': EdgeEngine.DEFAULT_ENGINE}),
+    }
+
+    STATS_CONSUMERS = frozenset({EdgeDetectionType.CANNY})
+
+    # Every detector converts BGR to grayscale first
+    CAPABILITIES = {
+        EdgeDetectionType.ROBERTS: Capabilities(OpClass.LOCAL, radius=1, channels=(3,)),
+        EdgeDetectionType.PREWITT: Capabilities(OpClass.LOCAL, radius=1, channels=(3,)),
+        EdgeDetectionType.SOBEL: Capabilities(OpClass.LOCAL, channels=(3,)),
+        # Thresholds from the image median, hysteresis links edges across the frame
+        EdgeDetectionType.CANNY: Capabilities(OpClass.GLOBAL, radius=None, channels=(3,)),
+        EdgeDetectionType.LAPLACIAN: Capabilities(OpClass.LOCAL, channels=(3,)),
+        EdgeDetectionType.SCHARR: Capabilities(OpClass.LOCAL, radius=1, channels=(3,)),
+    }
+
     def __init__(self, detection_type: EdgeDetectionType, config: ProcessorConfig = None):
-        super().__init__(f"EdgeDetection-{detection_type.value}", config)
         self.detection_type = detection_type
+        super().__init__(f"EdgeDetection-{detection_type.value}", config)
 
-    def process(self, image: np.ndarray) -> np.ndarray:
-        """Apply edge detection to image"""
-        self.validate_image(image)
-
-        if self.detection_type == EdgeDetectionType.ROBERTS:
-            return self._roberts_edge(image)
-        elif self.detection_type == EdgeDetectionType.PREWITT:
-            return self._prewitt_edge(image)
-        elif self.detection_type == EdgeDetectionType.SOBEL:
-            return self._sobel_edge(image)
-        elif self.detection_type == EdgeDetectionType.CANNY:
-            return self._canny_edge(image)
-        elif self.detection_type == EdgeDetectionType.LAPLACIAN:
-            return self._laplacian_edge(image)
-        elif self.detection_type == EdgeDetectionType.SCHARR:
-            return self._scharr_edge(image)
-        else:
-            raise ValueError(f"Unknown detection type: {self.detection_type}")
+    @property
+    def strategy_key(self) -> EdgeDetectionType:
+        return self.detection_type
+
+    def _capability_radius(self, key, params):
+        if key in (EdgeDetectionType.SOBEL, EdgeDetectionType.LAPLACIAN):
+            return max(1, params['ksize'] // 2)
+        return None
 
     def _roberts_edge(self, image: np.ndarray) -> np.ndarray:
         """Roberts Cross edge detection"""
@@ -60,9 +75,8 @@ class EdgeDetectionProcessor(BaseProcessor):
         grad_x = cv2.filter2D(gray, cv2.CV_32F, roberts_cross_x)
         grad_y = cv2.filter2D(gray, cv2.CV_32F, roberts_cross_y)
 
-        # Combine gradients
-        edges = np.sqrt(grad_x**2 + grad_y**2)
-        edges = np.clip(edges, 0, 255).astype(np.uint8)
+        # Combine gradients (in place, same result as clipped np.sqrt)
+        edges = EdgeEngine.magnitude_to_uint8(grad_x, grad_y)
 
         return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
 
@@ -78,64 +92,45 @@ class EdgeDetectionProcessor(BaseProcessor):
         grad_x = cv2.filter2D(gray, cv2.CV_32F, prewitt_x)
         grad_y = cv2.filter2D(gray, cv2.CV_32F, prewitt_y)
 
-        # Combine gradients
-        edges = np.sqrt(grad_x**2 + grad_y**2)
-        edges = np.clip(edges, 0, 255).astype(np.uint8)
+        # Combine gradients (in place, same result as clipped np.sqrt)
+        edges = EdgeEngine.magnitude_to_uint8(grad_x, grad_y)
 
         return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
 
-    def _sobel_edge(self, image: np.ndarray) -> np.ndarray:
-        """Sobel edge detection"""
+    def _sobel_edge(self, image: np.ndarray, ksize: int,
+                    edge_engine: str = EdgeEngine.DEFAULT_ENGINE) -> np.ndarray:
+        """Sobel edge detection (gradient magnitude via EdgeEngine)"""
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        ksize = self.config.get('ksize', 3)
-
-        # Apply Sobel
-        grad_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=ksize)
-        grad_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=ksize)
-
-        # Combine gradients
-        edges = np.sqrt(grad_x**2 + grad_y**2)
-        edges = np.clip(edges, 0, 255).astype(np.uint8)
+        edges = EdgeEngine.gradient_magnitude(gray, "sobel", ksize, edge_engine)
 
         return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
 
-    def _canny_edge(self, image: np.ndarray) -> np.ndarray:
+    def _canny_edge(self, image: np.ndarray, sigma: float, histogram_step: int = 1,
+                    stats: ImageStats = None) -> np.ndarray:
         """Canny edge detection with automatic thresholds"""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        stats = stats if stats is not None else ImageStats(image)
+        gray = stats.gray
 
-        # Auto thresholds
-        sigma = self.config.get('sigma', 0.33)
-        median = np.median(gray)
-        lower = int(max(0, (1.0 - sigma) * median))
-        upper = int(min(255, (1.0 + sigma) * median))
+        # Auto thresholds around the median (from a histogram, subsampled if histogram_step > 1)
+        lower, upper = stats.canny_thresholds(sigma, histogram_step)
 
         # Apply Canny
         edges = cv2.Canny(gray, lower, upper)
 
         return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
 
-    def _laplacian_edge(self, image: np.ndarray) -> np.ndarray:
+    def _laplacian_edge(self, image: np.ndarray, ksize: int,
+                        edge_engine: str = EdgeEngine.DEFAULT_ENGINE) -> np.ndarray:
         """Laplacian edge detection"""
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        ksize = self.config.get('ksize', 3)
-
-        # Apply Laplacian
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F, ksize=ksize)
-        edges = np.absolute(laplacian)
-        edges = np.clip(edges, 0, 255).astype(np.uint8)
+        edges = EdgeEngine.laplacian_abs(gray, ksize, edge_engine)
 
         return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
 
-    def _scharr_edge(self, image: np.ndarray) -> np.ndarray:
+    def _scharr_edge(self, image: np.ndarray,
+                     edge_engine: str = EdgeEngine.DEFAULT_ENGINE) -> np.ndarray:
         """Scharr edge detection"""
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-        # Apply Scharr
-        grad_x = cv2.Scharr(gray, cv2.CV_64F, 1, 0)
-        grad_y = cv2.Scharr(gray, cv2.CV_64F, 0, 1)
-
-        # Combine gradients
-        edges = np.sqrt(grad_x**2 + grad_y**2)
-        edges = np.clip(edges, 0, 255).astype(np.uint8)
+        edges = EdgeEngine.gradient_magnitude(gray, "scharr", engine=edge_engine)
 
         return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+BlurEngine.py - Kernel-size aware Gaussian blur engines
+
+cv2.GaussianBlur is separable but still O(radius) per pixel, so large
+blurs (background blur, soft glow) dominate on big images. The faster
+engines approximate the same Gaussian in near-constant time per pixel:
+
+    direct       cv2.GaussianBlur (reference, exact)
+    box_stack    three successive box filters with matched variance;
+                 cv2.blur uses running sums, so cost does not grow with radius
+    downsampled  blur a reduced copy with a proportionally smaller sigma,
+                 then upsample; cost shrinks as the radius grows
+    auto         direct for small kernels, box_stack for medium, downsampled
+                 for very large ones
+
+The approximations model the whole Gaussian. An explicit kernel size
+smaller than full_ksize(sigma) cuts the kernel off, which only direct
+reproduces, so such blurs always run direct.
+"""
+
+import math
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple, Union
+
+DEFAULT_ENGINE = "auto"
+
+# auto thresholds on sigma (pixels); measured crossovers on 12 MP BGR frames
+BOX_STACK_MIN_SIGMA = 4.0
+DOWNSAMPLED_MIN_SIGMA = 6.0
+
+# Number of stacked box passes (3 gives < 3% deviation from a true Gaussian)
+BOX_PASSES = 3
+
+# Sigma kept for the reduced copy in the downsampled engine
+DOWNSAMPLED_TARGET_SIGMA = 3.0
+
+KernelSize = Union[int, Tuple[int, int]]
+
+
+def _kernel_pair(ksize: KernelSize) -> Tuple[int, int]:
+    if isinstance(ksize, int):
+        return ksize, ksize
+    return int(ksize[0]), int(ksize[1])
+
+
+def sigma_for_ksize(ksize: int) -> float:
+    """Sigma OpenCV derives for a kernel size when sigma <= 0"""
+    return 0.3 * ((ksize - 1) * 0.5 - 1) + 0.8
+
+
+def resolve_sigmas(ksize: KernelSize, sigma: float) -> Tuple[float, float]:
+    """Effective (sigma_x, sigma_y) following cv2.GaussianBlur's rules"""
+    kx, ky = _kernel_pair(ksize)
+    if sigma and sigma > 0:
+        return float(sigma), float(sigma)
+    if kx <= 0 or ky <= 0:
+        raise ValueError("Either kernel size or sigma must be positive")
+    return sigma_for_ksize(kx), sigma_for_ksize(ky)
+
+
+def full_ksize(sigma: float) -> int:
+    """Smallest odd kernel size holding the Gaussian out to 3 sigma"""
+    return 2 * math.ceil(3.0 * sigma) + 1
+
+
+def covers_kernel(ksize: KernelSize, sigma: float = 0) -> bool:
+    """Whether ksize leaves the Gaussian uncut ((0, 0) or at least full_ksize on each axis)"""
+    kx, ky = _kernel_pair(ksize)
+    sigma_x, sigma_y = resolve_sigmas(ksize, sigma)
+    return all(k <= 0 or k >= full_ksize(s) for k, s in ((kx, sigma_x), (ky, sigma_y)))
+
+
+def box_sizes(sigma: float, passes: int = BOX_PASSES) -> List[int]:
+    """
+    Odd box widths whose stacked variance matches sigma^2
+    (Kovesi, "Fast almost-Gaussian filtering", 2010)
+    """
+    ideal = math.sqrt(12.0 * sigma * sigma / passes + 1.0)
+    lower = int(ideal)
+    if lower % 2 == 0:
+        lower -= 1
+    lower = max(lower, 1)
+    upper = lower + 2
+    num_lower = round((12.0 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes)
+                      / (-4.0 * lower - 4.0))
+    return [lower if i < num_lower else upper for i in range(passes)]
+
+
+def direct(image: np.ndarray, ksize: KernelSize, sigma: float = 0,
+           dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Reference engine: cv2.GaussianBlur (into dst when given)"""
+    return cv2.GaussianBlur(image, _kernel_pair(ksize), sigma, dst=dst)
+
+
+def box_stack(image: np.ndarray, ksize: KernelSize, sigma: float = 0) -> np.ndarray:
+    """Gaussian approximated by BOX_PASSES box filters (direct if ksize truncates the kernel)"""
+    if not covers_kernel(ksize, sigma):
+        return direct(image, ksize, sigma)
+    sigma_x, sigma_y = resolve_sigmas(ksize, sigma)
+    result = image
+    for bx, by in zip(box_sizes(sigma_x), box_sizes(sigma_y)):
+        result = cv2.blur(result, (bx, by))
+    return result
+
+
+def downsampled(image: np.ndarray, ksize: KernelSize, sigma: float = 0) -> np.ndarray:
+    """Blur a reduced copy with the scaled sigma, then upsample back (direct if ksize truncates the kernel)"""
+    if not covers_kernel(ksize, sigma):
+        return direct(image, ksize, sigma)
+    sigma_x, sigma_y = resolve_sigmas(ksize, sigma)
+    factor = max(1, int(min(sigma_x, sigma_y) / DOWNSAMPLED_TARGET_SIGMA))
+    h, w = image.shape[:2]
+    if factor == 1 or h < 4 * factor or w < 4 * factor:
+        return box_stack(image, ksize, sigma)
+
+    small = cv2.resize(image, (w // factor, h // factor), interpolation=cv2.INTER_AREA)
+    # INTER_AREA already averages over factor pixels; remove that variance from the blur
+    residual = 1.0 / 12.0
+    small_sigma_x = math.sqrt(max((sigma_x / factor) ** 2 - residual, 0.25))
+    small_sigma_y = math.sqrt(max((sigma_y / factor) ** 2 - residual, 0.25))
+    small = cv2.GaussianBlur(small, (0, 0), small_sigma_x, sigmaY=small_sigma_y)
+    return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+
+
+def select_engine(ksize: KernelSize, sigma: float = 0) -> str:
+    """Name of the fastest engine for this blur radius that reproduces the kernel"""
+    if not covers_kernel(ksize, sigma):
+        return "direct"
+    effective = min(resolve_sigmas(ksize, sigma))
+    if effective >= DOWNSAMPLED_MIN_SIGMA:
+        return "downsampled"
+    if effective >= BOX_STACK_MIN_SIGMA:
+        return "box_stack"
+    return "direct"
+
+
+ENGINES = {
+    "direct": direct,
+    "box_stack": box_stack,
+    "downsampled": downsampled,
+}
+
+
+def gaussian_blur(image: np.ndarray, ksize: KernelSize, sigma: float = 0,
+                  engine: str = DEFAULT_ENGINE) -> np.ndarray:
+    """
+    Gaussian blur with the selected engine
+
+    Args:
+        image: Input image (any channel count)
+        ksize: Kernel size as int or (width, height); (0, 0) derives it from sigma
+        sigma: Standard deviation; <= 0 derives it from ksize like OpenCV
+        engine: Key in ENGINES, or "auto" to choose by radius
+
+    Raises:
+        ValueError: If the engine name is unknown
+    """
+    if engine == "auto":
+        engine = select_engine(ksize, sigma)
+    try:
+        blur = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown blur engine: {engine}") from None
+    return blur(image, ksize, sigma)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+EdgeEngine.py - Gradient magnitude and Laplacian engines for edge detection
+
+The original edge code works in float64 and combines gradients with
+np.sqrt(gx**2 + gy**2), allocating four or five full-frame float64
+temporaries. The engines trade that for narrower types:
+
+    reference   float64 gradients, numpy magnitude (original behaviour)
+    float32     float32 gradients squared, summed and rooted in place;
+                bit-exact with reference at ~1/4 of the memory
+    magnitude   float32 gradients, cv2.magnitude and convertScaleAbs in one
+                pass each; rounds instead of truncating (+-1 level)
+    l1          int16 gradients, |gx| + |gy| with saturating uint8 math;
+                approximate (L1 >= L2) and the fastest
+
+Laplacian magnitudes are integers, so every engine but reference computes
+them in int16 and converts with convertScaleAbs, which is exact.
+"""
+
+import cv2
+import numpy as np
+
+DEFAULT_ENGINE = "float32"
+
+# Largest Sobel/Laplacian aperture whose responses on uint8 fit in int16
+INT16_MAX_KSIZE = 5
+
+
+def _int16_depth(ksize: int) -> int:
+    return cv2.CV_16S if ksize <= INT16_MAX_KSIZE else cv2.CV_32F
+
+
+def _gradients(gray: np.ndarray, operator: str, ksize: int, ddepth: int):
+    if operator == "scharr":
+        return cv2.Scharr(gray, ddepth, 1, 0), cv2.Scharr(gray, ddepth, 0, 1)
+    if operator == "sobel":
+        return (cv2.Sobel(gray, ddepth, 1, 0, ksize=ksize),
+                cv2.Sobel(gray, ddepth, 0, 1, ksize=ksize))
+    raise ValueError(f"Unknown gradient operator: {operator}")
+
+
+def magnitude_to_uint8(grad_x: np.ndarray, grad_y: np.ndarray) -> np.ndarray:
+    """
+    sqrt(gx^2 + gy^2) saturated to [0, 255] and truncated like
+    np.clip(...).astype(np.uint8). Overwrites both float32 inputs.
+    """
+    np.multiply(grad_x, grad_x, out=grad_x)
+    np.multiply(grad_y, grad_y, out=grad_y)
+    np.add(grad_x, grad_y, out=grad_x)
+    np.sqrt(grad_x, out=grad_x)
+    np.minimum(grad_x, 255, out=grad_x)
+    return grad_x.astype(np.uint8)
+
+
+def _reference_gradient(gray, operator, ksize):
+    grad_x, grad_y = _gradients(gray, operator, ksize, cv2.CV_64F)
+    edges = np.sqrt(grad_x**2 + grad_y**2)
+    return np.clip(edges, 0, 255).astype(np.uint8)
+
+
+def _float32_gradient(gray, operator, ksize):
+    return magnitude_to_uint8(*_gradients(gray, operator, ksize, cv2.CV_32F))
+
+
+def _magnitude_gradient(gray, operator, ksize):
+    grad_x, grad_y = _gradients(gray, operator, ksize, cv2.CV_32F)
+    cv2.magnitude(grad_x, grad_y, grad_x)
+    return cv2.convertScaleAbs(grad_x)
+
+
+def _l1_gradient(gray, operator, ksize):
+    depth = cv2.CV_16S if operator == "scharr" else _int16_depth(ksize)
+    grad_x, grad_y = _gradients(gray, operator, ksize, depth)
+    return cv2.add(cv2.convertScaleAbs(grad_x), cv2.convertScaleAbs(grad_y))
+
+
+ENGINES = {
+    "reference": _reference_gradient,
+    "float32": _float32_gradient,
+    "magnitude": _magnitude_gradient,
+    "l1": _l1_gradient,
+}
+
+
+def gradient_magnitude(gray: np.ndarray, operator: str = "sobel", ksize: int = 3,
+                       engine: str = DEFAULT_ENGINE) -> np.ndarray:
+    """
+    uint8 gradient magnitude of a grayscale image
+
+    Args:
+        gray: Single-channel uint8 image
+        operator: "sobel" or "scharr"
+        ksize: Sobel aperture (ignored for Scharr)
+        engine: Key in ENGINES
+
+    Raises:
+        ValueError: If the operator or engine is unknown
+    """
+    try:
+        compute = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown edge engine: {engine}") from None
+    return compute(gray, operator, ksize)
+
+
+def laplacian_abs(gray: np.ndarray, ksize: int = 3, engine: str = DEFAULT_ENGINE) -> np.ndarray:
+    """
+    uint8 absolute Laplacian of a grayscale image
+
+    Raises:
+        ValueError: If the engine is unknown
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown edge engine: {engine}")
+    if engine == "reference":
+        laplacian = cv2.Laplacian(gray, cv2.CV_64F, ksize=ksize)
+        return np.clip(np.absolute(laplacian), 0, 255).astype(np.uint8)
+    return cv2.convertScaleAbs(cv2.Laplacian(gray, _int16_depth(ksize), ksize=ksize))
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Geometry.py - Crop, resize, zoom, rotate and perspective in one resample
+
+Features/Transform.py runs each geometric operation as its own full-frame
+pass, so a chain such as crop -> zoom -> rotate -> perspective interpolates
+(and blurs) the pixels four times and allocates every intermediate.
+GeometryPipeline only records each operation as a 3x3 matrix (output pixel
+<- input pixel, OpenCV pixel-centre convention) plus the output size, and
+apply() resamples once:
+
+    pure crop           integer translation inside the image: a slice of the
+                        input, zero-copy
+    90 deg / flips      integer translation + axis permutation: slice, then
+                        one cv2.rotate / cv2.flip / cv2.transpose; lossless
+    affine              one cv2.warpAffine
+    projective          one cv2.warpPerspective
+
+Each step mirrors its Features/Transform counterpart (same centre, size and
+rounding), so apply() matches the chained functions up to the rounding of a
+single interpolation instead of several. Every step also clips to its output
+rectangle, as the chained functions do, so the pipeline tracks the region
+still holding image content as a polygon; output pixels outside it get the
+border value even where a later rotation brings cropped-away input back.
+"""
+
+import cv2
+import numpy as np
+from typing import Optional, Sequence, Tuple
+from ...Orientation import Orientation
+
+_EPS = 1e-9
+
+
+def _translation(tx: float, ty: float) -> np.ndarray:
+    return np.array([[1.0, 0.0, tx], [0.0, 1.0, ty], [0.0, 0.0, 1.0]])
+
+
+def _scaling(sx: float, sy: float) -> np.ndarray:
+    """Scale like cv2.resize: pixel centres map as x' = sx * (x + 0.5) - 0.5"""
+    return np.array([[sx, 0.0, 0.5 * sx - 0.5], [0.0, sy, 0.5 * sy - 0.5], [0.0, 0.0, 1.0]])
+
+
+def _transform_points(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    homogeneous = np.hstack([points, np.ones((len(points), 1))]) @ matrix.T
+    return homogeneous[:, :2] / homogeneous[:, 2:3]
+
+
+def _rect_polygon(width: int, height: int) -> np.ndarray:
+    """Outline of a width x height image (pixel edges, centres at integers)"""
+    return np.array([[-0.5, -0.5], [width - 0.5, -0.5],
+                     [width - 0.5, height - 0.5], [-0.5, height - 0.5]])
+
+
+def _clip_polygon(polygon: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Sutherland-Hodgman clip of a convex polygon to the image outline"""
+    for axis, limit, keep_below in ((0, -0.5, False), (0, width - 0.5, True),
+                                    (1, -0.5, False), (1, height - 0.5, True)):
+        if len(polygon) == 0:
+            break
+        clipped = []
+        for i, current in enumerate(polygon):
+            previous = polygon[i - 1]
+            inside_now = current[axis] <= limit if keep_below else current[axis] >= limit
+            inside_before = previous[axis] <= limit if keep_below else previous[axis] >= limit
+            if inside_now != inside_before:
+                t = (limit - previous[axis]) / (current[axis] - previous[axis])
+                clipped.append(previous + t * (current - previous))
+            if inside_now:
+                clipped.append(current)
+        polygon = np.array(clipped).reshape(-1, 2)
+    return polygon
+
+
+def _polygon_area(polygon: np.ndarray) -> float:
+    if len(polygon) < 3:
+        return 0.0
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def orientation_matrix(orientation: Orientation, width: int, height: int) -> np.ndarray:
+    """Matrix of Orientation.apply on a width x height image"""
+    matrix = np.eye(3)
+    if orientation.mirrored:
+        matrix = np.array([[-1.0, 0.0, width - 1], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    for turn in range(orientation.rotation):
+        # Clockwise quarter turn of the current image: x' = h - 1 - y, y' = x
+        height_now = height if turn % 2 == 0 else width
+        quarter = np.array([[0.0, -1.0, height_now - 1], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        matrix = quarter @ matrix
+    return matrix
+
+
+# Linear part of each D4 element (independent of the image size)
+_D4_LINEAR = {
+    (r, m): orientation_matrix(Orientation(r, m), 2, 2)[:2, :2].round().astype(int).tobytes()
+    for r in range(4) for m in (False, True)
+}
+
+
+class GeometryPipeline:
+    """
+    Accumulates geometric operations into one homography (Builder).
+
+    Usage:
+        pipeline = GeometryPipeline.for_image(img).crop(10, 10, 800, 600).rotate(15)
+        result = pipeline.apply(img)
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        Args:
+            width: Input image width
+            height: Input image height
+        """
+        self.source_size = (int(width), int(height))
+        self.size = self.source_size  # Output (width, height) so far
+        self.matrix = np.eye(3)       # Input pixel -> output pixel
+        self.valid = _rect_polygon(*self.size)  # Output area that still shows the input
+
+    @classmethod
+    def for_image(cls, image: np.ndarray) -> 'GeometryPipeline':
+        return cls(image.shape[1], image.shape[0])
+
+    def then(self, matrix: np.ndarray, size: Optional[Tuple[int, int]] = None) -> 'GeometryPipeline':
+        """Append a transform of the current output (3x3 matrix, new output size)"""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        self.matrix = matrix @ self.matrix
+        if size is not None:
+            self.size = (int(size[0]), int(size[1]))
+        if len(self.valid):
+            self.valid = _clip_polygon(_transform_points(matrix, self.valid), *self.size)
+        return self
+
+    # === Operations (same semantics as Features/Transform) ===
+
+    def crop(self, x: int, y: int, width: int, height: int) -> 'GeometryPipeline':
+        """Like crop_rectangle: the rectangle is clamped to the current output"""
+        w, h = self.size
+        x = max(0, min(x, w))
+        y = max(0, min(y, h))
+        width = min(width, w - x)
+        height = min(height, h - y)
+        return self.then(_translation(-x, -y), (width, height))
+
+    def crop_center(self, width: int, height: int) -> 'GeometryPipeline':
+        w, h = self.size
+        x = max(0, (w - width) // 2)
+        y = max(0, (h - height) // 2)
+        return self.crop(x, y, min(width, w - x), min(height, h - y))
+
+    def resize(self, width: int, height: int) -> 'GeometryPipeline':
+        w, h = self.size
+        return self.then(_scaling(width / w, height / h), (width, height))
+
+    def resize_by_percentage(self, percentage: float) -> 'GeometryPipeline':
+        scale = percentage / 100.0
+        w, h = self.size
+        return self.resize(int(w * scale), int(h * scale))
+
+    def zoom_in(self, zoom_factor: float = 1.5) -> 'GeometryPipeline':
+        """Enlarge about the centre, keeping the output size"""
+        w, h = self.size
+        new_w, new_h = int(w * zoom_factor), int(h * zoom_factor)
+        return self.resize(new_w, new_h).crop((new_w - w) // 2, (new_h - h) // 2, w, h)
+
+    def zoom_out(self, zoom_factor: float = 0.7) -> 'GeometryPipeline':
+        """Shrink about the centre onto a black canvas of the same size"""
+        w, h = self.size
+        new_w, new_h = int(w * zoom_factor), int(h * zoom_factor)
+        self.resize(new_w, new_h)
+        return self.then(_translation((w - new_w) // 2, (h - new_h) // 2), (w, h))
+
+    def rotate(self, angle: float, scale: float = 1.0) -> 'GeometryPipeline':
+        """Like rotate_custom: about (w // 2, h // 2), output size unchanged"""
+        w, h = self.size
+        affine = cv2.getRotationMatrix2D((w // 2, h // 2), angle, scale)
+        return self.then(np.vstack([affine, [0.0, 0.0, 1.0]]))
+
+    def orient(self, orientation: Orientation) -> 'GeometryPipeline':
+        """Lossless 90 degree rotation and/or flip"""
+        w, h = self.size
+        return self.then(orientation_matrix(orientation, w, h), orientation.apply_size(w, h))
+
+    def rotate_90(self, quarter_turns: int = 1) -> 'GeometryPipeline':
+        """Clockwise quarter turns"""
+        return self.orient(Orientation.rotate_cw(quarter_turns))
+
+    def flip_horizontal(self) -> 'GeometryPipeline':
+        return self.orient(Orientation.flip_horizontal())
+
+    def flip_vertical(self) -> 'GeometryPipeline':
+        return self.orient(Orientation.flip_vertical())
+
+    def perspective(self, src_points: Sequence, dst_points: Sequence) -> 'GeometryPipeline':
+        """Like perspective_transform: 4 point pairs, output size unchanged"""
+        matrix = cv2.getPerspectiveTransform(np.float32(src_points), np.float32(dst_points))
+        return self.then(matrix)
+
+    # === Resampling ===
+
+    @property
+    def is_affine(self) -> bool:
+        return np.allclose(self.matrix[2], [0.0, 0.0, 1.0], atol=_EPS)
+
+    def _lossless_plan(self) -> Optional[Tuple[Tuple[int, int, int, int], Orientation]]:
+        """
+        (source rectangle x0, y0, x1, y1, orientation) if the output is an exact
+        rotated/flipped sub-rectangle of the input, else None
+        """
+        if not self.is_affine:
+            return None
+        matrix = self.matrix / self.matrix[2, 2]
+        rounded = np.round(matrix[:2])
+        if not np.allclose(matrix[:2], rounded, atol=_EPS):
+            return None
+        linear = rounded[:, :2].astype(int).tobytes()
+        key = next((k for k, v in _D4_LINEAR.items() if v == linear), None)
+        if key is None:
+            return None
+
+        # Source pixels of the output corners
+        inverse = np.linalg.inv(np.vstack([rounded, [0.0, 0.0, 1.0]]))
+        w, h = self.size
+        corners = np.array([[0, 0, 1], [w - 1, h - 1, 1]], dtype=np.float64).T
+        xs, ys = np.round(inverse[:2] @ corners).astype(int)
+        x0, x1, y0, y1 = xs.min(), xs.max(), ys.min(), ys.max()
+        src_w, src_h = self.source_size
+        if x0 < 0 or y0 < 0 or x1 >= src_w or y1 >= src_h:
+            return None
+        return (x0, y0, x1 + 1, y1 + 1), Orientation(*key)
+
+    def apply(self, image: np.ndarray, interpolation: int = cv2.INTER_LINEAR,
+              border_value=0, cache=None) -> np.ndarray:
+        """
+        Resample image once through the accumulated transform
+
+        Args:
+            image: Input image of the size given at construction
+            interpolation: OpenCV interpolation flag for the general path
+            border_value: Fill for output pixels that map outside the input
+            cache: Optional RemapCache; repeated same-size frames then skip
+                the per-pixel matrix evaluation of the general path
+
+        Returns:
+            Output image of size self.size. A pure crop returns a view that
+            shares memory with image.
+
+        Raises:
+            ValueError: If image does not match the pipeline's input size
+        """
+        if (image.shape[1], image.shape[0]) != self.source_size:
+            raise ValueError(f"Pipeline built for {self.source_size}, got image of "
+                             f"{(image.shape[1], image.shape[0])}")
+        w, h = self.size
+        if w <= 0 or h <= 0:
+            return image[:0, :0]
+
+        plan = self._lossless_plan()
+        if plan is not None:
+            (x0, y0, x1, y1), orientation = plan
+            region = image[y0:y1, x0:x1]
+            return region if orientation.is_identity else orientation.apply(region)
+
+        # Content covering the whole output replicates its edges like cv2.resize;
+        # otherwise everything outside the content polygon gets the border value
+        covered = _polygon_area(self.valid) >= w * h - 1e-6
+        border = cv2.BORDER_REPLICATE if covered else cv2.BORDER_CONSTANT
+        if cache is not None:
+            result = cache.warp(image, self.matrix, (w, h), interpolation, border, border_value)
+        elif self.is_affine:
+            matrix = (self.matrix / self.matrix[2, 2])[:2]
+            result = cv2.warpAffine(image, matrix, (w, h), flags=interpolation,
+                                    borderMode=border, borderValue=border_value)
+        else:
+            result = cv2.warpPerspective(image, self.matrix, (w, h), flags=interpolation,
+                                         borderMode=border, borderValue=border_value)
+
+        if not covered:
+            shift = 4  # sub-pixel vertex precision for fillPoly
+            mask = np.zeros((h, w), dtype=np.uint8)
+            if len(self.valid) >= 3:
+                points = np.round(self.valid * (1 << shift)).astype(np.int32)
+                cv2.fillPoly(mask, [points], 255, lineType=cv2.LINE_8, shift=shift)
+            canvas = np.full_like(result, border_value)
+            cv2.copyTo(result, mask, canvas)
+            result = canvas
+        return result
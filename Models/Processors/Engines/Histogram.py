@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Histogram.py - Image statistics from a 256-bin histogram
+
+np.median partitions a full copy of the frame and np.mean makes a float64
+pass over it. For uint8 images both follow exactly from a histogram, which
+cv2.calcHist builds in one cheap pass (optionally on a subsampled grid).
+One histogram can then serve every statistic an operation needs.
+"""
+
+import math
+import cv2
+import numpy as np
+from typing import Tuple
+
+
+def histogram(image: np.ndarray, step: int = 1) -> np.ndarray:
+    """
+    256-bin counts over all pixels and channels of a uint8 image
+
+    Args:
+        image: uint8 image (grayscale or multi-channel)
+        step: Sample every step-th row and column (1 = exact)
+
+    Returns:
+        int64 array of shape (256,)
+    """
+    if image.dtype != np.uint8:
+        raise ValueError(f"Histogram statistics need uint8 images, got {image.dtype}")
+    # Channels share one histogram, so view interleaved pixels as one wide plane
+    rows = image[::step] if step > 1 else image
+    plane = rows.reshape(rows.shape[0], -1)
+    if step > 1:
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        # A column stride coprime with the channel count samples every channel
+        column_step = step
+        while channels > 1 and math.gcd(column_step, channels) != 1:
+            column_step += 1
+        plane = np.ascontiguousarray(plane[:, ::column_step])
+    hist = cv2.calcHist([plane], [0], None, [256], [0, 256])
+    return hist.ravel().astype(np.int64)
+
+
+def _value_at_rank(cumulative: np.ndarray, rank: int) -> int:
+    """Smallest value whose cumulative count exceeds rank (0-based)"""
+    return int(np.searchsorted(cumulative, rank, side='right'))
+
+
+def median(hist: np.ndarray) -> float:
+    """Median equal to np.median on the histogrammed pixels (averages the middle pair)"""
+    cumulative = np.cumsum(hist)
+    total = int(cumulative[-1])
+    if total == 0:
+        raise ValueError("Empty histogram")
+    low = _value_at_rank(cumulative, (total - 1) // 2)
+    high = _value_at_rank(cumulative, total // 2)
+    return (low + high) / 2.0
+
+
+def mean(hist: np.ndarray) -> float:
+    """Mean pixel value (exact; integer sums stay below 2**53)"""
+    total = int(hist.sum())
+    if total == 0:
+        raise ValueError("Empty histogram")
+    return float(np.dot(np.arange(256, dtype=np.int64), hist)) / total
+
+
+def canny_thresholds(hist: np.ndarray, sigma: float = 0.33) -> Tuple[int, int]:
+    """Auto-Canny (lower, upper) thresholds around the median"""
+    med = median(hist)
+    lower = int(max(0, (1.0 - sigma) * med))
+    upper = int(min(255, (1.0 + sigma) * med))
+    return lower, upper
+
+
+def laplacian_variance(gray: np.ndarray) -> float:
+    """
+    Variance of the 3x3 Laplacian (focus measure), like
+    cv2.Laplacian(gray, cv2.CV_64F).var() without the float64 frame.
+    """
+    laplacian = cv2.Laplacian(gray, cv2.CV_16S)
+    _, std = cv2.meanStdDev(laplacian)
+    return float(std[0, 0]) ** 2
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+SkinSmoothing.py - Edge-preserving smoothing engines for face regions
+
+Every engine takes the bilateral parameterisation (d, sigma_color, sigma_space)
+so callers that derive those from smooth_level can switch engines freely.
+"""
+
+import cv2
+import numpy as np
+
+DEFAULT_ENGINE = "bilateral"
+
+
+def bilateral(roi: np.ndarray, d: int, sigma_color: float, sigma_space: float) -> np.ndarray:
+    """Reference engine: full resolution bilateral filter, O(d^2) per pixel"""
+    return cv2.bilateralFilter(roi, d, sigma_color, sigma_space)
+
+
+def guided(roi: np.ndarray, d: int, sigma_color: float, sigma_space: float) -> np.ndarray:
+    """
+    Self-guided filter (He et al.) built from box filters, O(1) per pixel.
+    Radius follows d, regularisation follows sigma_color.
+    """
+    radius = max(1, d // 2)
+    eps = (sigma_color / 255.0) ** 2 * 0.25
+    ksize = (2 * radius + 1, 2 * radius + 1)
+
+    src = roi.astype(np.float32) * (1.0 / 255.0)
+    mean = cv2.boxFilter(src, -1, ksize)
+    mean_sq = cv2.boxFilter(src * src, -1, ksize)
+    var = mean_sq - mean * mean
+
+    a = var / (var + eps)
+    b = mean - a * mean
+    a = cv2.boxFilter(a, -1, ksize)
+    b = cv2.boxFilter(b, -1, ksize)
+
+    result = a * src + b
+    return cv2.convertScaleAbs(result, alpha=255.0)
+
+
+def domain_transform(roi: np.ndarray, d: int, sigma_color: float, sigma_space: float) -> np.ndarray:
+    """Recursive domain transform filter (cv2.edgePreservingFilter), O(1) per pixel"""
+    sigma_s = float(min(200.0, d * 1.5))
+    sigma_r = float(min(1.0, sigma_color / 400.0))
+    return cv2.edgePreservingFilter(roi, flags=cv2.RECURS_FILTER, sigma_s=sigma_s, sigma_r=sigma_r)
+
+
+def half_resolution(roi: np.ndarray, d: int, sigma_color: float, sigma_space: float) -> np.ndarray:
+    """Bilateral filter on a half resolution copy, upsampled back (~8x fewer operations)"""
+    h, w = roi.shape[:2]
+    if h < 8 or w < 8:
+        return bilateral(roi, d, sigma_color, sigma_space)
+
+    small = cv2.resize(roi, (w // 2, h // 2), interpolation=cv2.INTER_AREA)
+    smoothed = cv2.bilateralFilter(small, max(3, d // 2), sigma_color, sigma_space / 2.0)
+    return cv2.resize(smoothed, (w, h), interpolation=cv2.INTER_LINEAR)
+
+
+ENGINES = {
+    "bilateral": bilateral,
+    "guided": guided,
+    "domain_transform": domain_transform,
+    "half_resolution": half_resolution,
+}
+
+
+def smooth(roi: np.ndarray, d: int, sigma_color: float, sigma_space: float,
+           engine: str = DEFAULT_ENGINE) -> np.ndarray:
+    """
+    Smooth a face region with the selected engine
+
+    Args:
+        roi: Face region (BGR, uint8)
+        d: Bilateral neighbourhood diameter
+        sigma_color: Bilateral range sigma
+        sigma_space: Bilateral spatial sigma
+        engine: One of ENGINES
+
+    Returns:
+        Smoothed region, same shape and dtype as roi
+    """
+    try:
+        return ENGINES[engine](roi, d, sigma_color, sigma_space)
+    except KeyError:
+        raise ValueError(f"Unknown smoothing engine: {engine}") from None
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""Engines Package - Interchangeable low-level kernels used by processors"""
+
+from . import SkinSmoothing
+from . import BlemishRemoval
+from . import BlurEngine
+from . import MedianEngine
+from . import EdgeEngine
+from . import Histogram
+from . import Geometry
+from .RemapCache import RemapCache
+
+__all__ = ['SkinSmoothing', 'BlemishRemoval', 'BlurEngine', 'MedianEngine', 'EdgeEngine', 'Histogram', 'Geometry', 'RemapCache']
@@ -4,8 +4,12 @@
 import cv2
 import numpy as np
 from enum import Enum
-from typing import Tuple, List
-from .BaseProcessor import BaseProcessor, ProcessorConfig
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+from .BaseProcessor import BaseProcessor, ProcessorConfig, RegionPatch
+from .Capabilities import Capabilities, OpClass
+from .Engines import SkinSmoothing, BlemishRemoval, BlurEngine
 
 
 class FaceBeautifyType(Enum):
@@ -19,17 +23,85 @@ class FaceBeautifyType(Enum):
     SOFT_FILTER = "soft_filter"
 
 
+@dataclass(frozen=True)
+class AutoBeautifyParams:
+    """Immutable per-call parameters for the fused AUTO_BEAUTIFY pipeline"""
+    smooth_level: float = 0.5
+    brightness_value: int = 15
+    contrast: float = 1.15
+    smooth_engine: str = SkinSmoothing.DEFAULT_ENGINE
+    blemish_engine: str = BlemishRemoval.DEFAULT_ENGINE
+
+
+@lru_cache(maxsize=64)
+def _tone_lut(brightness_value: float, contrast: float) -> np.ndarray:
+    """
+    Single LUT equal to brighten (alpha=1, beta=brightness) followed by
+    contrast (alpha=contrast, beta=0), including both saturations.
+    Built with the same convertScaleAbs calls so it is bit-exact.
+    """
+    ramp = np.arange(256, dtype=np.uint8).reshape(1, 256)
+    brightened = cv2.convertScaleAbs(ramp, alpha=1.0, beta=brightness_value)
+    lut = cv2.convertScaleAbs(brightened, alpha=contrast, beta=0)
+    lut.setflags(write=False)
+    return lut
+
+
 class FaceBeautifyProcessor(BaseProcessor):
     """Face beautification processor implementing Strategy Pattern"""
 
+    # Region types map to per-face kernels (roi -> new roi); the others
+    # take the whole frame plus the detected faces
+    STRATEGIES = {
+        FaceBeautifyType.SMOOTH_SKIN: ('_smooth_roi', {'smooth_level': 0.3,
+                                                       'smooth_engine': SkinSmoothing.DEFAULT_ENGINE}),
+        FaceBeautifyType.BRIGHTEN_FACE: ('_brighten_roi', {'brightness_value': 30}),
+        FaceBeautifyType.ENHANCE_CONTRAST: ('_contrast_roi', {'contrast': 1.3}),
+        FaceBeautifyType.REMOVE_BLEMISHES: ('_denoise_roi', {'blemish_engine': BlemishRemoval.DEFAULT_ENGINE}),
+        FaceBeautifyType.AUTO_BEAUTIFY: ('_auto_beautify_roi', {'smooth_engine': SkinSmoothing.DEFAULT_ENGINE,
+                                                                'blemish_engine': BlemishRemoval.DEFAULT_ENGINE}),
+        FaceBeautifyType.BLUR_BACKGROUND: ('_apply_blur_background', {'blur_amount': 21,
+                                                                      'blur_engine': BlurEngine.DEFAULT_ENGINE}),
+        FaceBeautifyType.SOFT_FILTER: ('_add_soft_filter', {'intensity': 0.3,
+                                                            'blur_engine': BlurEngine.DEFAULT_ENGINE}),
+    }
+
+    # Operations that only modify pixels inside the detected face rectangles
+    REGION_TYPES = (
+        FaceBeautifyType.SMOOTH_SKIN,
+        FaceBeautifyType.BRIGHTEN_FACE,
+        FaceBeautifyType.ENHANCE_CONTRAST,
+        FaceBeautifyType.REMOVE_BLEMISHES,
+        FaceBeautifyType.AUTO_BEAUTIFY,
+    )
+
+    # Face detection needs colour input; ROI operations only change face rectangles
+    CAPABILITIES = {
+        FaceBeautifyType.SMOOTH_SKIN: Capabilities(OpClass.REGION, radius=None, channels=(3,)),
+        FaceBeautifyType.BRIGHTEN_FACE: Capabilities(OpClass.REGION, radius=None, channels=(3,)),
+        FaceBeautifyType.ENHANCE_CONTRAST: Capabilities(OpClass.REGION, radius=None, channels=(3,)),
+        FaceBeautifyType.REMOVE_BLEMISHES: Capabilities(OpClass.REGION, radius=None, channels=(3,)),
+        FaceBeautifyType.AUTO_BEAUTIFY: Capabilities(OpClass.REGION, radius=None, channels=(3,)),
+        FaceBeautifyType.BLUR_BACKGROUND: Capabilities(OpClass.GLOBAL, radius=None, channels=(3,)),
+        FaceBeautifyType.SOFT_FILTER: Capabilities(OpClass.GLOBAL, radius=None, channels=(3,)),
+    }
+
     def __init__(self, beautify_type: FaceBeautifyType, config: ProcessorConfig = None):
-        super().__init__(f"FaceBeautify_{beautify_type.value}", config)
         self.beautify_type = beautify_type
+        super().__init__(f"FaceBeautify_{beautify_type.value}", config)
 
-    def process(self, image: np.ndarray) -> np.ndarray:
-        """Apply face beautification based on type"""
-        self.validate_image(image)
+    @property
+    def strategy_key(self) -> FaceBeautifyType:
+        return self.beautify_type
+
+    def _resolve_params(self, key, params):
+        """Snapshot the AUTO engine choices into immutable parameters once"""
+        if key == FaceBeautifyType.AUTO_BEAUTIFY:
+            return {'params': AutoBeautifyParams(**params)}
+        return params
 
+    def _process(self, image: np.ndarray, config: ProcessorConfig, stats=None) -> np.ndarray:
+        """Apply face beautification based on type"""
         # Detect faces if needed (all operations except soft_filter need faces)
         if self.beautify_type != FaceBeautifyType.SOFT_FILTER:
             faces = self._detect_faces(image)
@@ -39,22 +111,103 @@ class FaceBeautifyProcessor(BaseProcessor):
         else:
             faces = []
 
-        if self.beautify_type == FaceBeautifyType.SMOOTH_SKIN:
-            return self._smooth_skin(image, faces)
-        elif self.beautify_type == FaceBeautifyType.BRIGHTEN_FACE:
-            return self._brighten_face(image, faces)
-        elif self.beautify_type == FaceBeautifyType.ENHANCE_CONTRAST:
-            return self._enhance_face_contrast(image, faces)
-        elif self.beautify_type == FaceBeautifyType.REMOVE_BLEMISHES:
-            return self._remove_blemishes(image, faces)
-        elif self.beautify_type == FaceBeautifyType.AUTO_BEAUTIFY:
-            return self._beautify_face_auto(image, faces)
-        elif self.beautify_type == FaceBeautifyType.BLUR_BACKGROUND:
-            return self._apply_blur_background(image, faces)
-        elif self.beautify_type == FaceBeautifyType.SOFT_FILTER:
-            return self._add_soft_filter(image)
-        else:
-            raise ValueError(f"Unknown face beautify type: {self.beautify_type}")
+        strategy = self._prepared_for(config)
+        if self.beautify_type in self.REGION_TYPES:
+            return self._apply_to_faces(image, faces, strategy)
+        return strategy(image, faces)
+
+    def process_regions(self, image: np.ndarray, overrides: Optional[Mapping[str, Any]] = None,
+                        faces: Optional[List[Tuple[int, int, int, int]]] = None) -> Optional[List[RegionPatch]]:
+        """
+        Compute only the changed face rectangles, leaving the input untouched.
+
+        Overlapping faces are processed one after another over their common
+        bounding box, so the effects stack exactly as in process().
+
+        Args:
+            image: Input image (BGR format), not modified
+            overrides: Optional parameters replacing config values for this call only
+            faces: Optional precomputed face rectangles (detected if None)
+
+        Returns:
+            One RegionPatch per face or group of overlapping faces, or None
+            for whole-frame operations
+        """
+        if self.beautify_type not in self.REGION_TYPES:
+            return None
+        self.validate_image(image)
+        if faces is None:
+            faces = self._detect_faces(image)
+
+        kernel = self._prepared_for(self.resolve_config(overrides))
+        patches = []
+        for group in self._overlap_groups(self._clip_faces(image, faces)):
+            if len(group) == 1:
+                x, y, w, h = group[0]
+                patches.append(RegionPatch(x, y, kernel(image[y:y+h, x:x+w])))
+                continue
+            x0, y0 = min(r[0] for r in group), min(r[1] for r in group)
+            x1, y1 = max(r[0] + r[2] for r in group), max(r[1] + r[3] for r in group)
+            region = self._apply_to_faces(image[y0:y1, x0:x1],
+                                          [(x - x0, y - y0, w, h) for (x, y, w, h) in group], kernel)
+            patches.append(RegionPatch(x0, y0, region))
+        return patches
+
+    def process_in_place(self, image: np.ndarray, overrides: Optional[Mapping[str, Any]] = None,
+                         faces: Optional[List[Tuple[int, int, int, int]]] = None) -> np.ndarray:
+        """
+        Apply a region operation directly into a writable image.
+        Pixels outside the face rectangles are never read or copied.
+
+        Returns:
+            The same array that was passed in
+        """
+        if self.beautify_type not in self.REGION_TYPES:
+            raise ValueError(f"{self.name}: operation is not region-only")
+        self.validate_image(image)
+        if faces is None:
+            faces = self._detect_faces(image)
+
+        kernel = self._prepared_for(self.resolve_config(overrides))
+        for (x, y, w, h) in self._clip_faces(image, faces):
+            image[y:y+h, x:x+w] = kernel(image[y:y+h, x:x+w])
+        return image
+
+    @staticmethod
+    def _apply_to_faces(image: np.ndarray, faces: List[Tuple[int, int, int, int]],
+                        kernel: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """Copy of image with kernel applied to every face rectangle"""
+        result = image.copy()
+
+        for (x, y, w, h) in faces:
+            result[y:y+h, x:x+w] = kernel(result[y:y+h, x:x+w])
+
+        return result
+
+    @staticmethod
+    def _clip_faces(image: np.ndarray, faces) -> List[Tuple[int, int, int, int]]:
+        """Clip face rectangles to image bounds, dropping empty ones"""
+        img_h, img_w = image.shape[:2]
+        clipped = []
+        for (x, y, w, h) in faces:
+            x1, y1 = max(0, int(x)), max(0, int(y))
+            x2, y2 = min(img_w, int(x + w)), min(img_h, int(y + h))
+            if x2 > x1 and y2 > y1:
+                clipped.append((x1, y1, x2 - x1, y2 - y1))
+        return clipped
+
+    @staticmethod
+    def _overlap_groups(rects: List[Tuple[int, int, int, int]]) -> List[List[Tuple[int, int, int, int]]]:
+        """Split rectangles into groups connected by overlap, keeping their order within each group"""
+        def overlaps(a, b):
+            return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+        groups: List[List[int]] = []
+        for i, rect in enumerate(rects):
+            touching = [g for g in groups if any(overlaps(rect, rects[j]) for j in g)]
+            merged = sorted([j for g in touching for j in g] + [i])
+            groups = [g for g in groups if g not in touching] + [merged]
+        return [[rects[j] for j in group] for group in groups]
 
     def _detect_faces(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """Detect faces in image - preserves exact behavior from Features/FaceBeautify.py"""
@@ -77,89 +230,42 @@ class FaceBeautifyProcessor(BaseProcessor):
         )
         return faces
 
-    def _smooth_skin(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]]) -> np.ndarray:
-        """Smooth skin using Bilateral Filter"""
-        smooth_level = self.config.get('smooth_level', 0.3)
-        result = image.copy()
-
-        for (x, y, w, h) in faces:
-            face_roi = result[y:y+h, x:x+w]
-            d = int(9 + smooth_level * 20)
-            sigma_color = int(50 + smooth_level * 100)
-            sigma_space = int(50 + smooth_level * 100)
-            smoothed = cv2.bilateralFilter(face_roi, d, sigma_color, sigma_space)
-            alpha = 0.3 + smooth_level * 0.7
-            blended = cv2.addWeighted(face_roi, 1-alpha, smoothed, alpha, 0)
-            result[y:y+h, x:x+w] = blended
-
-        return result
-
-    def _brighten_face(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]]) -> np.ndarray:
-        """Brighten face regions"""
-        brightness_value = self.config.get('brightness_value', 30)
-        result = image.copy()
-
-        for (x, y, w, h) in faces:
-            face_roi = result[y:y+h, x:x+w]
-            brightened = cv2.convertScaleAbs(face_roi, alpha=1.0, beta=brightness_value)
-            result[y:y+h, x:x+w] = brightened
-
-        return result
-
-    def _enhance_face_contrast(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]]) -> np.ndarray:
-        """Enhance contrast for face regions"""
-        contrast = self.config.get('contrast', 1.3)
-        result = image.copy()
-
-        for (x, y, w, h) in faces:
-            face_roi = result[y:y+h, x:x+w]
-            enhanced = cv2.convertScaleAbs(face_roi, alpha=contrast, beta=0)
-            result[y:y+h, x:x+w] = enhanced
-
-        return result
-
-    def _remove_blemishes(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]]) -> np.ndarray:
-        """Remove blemishes from face regions"""
-        result = image.copy()
-
-        for (x, y, w, h) in faces:
-            face_roi = result[y:y+h, x:x+w]
-            denoised = cv2.fastNlMeansDenoisingColored(face_roi, None, 10, 10, 7, 21)
-            result[y:y+h, x:x+w] = denoised
-
-        return result
-
-    def _beautify_face_auto(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]]) -> np.ndarray:
-        """Auto beautify combining multiple techniques"""
-        result = image.copy()
-
-        # Apply operations in sequence
-        temp_config_smooth = ProcessorConfig()
-        temp_config_smooth.set('smooth_level', 0.5)
-        original_config = self.config
-        self.config = temp_config_smooth
-        result = self._smooth_skin(result, faces)
-
-        temp_config_bright = ProcessorConfig()
-        temp_config_bright.set('brightness_value', 15)
-        self.config = temp_config_bright
-        result = self._brighten_face(result, faces)
-
-        temp_config_contrast = ProcessorConfig()
-        temp_config_contrast.set('contrast', 1.15)
-        self.config = temp_config_contrast
-        result = self._enhance_face_contrast(result, faces)
-
-        self.config = original_config
-        result = self._remove_blemishes(result, faces)
-
-        return result
-
-    def _apply_blur_background(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]]) -> np.ndarray:
+    def _smooth_roi(self, face_roi: np.ndarray, smooth_level: float,
+                    smooth_engine: str = SkinSmoothing.DEFAULT_ENGINE) -> np.ndarray:
+        """Edge-preserving smoothing (bilateral by default) blended with the face region"""
+        d = int(9 + smooth_level * 20)
+        sigma_color = int(50 + smooth_level * 100)
+        sigma_space = int(50 + smooth_level * 100)
+        smoothed = SkinSmoothing.smooth(face_roi, d, sigma_color, sigma_space, smooth_engine)
+        alpha = 0.3 + smooth_level * 0.7
+        return cv2.addWeighted(face_roi, 1-alpha, smoothed, alpha, 0)
+
+    def _brighten_roi(self, face_roi: np.ndarray, brightness_value: int) -> np.ndarray:
+        return cv2.convertScaleAbs(face_roi, alpha=1.0, beta=brightness_value)
+
+    def _contrast_roi(self, face_roi: np.ndarray, contrast: float) -> np.ndarray:
+        return cv2.convertScaleAbs(face_roi, alpha=contrast, beta=0)
+
+    def _denoise_roi(self, face_roi: np.ndarray,
+                     blemish_engine: str = BlemishRemoval.DEFAULT_ENGINE) -> np.ndarray:
+        """Blemish removal (non-local means by default)"""
+        return BlemishRemoval.remove_blemishes(face_roi, blemish_engine)
+
+    def _auto_beautify_roi(self, face_roi: np.ndarray, params: AutoBeautifyParams) -> np.ndarray:
+        """
+        Fused per-face pipeline: smooth -> (brighten + contrast as one LUT) -> blemish.
+        One ROI buffer is allocated by smoothing and then reused in place.
+        """
+        buffer = self._smooth_roi(face_roi, params.smooth_level, params.smooth_engine)
+        cv2.LUT(buffer, _tone_lut(params.brightness_value, params.contrast), dst=buffer)
+        return self._denoise_roi(buffer, params.blemish_engine)
+
+    def _apply_blur_background(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]],
+                               blur_amount: int,
+                               blur_engine: str = BlurEngine.DEFAULT_ENGINE) -> np.ndarray:
         """Blur background while keeping face sharp"""
-        blur_amount = self.config.get('blur_amount', 21)
         result = image.copy()
-        blurred = cv2.GaussianBlur(result, (blur_amount, blur_amount), 0)
+        blurred = BlurEngine.gaussian_blur(result, (blur_amount, blur_amount), 0, blur_engine)
         mask = np.zeros(image.shape[:2], dtype=np.uint8)
 
         for (x, y, w, h) in faces:
@@ -172,16 +278,17 @@ class FaceBeautifyProcessor(BaseProcessor):
             axes = ((x2 - x1) // 2, (y2 - y1) // 2)
             cv2.ellipse(mask, center, axes, 0, 0, 360, 255, -1)
 
-        mask = cv2.GaussianBlur(mask, (21, 21), 0)
+        mask = BlurEngine.gaussian_blur(mask, (21, 21), 0, blur_engine)
         mask = mask / 255.0
         mask = np.stack([mask] * 3, axis=2)
         result = (result * mask + blurred * (1 - mask)).astype(np.uint8)
 
         return result
 
-    def _add_soft_filter(self, image: np.ndarray) -> np.ndarray:
-        """Add soft filter (soft glow effect)"""
-        intensity = self.config.get('intensity', 0.3)
-        blurred = cv2.GaussianBlur(image, (0, 0), 10)
+    def _add_soft_filter(self, image: np.ndarray, faces: List[Tuple[int, int, int, int]],
+                         intensity: float,
+                         blur_engine: str = BlurEngine.DEFAULT_ENGINE) -> np.ndarray:
+        """Add soft filter (soft glow effect); applies to the whole frame, faces are unused"""
+        blurred = BlurEngine.gaussian_blur(image, (0, 0), 10, blur_engine)
         result = cv2.addWeighted(image, 1 - intensity, blurred, intensity, 0)
         return result
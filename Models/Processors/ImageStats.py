@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""ImageStats.py - Lazily computed, cached statistics of one image"""
+
+import math
+import cv2
+import numpy as np
+from threading import RLock
+from typing import Any, Callable, Dict, Hashable, Tuple
+from .Engines import Histogram
+
+
+class ImageStats:
+    """
+    Statistics of a single image, each computed on first use and cached.
+
+    One instance describes one image version (see ImageModel.stats), so
+    adaptive processors (auto brightness, auto Canny, adaptive sharpen)
+    share the histogram, grayscale and blur metric instead of each walking
+    the frame again. Thread-safe; the image must not change while in use.
+    """
+
+    def __init__(self, image: np.ndarray):
+        self.image = image
+        self._cache: Dict[Hashable, Any] = {}
+        self._lock = RLock()
+
+    def _cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = compute()
+            return self._cache[key]
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale version of the image"""
+        return self._cached('gray', lambda: self.image if self.image.ndim == 2
+                            else cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY))
+
+    def histogram(self, step: int = 1) -> np.ndarray:
+        """256-bin histogram over all channels (step > 1 samples a grid)"""
+        return self._cached(('histogram', step), lambda: Histogram.histogram(self.image, step))
+
+    def gray_histogram(self, step: int = 1) -> np.ndarray:
+        """256-bin histogram of the grayscale image"""
+        if self.image.ndim == 2:
+            return self.histogram(step)
+        return self._cached(('gray_histogram', step), lambda: Histogram.histogram(self.gray, step))
+
+    def mean(self, step: int = 1) -> float:
+        """Mean over all pixels and channels (same as np.mean for step 1)"""
+        return self._cached(('mean', step), lambda: Histogram.mean(self.histogram(step)))
+
+    def mean_std(self, step: int = 1) -> Tuple[float, float]:
+        """(mean, standard deviation) over all pixels and channels"""
+        def compute():
+            hist = self.histogram(step)
+            values = np.arange(256, dtype=np.int64)
+            total = int(hist.sum())
+            first = int(np.dot(values, hist))
+            second = int(np.dot(values * values, hist))
+            variance = (second * total - first * first) / (total * total)
+            return first / total, math.sqrt(max(variance, 0.0))
+        return self._cached(('mean_std', step), compute)
+
+    def luminance(self, step: int = 1) -> float:
+        """Mean grayscale (luma) value"""
+        return self._cached(('luminance', step), lambda: Histogram.mean(self.gray_histogram(step)))
+
+    def median_luminance(self, step: int = 1) -> float:
+        """Median grayscale value (same as np.median(gray) for step 1)"""
+        return self._cached(('median_luminance', step), lambda: Histogram.median(self.gray_histogram(step)))
+
+    def canny_thresholds(self, sigma: float = 0.33, step: int = 1) -> Tuple[int, int]:
+        """Auto-Canny thresholds around the grayscale median"""
+        return Histogram.canny_thresholds(self.gray_histogram(step), sigma)
+
+    def laplacian_variance(self) -> float:
+        """Blur metric: variance of the grayscale Laplacian (lower = blurrier)"""
+        return self._cached('laplacian_variance', lambda: Histogram.laplacian_variance(self.gray))
@@ -5,6 +5,8 @@ import cv2
 import numpy as np
 from enum import Enum
 from .BaseProcessor import BaseProcessor, ProcessorConfig
+from .Capabilities import Capabilities, OpClass, radius_of
+from .ImageStats import ImageStats
 
 
 class SharpenType(Enum):
@@ -21,36 +23,62 @@ class SharpenType(Enum):
 class SharpenProcessor(BaseProcessor):
     """Sharpen processor implementing Strategy Pattern"""
 
+    STRATEGIES = {
+        SharpenType.BASIC: ('_sharpen_basic', {'strength': 1.0}),
+        SharpenType.LAPLACIAN: ('_sharpen_laplacian', {'strength': 1.0}),
+        SharpenType.UNSHARP_MASK: ('_unsharp_mask', {'kernel_size': (5, 5), 'sigma': 1.0,
+                                                     'amount': 1.0, 'threshold': 0}),
+        SharpenType.HIGHPASS: ('_sharpen_highpass', {'kernel_size': 3}),
+        SharpenType.ADAPTIVE: ('_adaptive_sharpen', {'blur_amount': None}),
+        SharpenType.DETAIL_ENHANCE: ('_detail_enhance', {'sigma_s': 60, 'sigma_r': 0.07}),
+        SharpenType.EDGE_PRESERVE: ('_edge_preserve_sharpen', {}),
+    }
+
+    STATS_CONSUMERS = frozenset({SharpenType.ADAPTIVE})
+
+    INTO_STRATEGIES = {
+        SharpenType.BASIC: '_sharpen_basic_into',
+        SharpenType.LAPLACIAN: '_sharpen_laplacian_into',
+        SharpenType.UNSHARP_MASK: '_unsharp_mask_into',
+        SharpenType.HIGHPASS: '_sharpen_highpass_into',
+        SharpenType.ADAPTIVE: '_adaptive_sharpen_into',
+        SharpenType.EDGE_PRESERVE: '_edge_preserve_sharpen_into',
+    }
+
+    CAPABILITIES = {
+        SharpenType.BASIC: Capabilities(OpClass.LOCAL, radius=1),
+        SharpenType.LAPLACIAN: Capabilities(OpClass.LOCAL, radius=1),
+        SharpenType.UNSHARP_MASK: Capabilities(OpClass.LOCAL),
+        SharpenType.HIGHPASS: Capabilities(OpClass.LOCAL),
+        # Blur strength follows the whole-image Laplacian variance
+        SharpenType.ADAPTIVE: Capabilities(OpClass.GLOBAL, radius=None),
+        # Recursive domain-transform filter: unbounded support, colour only
+        SharpenType.DETAIL_ENHANCE: Capabilities(OpClass.LOCAL, radius=None, channels=(3,)),
+        SharpenType.EDGE_PRESERVE: Capabilities(OpClass.LOCAL, radius=4),  # bilateral d=9
+    }
+
     def __init__(self, sharpen_type: SharpenType, config: ProcessorConfig = None):
-        super().__init__(f"Sharpen_{sharpen_type.value}", config)
         self.sharpen_type = sharpen_type
+        super().__init__(f"Sharpen_{sharpen_type.value}", config)
 
-    def process(self, image: np.ndarray) -> np.ndarray:
-        """Apply sharpening based on type"""
-        self.validate_image(image)
-
-        if self.sharpen_type == SharpenType.BASIC:
-            return self._sharpen_basic(image)
-        elif self.sharpen_type == SharpenType.LAPLACIAN:
-            return self._sharpen_laplacian(image)
-        elif self.sharpen_type == SharpenType.UNSHARP_MASK:
-            return self._unsharp_mask(image)
-        elif self.sharpen_type == SharpenType.HIGHPASS:
-            return self._sharpen_highpass(image)
-        elif self.sharpen_type == SharpenType.ADAPTIVE:
-            return self._adaptive_sharpen(image)
-        elif self.sharpen_type == SharpenType.DETAIL_ENHANCE:
-            return self._detail_enhance(image)
-        elif self.sharpen_type == SharpenType.EDGE_PRESERVE:
-            return self._edge_preserve_sharpen(image)
-        else:
-            raise ValueError(f"Unknown sharpen type: {self.sharpen_type}")
+    @property
+    def strategy_key(self) -> SharpenType:
+        return self.sharpen_type
 
-    def _sharpen_basic(self, image: np.ndarray) -> np.ndarray:
-        """Basic sharpening using kernel - preserves exact behavior from Features/Sharpen.py"""
-        strength = self.config.get('strength', 1.0)
+    def _capability_radius(self, key, params):
+        if key in (SharpenType.UNSHARP_MASK, SharpenType.HIGHPASS):
+            return radius_of(params['kernel_size'])
+        return None
+
+    def _resolve_params(self, key, params):
+        """Build the basic sharpening kernel once instead of on every call"""
+        if key == SharpenType.BASIC:
+            return {'kernel': self._basic_kernel(params['strength'])}
+        return params
 
-        # Basic sharpening kernel
+    @staticmethod
+    def _basic_kernel(strength: float) -> np.ndarray:
+        """Basic sharpening kernel scaled by strength"""
         kernel = np.array([
             [0, -1, 0],
             [-1, 5, -1],
@@ -60,14 +88,15 @@ class SharpenProcessor(BaseProcessor):
         # Adjust strength
         kernel = kernel * strength
         kernel[1, 1] = 1 + 4 * strength
+        return kernel
 
+    def _sharpen_basic(self, image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+        """Basic sharpening using kernel - preserves exact behavior from Features/Sharpen.py"""
         sharpened = cv2.filter2D(image, -1, kernel)
         return sharpened
 
-    def _sharpen_laplacian(self, image: np.ndarray) -> np.ndarray:
+    def _sharpen_laplacian(self, image: np.ndarray, strength: float) -> np.ndarray:
         """Sharpen using Laplacian operator"""
-        strength = self.config.get('strength', 1.0)
-
         # Calculate Laplacian
         laplacian = cv2.Laplacian(image, cv2.CV_64F)
         laplacian = cv2.convertScaleAbs(laplacian)
@@ -77,13 +106,9 @@ class SharpenProcessor(BaseProcessor):
 
         return sharpened
 
-    def _unsharp_mask(self, image: np.ndarray) -> np.ndarray:
+    def _unsharp_mask(self, image: np.ndarray, kernel_size=(5, 5), sigma: float = 1.0,
+                      amount: float = 1.0, threshold: int = 0) -> np.ndarray:
         """Sharpen using Unsharp Masking"""
-        kernel_size = self.config.get('kernel_size', (5, 5))
-        sigma = self.config.get('sigma', 1.0)
-        amount = self.config.get('amount', 1.0)
-        threshold = self.config.get('threshold', 0)
-
         # Create blurred image
         blurred = cv2.GaussianBlur(image, kernel_size, sigma)
 
@@ -99,10 +124,8 @@ class SharpenProcessor(BaseProcessor):
 
         return sharpened
 
-    def _sharpen_highpass(self, image: np.ndarray) -> np.ndarray:
+    def _sharpen_highpass(self, image: np.ndarray, kernel_size: int) -> np.ndarray:
         """Sharpen using High-pass filter"""
-        kernel_size = self.config.get('kernel_size', 3)
-
         # Create low-pass filter
         lowpass = cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
 
@@ -114,15 +137,22 @@ class SharpenProcessor(BaseProcessor):
 
         return sharpened
 
-    def _adaptive_sharpen(self, image: np.ndarray) -> np.ndarray:
+    def _adaptive_sharpen(self, image: np.ndarray, blur_amount: float = None,
+                          stats: ImageStats = None) -> np.ndarray:
         """Adaptive sharpening based on image blur amount"""
-        blur_amount = self.config.get('blur_amount', None)
+        strength = self._adaptive_strength(image, blur_amount, stats)
+
+        # Use unsharp mask with calculated strength
+        return self._unsharp_mask(image, kernel_size=(5, 5), sigma=1.0, amount=strength, threshold=0)
 
+    @staticmethod
+    def _adaptive_strength(image: np.ndarray, blur_amount: float = None, stats: ImageStats = None) -> float:
+        """Unsharp amount for image: blur_amount, or estimated from the Laplacian variance"""
         # Calculate blur amount if not provided
         if blur_amount is None:
             # Use Laplacian variance to estimate blur
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+            stats = stats if stats is not None else ImageStats(image)
+            laplacian_var = stats.laplacian_variance()
 
             # More blur = lower variance
             # Adjust strength based on variance
@@ -134,26 +164,10 @@ class SharpenProcessor(BaseProcessor):
                 strength = 1.0  # Relatively sharp
         else:
             strength = blur_amount
+        return strength
 
-        # Use unsharp mask with calculated strength
-        temp_config = ProcessorConfig()
-        temp_config.set('kernel_size', (5, 5))
-        temp_config.set('sigma', 1.0)
-        temp_config.set('amount', strength)
-        temp_config.set('threshold', 0)
-
-        original_config = self.config
-        self.config = temp_config
-        result = self._unsharp_mask(image)
-        self.config = original_config
-
-        return result
-
-    def _detail_enhance(self, image: np.ndarray) -> np.ndarray:
+    def _detail_enhance(self, image: np.ndarray, sigma_s: float, sigma_r: float) -> np.ndarray:
         """Detail enhancement using cv2.detailEnhance - CRITICAL feature"""
-        sigma_s = self.config.get('sigma_s', 60)
-        sigma_r = self.config.get('sigma_r', 0.07)
-
         return cv2.detailEnhance(image, sigma_s=sigma_s, sigma_r=sigma_r)
 
     def _edge_preserve_sharpen(self, image: np.ndarray) -> np.ndarray:
@@ -168,3 +182,37 @@ class SharpenProcessor(BaseProcessor):
         sharpened = cv2.add(image, mask)
 
         return sharpened
+
+    # process_into variants: the same OpenCV calls, with intermediates kept in
+    # scratch and the final combination written into dst
+
+    def _sharpen_basic_into(self, src: np.ndarray, dst: np.ndarray, scratch, kernel: np.ndarray):
+        cv2.filter2D(src, -1, kernel, dst=dst)
+
+    def _sharpen_laplacian_into(self, src: np.ndarray, dst: np.ndarray, scratch, strength: float):
+        laplacian = cv2.Laplacian(src, cv2.CV_64F, dst=scratch.get('laplacian', src.shape, np.float64))
+        magnitude = cv2.convertScaleAbs(laplacian, dst=scratch.like('magnitude', src))
+        cv2.addWeighted(src, 1.0, magnitude, strength, 0, dst=dst)
+
+    def _unsharp_mask_into(self, src: np.ndarray, dst: np.ndarray, scratch, kernel_size=(5, 5),
+                           sigma: float = 1.0, amount: float = 1.0, threshold: int = 0):
+        blurred = cv2.GaussianBlur(src, kernel_size, sigma, dst=scratch.like('blurred', src))
+        mask = cv2.subtract(src, blurred, dst=scratch.like('mask', src))
+        if threshold > 0:
+            cv2.threshold(mask, threshold, 255, cv2.THRESH_BINARY, dst=mask)
+        cv2.addWeighted(src, 1.0, mask, amount, 0, dst=dst)
+
+    def _sharpen_highpass_into(self, src: np.ndarray, dst: np.ndarray, scratch, kernel_size: int):
+        lowpass = cv2.GaussianBlur(src, (kernel_size, kernel_size), 0, dst=scratch.like('blurred', src))
+        highpass = cv2.subtract(src, lowpass, dst=scratch.like('mask', src))
+        cv2.add(src, highpass, dst=dst)
+
+    def _adaptive_sharpen_into(self, src: np.ndarray, dst: np.ndarray, scratch, blur_amount: float = None,
+                               stats: ImageStats = None):
+        strength = self._adaptive_strength(src, blur_amount, stats)
+        self._unsharp_mask_into(src, dst, scratch, kernel_size=(5, 5), sigma=1.0, amount=strength, threshold=0)
+
+    def _edge_preserve_sharpen_into(self, src: np.ndarray, dst: np.ndarray, scratch):
+        smooth = cv2.bilateralFilter(src, 9, 75, 75, dst=scratch.like('blurred', src))
+        mask = cv2.subtract(src, smooth, dst=scratch.like('mask', src))
+        cv2.add(src, mask, dst=dst)
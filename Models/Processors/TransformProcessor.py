@@ -6,7 +6,10 @@ TransformProcessor.py - Image transformation operations processor
 import cv2
 import numpy as np
 from enum import Enum
+from typing import Optional, Tuple
 from .BaseProcessor import BaseProcessor, ProcessorConfig
+from .Capabilities import Capabilities, OpClass
+from ..Orientation import Orientation
 
 
 class TransformType(Enum):
@@ -26,30 +29,69 @@ class TransformProcessor(BaseProcessor):
     Preserves exact behavior from original Features/Transform.py
     """
 
+    STRATEGIES = {
+        TransformType.ROTATE_90_CW: ('_rotate_90_clockwise', {}),
+        TransformType.ROTATE_90_CCW: ('_rotate_90_counterclockwise', {}),
+        TransformType.ROTATE_180: ('_rotate_180', {}),
+        TransformType.FLIP_HORIZONTAL: ('_flip_horizontal', {}),
+        TransformType.FLIP_VERTICAL: ('_flip_vertical', {}),
+        TransformType.ZOOM_IN: ('_zoom_in', {'zoom_factor': 1.3}),
+        TransformType.ZOOM_OUT: ('_zoom_out', {'zoom_factor': 0.7}),
+    }
+
+    INTO_STRATEGIES = {
+        TransformType.ROTATE_90_CW: '_rotate_90_clockwise_into',
+        TransformType.ROTATE_90_CCW: '_rotate_90_counterclockwise_into',
+        TransformType.ROTATE_180: '_rotate_180_into',
+        TransformType.FLIP_HORIZONTAL: '_flip_horizontal_into',
+        TransformType.FLIP_VERTICAL: '_flip_vertical_into',
+        TransformType.ZOOM_IN: '_zoom_in_into',
+        TransformType.ZOOM_OUT: '_zoom_out_into',
+    }
+
+    # Quarter turns stay per image: a strided numpy transpose of the stack is
+    # several times slower than cv2.rotate writing into the output stack
+    BATCH_STRATEGIES = {
+        TransformType.ROTATE_180: '_rotate_180_batch',
+        TransformType.FLIP_HORIZONTAL: '_flip_horizontal_batch',
+        TransformType.FLIP_VERTICAL: '_flip_vertical_batch',
+    }
+
+    # Rotations and flips as elements of the D4 orientation group
+    ORIENTATIONS = {
+        TransformType.ROTATE_90_CW: Orientation.rotate_cw(1),
+        TransformType.ROTATE_90_CCW: Orientation.rotate_cw(3),
+        TransformType.ROTATE_180: Orientation.rotate_cw(2),
+        TransformType.FLIP_HORIZONTAL: Orientation.flip_horizontal(),
+        TransformType.FLIP_VERTICAL: Orientation.flip_vertical(),
+    }
+
+    CAPABILITIES = {
+        TransformType.ROTATE_90_CW: Capabilities(OpClass.GEOMETRIC, preserves_size=False),
+        TransformType.ROTATE_90_CCW: Capabilities(OpClass.GEOMETRIC, preserves_size=False),
+        TransformType.ROTATE_180: Capabilities(OpClass.GEOMETRIC),
+        TransformType.FLIP_HORIZONTAL: Capabilities(OpClass.GEOMETRIC),
+        TransformType.FLIP_VERTICAL: Capabilities(OpClass.GEOMETRIC),
+        TransformType.ZOOM_IN: Capabilities(OpClass.GEOMETRIC),
+        TransformType.ZOOM_OUT: Capabilities(OpClass.GEOMETRIC),
+    }
+
     def __init__(self, transform_type: TransformType, config: ProcessorConfig = None):
-        super().__init__(f"Transform-{transform_type.value}", config)
         self.transform_type = transform_type
+        super().__init__(f"Transform-{transform_type.value}", config)
 
-    def process(self, image: np.ndarray) -> np.ndarray:
-        """Apply transformation to image"""
-        self.validate_image(image)
-
-        if self.transform_type == TransformType.ROTATE_90_CW:
-            return self._rotate_90_clockwise(image)
-        elif self.transform_type == TransformType.ROTATE_90_CCW:
-            return self._rotate_90_counterclockwise(image)
-        elif self.transform_type == TransformType.ROTATE_180:
-            return self._rotate_180(image)
-        elif self.transform_type == TransformType.FLIP_HORIZONTAL:
-            return self._flip_horizontal(image)
-        elif self.transform_type == TransformType.FLIP_VERTICAL:
-            return self._flip_vertical(image)
-        elif self.transform_type == TransformType.ZOOM_IN:
-            return self._zoom_in(image)
-        elif self.transform_type == TransformType.ZOOM_OUT:
-            return self._zoom_out(image)
-        else:
-            raise ValueError(f"Unknown transform type: {self.transform_type}")
+    @property
+    def strategy_key(self) -> TransformType:
+        return self.transform_type
+
+    def orientation_step(self) -> Optional[Orientation]:
+        return self.ORIENTATIONS.get(self.transform_type)
+
+    def output_shape(self, image: np.ndarray) -> Tuple[int, ...]:
+        """Quarter turns swap width and height"""
+        if self.transform_type in (TransformType.ROTATE_90_CW, TransformType.ROTATE_90_CCW):
+            return (image.shape[1], image.shape[0]) + image.shape[2:]
+        return image.shape
 
     def _rotate_90_clockwise(self, image: np.ndarray) -> np.ndarray:
         """Rotate image 90 degrees clockwise"""
@@ -71,9 +113,8 @@ class TransformProcessor(BaseProcessor):
         """Flip image vertically"""
         return cv2.flip(image, 0)
 
-    def _zoom_in(self, image: np.ndarray) -> np.ndarray:
+    def _zoom_in(self, image: np.ndarray, zoom_factor: float) -> np.ndarray:
         """Zoom in (enlarge) image"""
-        zoom_factor = self.config.get('zoom_factor', 1.3)
         h, w = image.shape[:2]
         new_h, new_w = int(h * zoom_factor), int(w * zoom_factor)
         resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
@@ -85,9 +126,8 @@ class TransformProcessor(BaseProcessor):
 
         return cropped
 
-    def _zoom_out(self, image: np.ndarray) -> np.ndarray:
+    def _zoom_out(self, image: np.ndarray, zoom_factor: float) -> np.ndarray:
         """Zoom out (shrink) image"""
-        zoom_factor = self.config.get('zoom_factor', 0.7)
         h, w = image.shape[:2]
         new_h, new_w = int(h * zoom_factor), int(w * zoom_factor)
         resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
@@ -99,3 +139,55 @@ class TransformProcessor(BaseProcessor):
         canvas[start_y:start_y+new_h, start_x:start_x+new_w] = resized
 
         return canvas
+
+    # process_into variants: rotations and flips write straight into dst;
+    # zooms resize into scratch and copy the visible part
+
+    def _rotate_90_clockwise_into(self, src: np.ndarray, dst: np.ndarray, scratch):
+        cv2.rotate(src, cv2.ROTATE_90_CLOCKWISE, dst=dst)
+
+    def _rotate_90_counterclockwise_into(self, src: np.ndarray, dst: np.ndarray, scratch):
+        cv2.rotate(src, cv2.ROTATE_90_COUNTERCLOCKWISE, dst=dst)
+
+    def _rotate_180_into(self, src: np.ndarray, dst: np.ndarray, scratch):
+        cv2.rotate(src, cv2.ROTATE_180, dst=dst)
+
+    def _flip_horizontal_into(self, src: np.ndarray, dst: np.ndarray, scratch):
+        cv2.flip(src, 1, dst=dst)
+
+    def _flip_vertical_into(self, src: np.ndarray, dst: np.ndarray, scratch):
+        cv2.flip(src, 0, dst=dst)
+
+    def _zoom_in_into(self, src: np.ndarray, dst: np.ndarray, scratch, zoom_factor: float):
+        h, w = src.shape[:2]
+        new_h, new_w = int(h * zoom_factor), int(w * zoom_factor)
+        resized = scratch.get('resized', (new_h, new_w) + src.shape[2:], src.dtype)
+        cv2.resize(src, (new_w, new_h), dst=resized, interpolation=cv2.INTER_LINEAR)
+        start_y = (new_h - h) // 2
+        start_x = (new_w - w) // 2
+        np.copyto(dst, resized[start_y:start_y+h, start_x:start_x+w])
+
+    def _zoom_out_into(self, src: np.ndarray, dst: np.ndarray, scratch, zoom_factor: float):
+        h, w = src.shape[:2]
+        new_h, new_w = int(h * zoom_factor), int(w * zoom_factor)
+        resized = scratch.get('resized', (new_h, new_w) + src.shape[2:], src.dtype)
+        cv2.resize(src, (new_w, new_h), dst=resized, interpolation=cv2.INTER_LINEAR)
+        dst.fill(0)
+        start_y = (h - new_h) // 2
+        start_x = (w - new_w) // 2
+        dst[start_y:start_y+new_h, start_x:start_x+new_w] = resized
+
+    # process_batch variants: one flip over the whole stack
+
+    def _flip_horizontal_batch(self, stack: np.ndarray) -> np.ndarray:
+        """Mirroring every row of the tall image mirrors each image"""
+        return cv2.flip(self._stack_rows(stack), 1).reshape(stack.shape)
+
+    def _flip_vertical_batch(self, stack: np.ndarray) -> np.ndarray:
+        """Reverse the row order inside each image (whole rows are copied)"""
+        return np.ascontiguousarray(stack[:, ::-1])
+
+    def _rotate_180_batch(self, stack: np.ndarray) -> np.ndarray:
+        """Rotating the tall image also reverses the image order; undo that with a block copy"""
+        rotated = cv2.flip(self._stack_rows(stack), -1).reshape(stack.shape)
+        return np.ascontiguousarray(rotated[::-1])
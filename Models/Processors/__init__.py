@@ -1,20 +1,34 @@
 # -*- coding: utf-8 -*-
 """Processors Package - Image Processing Strategies (Strategy Pattern)"""
 
-from .BaseProcessor import BaseProcessor, ProcessorConfig
+from .BaseProcessor import BaseProcessor, ProcessorConfig, RegionPatch, ScratchBuffers
+from .ImageStats import ImageStats
+from .Capabilities import Capabilities, OpClass
+from .CostModel import CostModel
 from .EdgeDetectionProcessor import EdgeDetectionProcessor, EdgeDetectionType
 from .TransformProcessor import TransformProcessor, TransformType
 from .BlurProcessor import BlurProcessor, BlurType
 from .BrightnessProcessor import BrightnessProcessor, BrightnessOperation
 from .SharpenProcessor import SharpenProcessor, SharpenType
-from .FaceBeautifyProcessor import FaceBeautifyProcessor, FaceBeautifyType
+from .FaceBeautifyProcessor import FaceBeautifyProcessor, FaceBeautifyType, AutoBeautifyParams
+
+# Every processor class with the enum of operation types it is built from
+PROCESSOR_TYPES = (
+    (BlurProcessor, BlurType),
+    (BrightnessProcessor, BrightnessOperation),
+    (SharpenProcessor, SharpenType),
+    (EdgeDetectionProcessor, EdgeDetectionType),
+    (TransformProcessor, TransformType),
+    (FaceBeautifyProcessor, FaceBeautifyType),
+)
 
 __all__ = [
-    'BaseProcessor', 'ProcessorConfig',
+    'BaseProcessor', 'ProcessorConfig', 'RegionPatch', 'ScratchBuffers', 'ImageStats',
+    'Capabilities', 'OpClass', 'CostModel', 'PROCESSOR_TYPES',
     'EdgeDetectionProcessor', 'EdgeDetectionType',
     'TransformProcessor', 'TransformType',
     'BlurProcessor', 'BlurType',
     'BrightnessProcessor', 'BrightnessOperation',
     'SharpenProcessor', 'SharpenType',
-    'FaceBeautifyProcessor', 'FaceBeautifyType'
+    'FaceBeautifyProcessor', 'FaceBeautifyType', 'AutoBeautifyParams'
 ]
@@ -2,6 +2,7 @@
 """Models Package - Data and Business Logic"""
 
 from .ImageModel import ImageModel
-from .ImageHistory import ImageHistory
+from .ImageHistory import ImageHistory, RegionDelta, OrientationDelta
+from .Orientation import Orientation
 
-__all__ = ['ImageModel', 'ImageHistory']
+__all__ = ['ImageModel', 'ImageHistory', 'RegionDelta', 'OrientationDelta', 'Orientation']
@@ -4,6 +4,7 @@
 import cv2
 import numpy as np
 from typing import List, Tuple
+from . import Tracing
 
 
 class FaceDetectionService:
@@ -41,20 +42,21 @@ class FaceDetectionService:
         if image is None or image.size == 0:
             return []
 
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        with Tracing.span('face_detection', 'faces'):
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
-        # Improve image quality before detection
-        gray = cv2.equalizeHist(gray)
+            # Improve image quality before detection
+            gray = cv2.equalizeHist(gray)
 
-        # Reduce scaleFactor and minNeighbors to detect more faces
-        # scaleFactor: 1.05 = more sensitive, minNeighbors: 3 = less strict
-        faces = self._cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.05,
-            minNeighbors=3,
-            minSize=(30, 30),
-            flags=cv2.CASCADE_SCALE_IMAGE
-        )
+            # Reduce scaleFactor and minNeighbors to detect more faces
+            # scaleFactor: 1.05 = more sensitive, minNeighbors: 3 = less strict
+            faces = self._cascade.detectMultiScale(
+                gray,
+                scaleFactor=1.05,
+                minNeighbors=3,
+                minSize=(30, 30),
+                flags=cv2.CASCADE_SCALE_IMAGE
+            )
 
         return faces
 
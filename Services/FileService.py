@@ -6,6 +6,10 @@ import numpy as np
 from typing import Optional, Tuple
 from tkinter import filedialog
 import os
+from Models import Orientation
+from . import JpegOrientation, Tracing
+
+JPEG_EXTENSIONS = ('.jpg', '.jpeg', '.jpe')
 
 
 class FileService:
@@ -26,7 +30,8 @@ class FileService:
             return None
 
         try:
-            image = cv2.imread(file_path)
+            with Tracing.span('decode', 'io', path=file_path):
+                image = cv2.imread(file_path)
             if image is None:
                 return None
             return image, file_path
@@ -50,12 +55,50 @@ class FileService:
             return False
 
         try:
-            cv2.imwrite(file_path, image)
+            with Tracing.span('encode', 'io', path=file_path):
+                cv2.imwrite(file_path, image)
             return True
         except Exception as e:
             print(f"Error saving image: {e}")
             return False
 
+    @staticmethod
+    def save_jpeg_lossless(source_path: str, file_path: str, orientation: Orientation) -> bool:
+        """
+        Save a rotated/flipped JPEG without re-encoding it
+
+        Copies the source file and composes its EXIF Orientation tag with the
+        given orientation, so the compressed pixels are never decoded again.
+
+        Args:
+            source_path: JPEG the image was loaded from (pixels unedited since)
+            file_path: Destination path (must also be a JPEG)
+            orientation: Orientation of the image relative to the loaded file
+
+        Returns:
+            True if saved, False if this path does not apply (the caller
+            should then encode the image normally)
+        """
+        if not source_path or not file_path or orientation is None:
+            return False
+        if not all(os.path.splitext(p)[1].lower() in JPEG_EXTENSIONS for p in (source_path, file_path)):
+            return False
+
+        try:
+            with Tracing.span('encode_lossless', 'io', path=file_path):
+                with open(source_path, 'rb') as f:
+                    data = f.read()
+                stored = Orientation.from_exif(JpegOrientation.read_orientation(data))
+                patched = JpegOrientation.with_orientation(data, stored.then(orientation).exif_tag)
+                if patched is None:
+                    return False
+                with open(file_path, 'wb') as f:
+                    f.write(patched)
+            return True
+        except Exception as e:
+            print(f"Error saving image losslessly: {e}")
+            return False
+
     @staticmethod
     def open_file_dialog() -> Optional[str]:
         """
@@ -102,6 +145,24 @@ class FileService:
         )
         return file_path if file_path else None
 
+    @staticmethod
+    def export_file_dialog(default_name: str) -> Optional[str]:
+        """
+        Open file dialog to save a report (CSV or JSON, from default_name's extension)
+
+        Returns:
+            Selected file path or None if cancelled
+        """
+        extension = os.path.splitext(default_name)[1]
+        filetypes = [(f"{extension[1:].upper()} files", f"*{extension}"), ("All files", "*.*")]
+        file_path = filedialog.asksaveasfilename(
+            title="Export",
+            defaultextension=extension,
+            initialfile=default_name,
+            filetypes=filetypes
+        )
+        return file_path if file_path else None
+
     @staticmethod
     def get_file_info(file_path: str) -> Optional[dict]:
         """
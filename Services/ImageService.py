@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 """ImageService.py - Image Processing Orchestration (SRP, DIP)"""
 
+import logging
 import cv2
 import numpy as np
 from typing import Optional
-from Models import ImageModel, ImageHistory
+from Models import ImageModel, ImageHistory, RegionDelta, OrientationDelta, Orientation
 from Models.Processors import BaseProcessor
+from .ResultCache import ResultCache, image_fingerprint
+from .Instrumentation import PerformanceMonitor
+from . import Tracing
+
+logger = logging.getLogger(__name__)
 
 
 class ImageService:
@@ -14,16 +20,23 @@ class ImageService:
     Follows Single Responsibility Principle and Dependency Inversion Principle.
     """
 
-    def __init__(self, model: ImageModel, history: ImageHistory):
+    def __init__(self, model: ImageModel, history: ImageHistory, result_cache: Optional[ResultCache] = None,
+                 instrumentation: Optional[PerformanceMonitor] = None):
         """
         Initialize ImageService with dependencies injected
 
         Args:
             model: ImageModel instance
             history: ImageHistory instance
+            result_cache: Optional ResultCache for processor outputs (created if None)
+            instrumentation: Optional PerformanceMonitor measuring each apply_processor call
         """
         self.model = model
         self.history = history
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.instrumentation = instrumentation
+        self._fingerprint = (None, None)  # (model version, fingerprint)
+        self.last_error: Optional[Exception] = None  # Failure of the last apply_processor call
 
     def load_image(self, image: np.ndarray, file_path: Optional[str] = None):
         """
@@ -56,23 +69,89 @@ class ImageService:
             processor: Processor to apply (Strategy Pattern)
 
         Returns:
-            True if successful, False otherwise
+            True if successful, False otherwise (a failure is logged and kept in last_error)
         """
+        self.last_error = None
         if not self.model.has_image():
             return False
 
         try:
-            current = self.model.get_copy()
-            processed = processor.process(current)
+            megapixels = self.model.width * self.model.height / 1e6
+            with Tracing.span(processor.name, 'processor', megapixels=megapixels):
+                monitor = self.instrumentation
+                if monitor is None:
+                    return self._apply_processor(processor)
+                with monitor.measure(processor.name, megapixels) as measurement:
+                    measurement.ok = self._apply_processor(processor)
+                return measurement.ok
+        except Exception as e:
+            logger.exception("Error applying processor %s", processor.name)
+            self.last_error = e
+            return False
+
+    def _apply_processor(self, processor: BaseProcessor) -> bool:
+        """apply_processor without error handling or measurement"""
+        step = processor.orientation_step()
+        if step is not None:
+            return self.apply_orientation(step)
+
+        # Pixel operations see the displayed image, so apply pending rotations first
+        self.model.materialize()
+
+        # Region-only operations: process and store just the changed rectangles
+        patches = processor.process_regions(self.model.current)
+        if patches is not None:
+            if patches:
+                before = self.model.apply_patches(patches)
+                self.history.push_delta(RegionDelta(before, patches))
+            return True
 
+        key = self._cache_key(processor)
+        processed = self.result_cache.get(key)
+        if processed is None:
+            current = self.model.get_copy()
+            processed = processor.process(current, stats=self.model.stats)
             if processed is not None:
-                self.model.update_current(processed)
-                self.history.push(processed)
-                return True
-            return False
-        except Exception as e:
-            print(f"Error applying processor {processor.name}: {e}")
+                self.result_cache.put(key, processed)
+
+        if processed is not None:
+            self.model.update_current(processed)
+            self.history.push(processed)
+            return True
+        return False
+
+    def apply_orientation(self, step: Orientation) -> bool:
+        """
+        Rotate/flip the image losslessly by composing its orientation.
+        No pixels are moved until they are needed for processing, display or saving.
+
+        Args:
+            step: Orientation to apply on top of the current one
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.model.has_image():
             return False
+        self.model.set_orientation(self.model.orientation.then(step))
+        self.history.push_delta(OrientationDelta(step))
+        return True
+
+    def _cache_key(self, processor: BaseProcessor) -> tuple:
+        """Cache key: (current image fingerprint, processor type, processor name, config)"""
+        version, fingerprint = self._fingerprint
+        if version != self.model.version:
+            fingerprint = image_fingerprint(self.model.current)
+            self._fingerprint = (self.model.version, fingerprint)
+        return fingerprint, type(processor).__qualname__, processor.name, processor.config
+
+    def set_instrumentation(self, instrumentation: Optional[PerformanceMonitor]):
+        """Start measuring apply_processor calls (None stops, at no further cost)"""
+        self.instrumentation = instrumentation
+
+    def get_cache_stats(self) -> dict:
+        """Hit/miss counters and memory use of the result cache"""
+        return self.result_cache.stats()
 
     def undo(self) -> bool:
         """
@@ -84,13 +163,7 @@ class ImageService:
         if not self.history.can_undo():
             return False
 
-        current = self.model.get_copy()
-        restored = self.history.undo(current)
-
-        if restored is not None:
-            self.model.update_current(restored)
-            return True
-        return False
+        return self.history.undo(self.model)
 
     def redo(self) -> bool:
         """
@@ -102,12 +175,7 @@ class ImageService:
         if not self.history.can_redo():
             return False
 
-        restored = self.history.redo()
-
-        if restored is not None:
-            self.model.update_current(restored)
-            return True
-        return False
+        return self.history.redo(self.model)
 
     def can_undo(self) -> bool:
         """Check if undo is available"""
@@ -152,15 +220,16 @@ class ImageService:
         if not self.model.has_image():
             return None
 
-        image = self.model.get_copy()
-        h, w = image.shape[:2]
+        with Tracing.span('resize_for_display', 'display'):
+            image = self.model.get_copy()
+            h, w = image.shape[:2]
 
-        # Calculate scaling factor
-        scale = min(max_width / w, max_height / h, 1.0)
+            # Calculate scaling factor
+            scale = min(max_width / w, max_height / h, 1.0)
 
-        if scale < 1.0:
-            new_w = int(w * scale)
-            new_h = int(h * scale)
-            return cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+            if scale < 1.0:
+                new_w = int(w * scale)
+                new_h = int(h * scale)
+                return cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
 
-        return image
+            return image
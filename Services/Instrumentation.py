@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentation.py - Per-operation timing and memory measurements
+
+A PerformanceMonitor measures one operation at a time (wall time, CPU
+time, bytes allocated, peak RSS growth, input size) and hands the sample
+to its PerformanceStore and any listeners. Services take an optional
+monitor and skip measuring entirely when it is None, so instrumentation
+costs nothing while disabled.
+"""
+
+import csv
+import json
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, astuple, dataclass, fields
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+PERCENTILES = (50, 95, 99)
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """High-water mark of the process resident set size (None where unsupported)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+@dataclass(frozen=True)
+class OperationSample:
+    """One measured operation (Value Object)"""
+    operation: str
+    wall_ms: float
+    cpu_ms: float                       # Whole process, so OpenCV worker threads count
+    alloc_bytes: Optional[int]          # Peak traced allocation above the start; None if not tracked
+    rss_delta_bytes: Optional[int]      # Growth of the peak RSS; None if not tracked
+    megapixels: float
+    ok: bool = True
+    error: str = ''
+    timestamp: float = 0.0              # time.time() at the start
+
+
+class Measurement:
+    """Handle yielded by PerformanceMonitor.measure; set ok = False to record a failed run"""
+
+    def __init__(self):
+        self.ok = True
+        self.sample: Optional[OperationSample] = None
+
+
+class PerformanceStore:
+    """
+    Rolling in-memory store of OperationSamples, the last `window` per
+    operation, with percentile summaries and CSV/JSON export. Thread-safe.
+    """
+
+    def __init__(self, window: int = 500):
+        """
+        Args:
+            window: Samples kept per operation (older ones are dropped)
+        """
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = Lock()
+
+    def add(self, sample: OperationSample):
+        with self._lock:
+            samples = self._samples.get(sample.operation)
+            if samples is None:
+                samples = self._samples[sample.operation] = deque(maxlen=self.window)
+            samples.append(sample)
+
+    def operations(self) -> List[str]:
+        with self._lock:
+            return sorted(self._samples)
+
+    def samples(self, operation: Optional[str] = None) -> List[OperationSample]:
+        """Samples of one operation, or of all operations in time order"""
+        with self._lock:
+            if operation is not None:
+                return list(self._samples.get(operation, ()))
+            merged = [s for samples in self._samples.values() for s in samples]
+        return sorted(merged, key=lambda s: s.timestamp)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    @staticmethod
+    def _percentiles(values: List[float]) -> Dict[int, float]:
+        return dict(zip(PERCENTILES, np.percentile(values, PERCENTILES).tolist()))
+
+    def summary(self) -> List[dict]:
+        """
+        One row per operation: count, failures, wall/CPU percentiles (ms),
+        p95 allocation and largest RSS growth (bytes), median throughput (MP/s)
+        """
+        rows = []
+        for operation in self.operations():
+            samples = self.samples(operation)
+            if not samples:
+                continue
+            wall = self._percentiles([s.wall_ms for s in samples])
+            cpu = self._percentiles([s.cpu_ms for s in samples])
+            allocs = [s.alloc_bytes for s in samples if s.alloc_bytes is not None]
+            rss = [s.rss_delta_bytes for s in samples if s.rss_delta_bytes is not None]
+            rates = [s.megapixels / (s.wall_ms / 1000) for s in samples if s.wall_ms > 0 and s.megapixels > 0]
+            row = {'operation': operation, 'count': len(samples), 'errors': sum(not s.ok for s in samples)}
+            row.update({f'wall_p{p}_ms': wall[p] for p in PERCENTILES})
+            row.update({f'cpu_p{p}_ms': cpu[p] for p in PERCENTILES})
+            row['alloc_p95_bytes'] = float(np.percentile(allocs, 95)) if allocs else None
+            row['rss_max_delta_bytes'] = max(rss) if rss else None
+            row['megapixels_per_s'] = float(np.median(rates)) if rates else None
+            rows.append(row)
+        return rows
+
+    def to_csv(self, path: str):
+        """Write every sample, one row each"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([field.name for field in fields(OperationSample)])
+            for sample in self.samples():
+                writer.writerow(['' if value is None else value for value in astuple(sample)])
+
+    def to_json(self, path: str):
+        """Write the summary and every sample"""
+        data = {'summary': self.summary(), 'samples': [asdict(s) for s in self.samples()]}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+class PerformanceMonitor:
+    """
+    Measures operations into a PerformanceStore.
+
+    Allocation tracking uses tracemalloc, which also slows pure-Python
+    allocations while an operation runs; numpy and OpenCV buffers are
+    counted through numpy's tracemalloc hooks. Disable it for timing-only
+    runs. Measurements of nested operations share one tracemalloc peak, so
+    nest only with track_allocations=False.
+    """
+
+    def __init__(self, store: Optional[PerformanceStore] = None,
+                 track_allocations: bool = True, track_rss: bool = True):
+        """
+        Args:
+            store: Where samples go (a new rolling store if None)
+            track_allocations: Record bytes allocated via tracemalloc
+            track_rss: Record peak RSS growth (not available on Windows)
+        """
+        self.store = store if store is not None else PerformanceStore()
+        self.track_allocations = track_allocations
+        self.track_rss = track_rss and resource is not None
+        self._listeners: List[Callable[[OperationSample], None]] = []
+
+    def add_listener(self, listener: Callable[[OperationSample], None]):
+        """Also pass every sample to listener (called on the measuring thread)"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[OperationSample], None]):
+        self._listeners.remove(listener)
+
+    @contextmanager
+    def measure(self, operation: str, megapixels: float = 0.0) -> Iterator[Measurement]:
+        """
+        Measure the body of a with-block as one operation
+
+        An exception leaving the block is recorded as a failure and re-raised.
+
+        Args:
+            operation: Name the sample is grouped under
+            megapixels: Input size, for throughput
+        """
+        measurement = Measurement()
+        trace_here = self.track_allocations and not tracemalloc.is_tracing()
+        if trace_here:
+            tracemalloc.start()
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+        rss_start = _peak_rss_bytes() if self.track_rss else None
+        timestamp = time.time()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        error = ''
+        try:
+            yield measurement
+        except BaseException as e:
+            measurement.ok = False
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            cpu_ms = (time.process_time() - cpu_start) * 1000
+            alloc = None
+            if self.track_allocations:
+                alloc = max(0, tracemalloc.get_traced_memory()[1] - traced_start)
+                if trace_here:
+                    tracemalloc.stop()
+            rss = _peak_rss_bytes() - rss_start if rss_start is not None else None
+            measurement.sample = OperationSample(operation, wall_ms, cpu_ms, alloc, rss, megapixels,
+                                                 measurement.ok, error, timestamp)
+            self.store.add(measurement.sample)
+            for listener in list(self._listeners):
+                listener(measurement.sample)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+JpegOrientation.py - Read and rewrite the EXIF Orientation tag of a JPEG
+
+Rotating a JPEG by re-encoding decodes and quantises it again. Setting the
+Orientation tag (0x0112) instead leaves the compressed data untouched; every
+EXIF-aware reader, including cv2.imread, shows the image rotated. Only the
+tag is patched: an existing value is overwritten in place and a file without
+EXIF gets a minimal APP1 segment.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+ORIENTATION_TAG = 0x0112
+_EXIF_HEADER = b'Exif\x00\x00'
+_SOI = b'\xff\xd8'
+_APP0, _APP1 = 0xE0, 0xE1
+_SHORT = 3
+
+
+def is_jpeg(data: bytes) -> bool:
+    return data[:2] == _SOI
+
+
+def _segments(data: bytes):
+    """Yield (marker, offset, length) of the header segments before the scan data"""
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker in (0xDA, 0xD9):  # start of scan / end of image
+            return
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        yield marker, pos, length
+        pos += 2 + length
+
+
+def _find_orientation(data: bytes) -> Tuple[bool, Optional[str], Optional[int]]:
+    """
+    Locate the Orientation value in IFD0 of the EXIF block
+
+    Returns:
+        (whether an EXIF block exists, its byte order ('<' or '>'),
+         absolute offset of the 2-byte Orientation value or None)
+    """
+    for marker, offset, length in _segments(data):
+        if marker != _APP1 or data[offset + 4:offset + 10] != _EXIF_HEADER:
+            continue
+        tiff = offset + 10
+        end = offset + 2 + length
+        order = {b'II': '<', b'MM': '>'}.get(data[tiff:tiff + 2])
+        if order is None:
+            return True, None, None
+        ifd = tiff + struct.unpack(order + 'I', data[tiff + 4:tiff + 8])[0]
+        if ifd + 2 > end:
+            return True, order, None
+        count = struct.unpack(order + 'H', data[ifd:ifd + 2])[0]
+        for i in range(count):
+            entry = ifd + 2 + 12 * i
+            if entry + 12 > end:
+                break
+            tag, kind = struct.unpack(order + 'HH', data[entry:entry + 4])
+            if tag == ORIENTATION_TAG and kind == _SHORT:
+                return True, order, entry + 8
+        return True, order, None
+    return False, None, None
+
+
+def read_orientation(data: bytes) -> int:
+    """EXIF Orientation tag of a JPEG (1 when absent)"""
+    _, order, value = _find_orientation(data)
+    if value is None:
+        return 1
+    return struct.unpack(order + 'H', data[value:value + 2])[0]
+
+
+def _minimal_exif(tag: int) -> bytes:
+    """APP1 segment holding an EXIF block with only the Orientation tag"""
+    payload = (_EXIF_HEADER + b'MM\x00\x2a' + struct.pack('>I', 8)
+               + struct.pack('>H', 1)
+               + struct.pack('>HHIH2x', ORIENTATION_TAG, _SHORT, 1, tag)
+               + struct.pack('>I', 0))
+    return b'\xff' + bytes([_APP1]) + struct.pack('>H', len(payload) + 2) + payload
+
+
+def with_orientation(data: bytes, tag: int) -> Optional[bytes]:
+    """
+    Copy of a JPEG with its EXIF Orientation set to tag
+
+    Args:
+        data: JPEG file contents
+        tag: EXIF Orientation value (1-8)
+
+    Returns:
+        New file contents, or None if data is not a JPEG or has an EXIF
+        block without an Orientation entry (adding one would mean
+        relocating the IFD offsets)
+    """
+    if not is_jpeg(data) or not 1 <= tag <= 8:
+        return None
+    has_exif, order, value = _find_orientation(data)
+    if value is not None:
+        patched = bytearray(data)
+        patched[value:value + 2] = struct.pack(order + 'H', tag)
+        return bytes(patched)
+    if has_exif:
+        return None
+    if tag == 1:
+        return data
+    # JFIF requires its APP0 right after SOI, so insert behind any APP0 segments
+    insert_at = 2
+    for marker, offset, length in _segments(data):
+        if marker != _APP0:
+            break
+        insert_at = offset + 2 + length
+    return data[:insert_at] + _minimal_exif(tag) + data[insert_at:]
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""ResultCache.py - Bounded LRU cache of processor results (Memoization)"""
+
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+def image_fingerprint(image: np.ndarray) -> str:
+    """
+    Content hash of an image (shape, dtype and pixels)
+
+    Args:
+        image: Image array
+
+    Returns:
+        Hex digest identifying the image content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.shape}|{image.dtype.str}".encode())
+    digest.update(memoryview(np.ascontiguousarray(image)).cast('B'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache mapping (input fingerprint, processor, config) to output images.
+    Evicts least recently used entries once the stored bytes exceed max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Upper bound on the total size of cached images
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Return the cached (read-only) result or None, updating hit/miss counters"""
+        image = self._entries.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def put(self, key: Hashable, image: np.ndarray):
+        """Store a result; images larger than the whole budget are not cached"""
+        if image is None or image.nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key).nbytes
+
+        stored = image.copy()
+        stored.setflags(write=False)
+        self._entries[key] = stored
+        self.current_bytes += stored.nbytes
+
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Counters and usage for display/diagnostics"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Tracing.py - Chrome trace / Perfetto recording of the processing pipelines
+
+Services and views wrap their stages in span(name, category): decode and
+encode (FileService), each processor step (ImageService), face detection,
+beautify, display conversion and Tk paint (views). While a TraceRecorder
+is active every span becomes a Chrome "complete" event on its thread's
+lane; otherwise span() returns a shared no-op context and records nothing.
+
+The saved trace.json opens in https://ui.perfetto.dev or chrome://tracing.
+
+    with Tracing.recording('trace.json'):
+        run_batch()
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+
+# Set to a path to record the whole application session into it (see AppMVC.py)
+PATH_ENV = 'IMAGE_EDITOR_TRACE'
+
+_NO_SPAN = nullcontext()
+
+
+class TraceRecorder:
+    """
+    Collects trace events from any thread. One recorder at a time is the
+    active one, the target of span() and instant().
+    """
+
+    _active: Optional['TraceRecorder'] = None
+    _active_lock = Lock()
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._lock = Lock()
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._named_threads = set()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    def _add(self, event: Dict[str, Any]):
+        """Append an event, naming the calling thread's lane on its first event"""
+        tid = threading.get_ident()
+        event['pid'] = self._pid
+        event['tid'] = tid
+        with self._lock:
+            if tid not in self._named_threads:
+                self._named_threads.add(tid)
+                self._events.append({'ph': 'M', 'name': 'thread_name', 'pid': self._pid, 'tid': tid,
+                                     'args': {'name': threading.current_thread().name}})
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str = 'app', **args: Any) -> Iterator[None]:
+        """Record the with-block as one span; an escaping exception is noted in its args"""
+        start = self._now_us()
+        try:
+            yield
+        except BaseException as e:
+            args['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            event = {'ph': 'X', 'name': name, 'cat': category, 'ts': start, 'dur': self._now_us() - start}
+            if args:
+                event['args'] = args
+            self._add(event)
+
+    def instant(self, name: str, category: str = 'app', **args: Any):
+        """Record a point in time (e.g. a dropped frame)"""
+        event = {'ph': 'i', 's': 't', 'name': name, 'cat': category, 'ts': self._now_us()}
+        if args:
+            event['args'] = args
+        self._add(event)
+
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._named_threads.clear()
+
+    def to_json(self, path: str):
+        """Write the events in Chrome trace format"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f, default=str)
+
+    @classmethod
+    def active(cls) -> Optional['TraceRecorder']:
+        return cls._active
+
+    @classmethod
+    def start(cls, recorder: Optional['TraceRecorder'] = None) -> 'TraceRecorder':
+        """Make recorder (a new one if None) the active recorder"""
+        with cls._active_lock:
+            cls._active = recorder if recorder is not None else cls()
+            return cls._active
+
+    @classmethod
+    def stop(cls) -> Optional['TraceRecorder']:
+        """Stop recording and return the recorder that was active"""
+        with cls._active_lock:
+            recorder, cls._active = cls._active, None
+            return recorder
+
+
+def span(name: str, category: str = 'app', **args: Any):
+    """Span on the active recorder, or a no-op context when not recording"""
+    recorder = TraceRecorder._active
+    if recorder is None:
+        return _NO_SPAN
+    return recorder.span(name, category, **args)
+
+
+def instant(name: str, category: str = 'app', **args: Any):
+    """Instant event on the active recorder, if any"""
+    recorder = TraceRecorder._active
+    if recorder is not None:
+        recorder.instant(name, category, **args)
+
+
+def is_recording() -> bool:
+    return TraceRecorder._active is not None
+
+
+@contextmanager
+def recording(path: str) -> Iterator[TraceRecorder]:
+    """Record everything inside the with-block and write it to path"""
+    recorder = TraceRecorder.start()
+    try:
+        yield recorder
+    finally:
+        TraceRecorder.stop()
+        recorder.to_json(path)
@@ -4,5 +4,9 @@
 from .ImageService import ImageService
 from .FileService import FileService
 from .FaceDetectionService import FaceDetectionService
+from .ResultCache import ResultCache
+from .Instrumentation import PerformanceMonitor, PerformanceStore, OperationSample
+from . import Tracing
 
-__all__ = ['ImageService', 'FileService', 'FaceDetectionService']
+__all__ = ['ImageService', 'FileService', 'FaceDetectionService', 'ResultCache',
+           'PerformanceMonitor', 'PerformanceStore', 'OperationSample', 'Tracing']
@@ -15,6 +15,8 @@ from PIL import Image, ImageTk
 import threading
 import queue
 import time
+from Models.Processors.Engines import SkinSmoothing
+from Services import Tracing
 
 
 class FaceBeautifyCameraView:
@@ -53,6 +55,9 @@ class FaceBeautifyCameraView:
         self.smooth_level = tk.DoubleVar(value=0.5)
         self.brightness_value = tk.IntVar(value=15)
 
+        # Fast edge-preserving engine for real-time smoothing (see SkinSmoothing.ENGINES)
+        self.smooth_engine = "half_resolution"
+
         self.captured_image = None
 
         # Optimize detection
@@ -190,7 +195,7 @@ class FaceBeautifyCameraView:
         self.update_status("✓ Camera đang chạy")
 
         # Start 2 threads: 1 for capture, 1 for display
-        threading.Thread(target=self.capture_video, daemon=True).start()
+        threading.Thread(target=self.capture_video, name="camera-capture", daemon=True).start()
         self.update_display()  # Run in main thread
 
     def stop_camera(self):
@@ -211,7 +216,8 @@ class FaceBeautifyCameraView:
     def capture_video(self):
         """Thread to capture video from camera"""
         while self.is_running and self.cap is not None:
-            ret, frame = self.cap.read()
+            with Tracing.span('camera_read', 'camera'):
+                ret, frame = self.cap.read()
 
             if not ret:
                 break
@@ -220,47 +226,49 @@ class FaceBeautifyCameraView:
 
             # Detect faces every few frames for real-time performance
             if self.frame_count % self.detection_interval == 0:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                # Apply histogram equalization for better detection
-                gray = cv2.equalizeHist(gray)
-
-                # Use multiple passes with different parameters for better accuracy
-                detected_faces = self.face_cascade.detectMultiScale(
-                    gray,
-                    scaleFactor=1.1,      # More sensitive (was 1.2)
-                    minNeighbors=5,       # Balanced detection (was 7 - too strict)
-                    minSize=(40, 40),     # Smaller minimum size (was 80x80)
-                    maxSize=(300, 300),   # Limit maximum size to reduce false positives from photos
-                    flags=cv2.CASCADE_SCALE_IMAGE
-                )
-
-                # Filter out unrealistic detections (too small or too large relative to frame)
-                if len(detected_faces) > 0:
-                    frame_area = gray.shape[0] * gray.shape[1]
-                    valid_faces = []
-                    for (x, y, w, h) in detected_faces:
-                        face_area = w * h
-                        # Face should be between 0.5% and 40% of frame
-                        if 0.005 < (face_area / frame_area) < 0.4:
-                            valid_faces.append((x, y, w, h))
-
-                    if len(valid_faces) > 0:
-                        self.faces = valid_faces
-                        self.last_valid_faces = valid_faces
-                    elif len(self.last_valid_faces) > 0:
-                        # Keep last valid detection for smoother tracking
-                        self.faces = self.last_valid_faces
-                else:
-                    # Keep last detection for a few frames to reduce jitter
-                    if self.frame_count % (self.detection_interval * 5) == 0:
-                        self.faces = []
-                        self.last_valid_faces = []
+                with Tracing.span('face_detection', 'faces'):
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    # Apply histogram equalization for better detection
+                    gray = cv2.equalizeHist(gray)
+
+                    # Use multiple passes with different parameters for better accuracy
+                    detected_faces = self.face_cascade.detectMultiScale(
+                        gray,
+                        scaleFactor=1.1,      # More sensitive (was 1.2)
+                        minNeighbors=5,       # Balanced detection (was 7 - too strict)
+                        minSize=(40, 40),     # Smaller minimum size (was 80x80)
+                        maxSize=(300, 300),   # Limit maximum size to reduce false positives from photos
+                        flags=cv2.CASCADE_SCALE_IMAGE
+                    )
+
+                    # Filter out unrealistic detections (too small or too large relative to frame)
+                    if len(detected_faces) > 0:
+                        frame_area = gray.shape[0] * gray.shape[1]
+                        valid_faces = []
+                        for (x, y, w, h) in detected_faces:
+                            face_area = w * h
+                            # Face should be between 0.5% and 40% of frame
+                            if 0.005 < (face_area / frame_area) < 0.4:
+                                valid_faces.append((x, y, w, h))
+
+                        if len(valid_faces) > 0:
+                            self.faces = valid_faces
+                            self.last_valid_faces = valid_faces
+                        elif len(self.last_valid_faces) > 0:
+                            # Keep last valid detection for smoother tracking
+                            self.faces = self.last_valid_faces
+                    else:
+                        # Keep last detection for a few frames to reduce jitter
+                        if self.frame_count % (self.detection_interval * 5) == 0:
+                            self.faces = []
+                            self.last_valid_faces = []
 
             self.frame_count += 1
 
             # Apply beautification
             if self.apply_beautify.get() and len(self.faces) > 0:
-                frame = self.apply_beautification(frame)
+                with Tracing.span('beautify', 'faces', faces=len(self.faces)):
+                    frame = self.apply_beautification(frame)
 
             # Draw rectangles
             if self.show_detection.get() and len(self.faces) > 0:
@@ -273,6 +281,8 @@ class FaceBeautifyCameraView:
             # Put frame into queue
             if not self.frame_queue.full():
                 self.frame_queue.put(frame)
+            else:
+                Tracing.instant('frame_dropped', 'camera')
 
             time.sleep(0.033)  # ~30 FPS
 
@@ -318,7 +328,7 @@ class FaceBeautifyCameraView:
                 d = int(9 + smooth * 15)
                 sigma_color = int(50 + smooth * 80)
                 sigma_space = int(50 + smooth * 80)
-                smoothed = cv2.bilateralFilter(face_roi, d, sigma_color, sigma_space)
+                smoothed = SkinSmoothing.smooth(face_roi, d, sigma_color, sigma_space, self.smooth_engine)
                 alpha = 0.3 + smooth * 0.5
                 face_roi = cv2.addWeighted(face_roi, 1-alpha, smoothed, alpha, 0)
 
@@ -333,24 +343,29 @@ class FaceBeautifyCameraView:
 
     def display_frame(self, frame):
         """Display frame"""
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w = frame_rgb.shape[:2]
-        max_width, max_height = 750, 600
-
-        aspect = w / h
-        if aspect > 1:
-            new_w = min(w, max_width)
-            new_h = int(new_w / aspect)
-        else:
-            new_h = min(h, max_height)
-            new_w = int(new_h * aspect)
-
-        frame_rgb = cv2.resize(frame_rgb, (new_w, new_h))
-        img = Image.fromarray(frame_rgb)
-        imgtk = ImageTk.PhotoImage(image=img)
-
-        self.video_label.imgtk = imgtk
-        self.video_label.configure(image=imgtk, text="")
+        with Tracing.span('display_conversion', 'display'):
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            h, w = frame_rgb.shape[:2]
+            max_width, max_height = 750, 600
+
+            aspect = w / h
+            if aspect > 1:
+                new_w = min(w, max_width)
+                new_h = int(new_w / aspect)
+            else:
+                new_h = min(h, max_height)
+                new_w = int(new_h * aspect)
+
+            frame_rgb = cv2.resize(frame_rgb, (new_w, new_h))
+            img = Image.fromarray(frame_rgb)
+            imgtk = ImageTk.PhotoImage(image=img)
+
+        # Tk repaints when idle; while tracing, force the redraw so the span covers it
+        with Tracing.span('tk_paint', 'display'):
+            self.video_label.imgtk = imgtk
+            self.video_label.configure(image=imgtk, text="")
+            if Tracing.is_recording():
+                self.video_label.update_idletasks()
 
     def capture_image(self):
         """Capture image"""
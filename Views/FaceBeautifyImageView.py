@@ -12,6 +12,8 @@ from tkinter import ttk, messagebox
 import cv2
 import numpy as np
 from PIL import Image, ImageTk
+import threading
+import queue
 from Features import FaceBeautify
 
 
@@ -37,6 +39,24 @@ class FaceBeautifyImageView:
         self.DEFAULT_BRIGHTNESS = 20
         self.DEFAULT_CONTRAST = 1.2
 
+        # Slider rendering: debounce delay and display-size preview limits
+        self.DEBOUNCE_MS = 150
+        self.PREVIEW_MAX_WIDTH = 700
+        self.PREVIEW_MAX_HEIGHT = 550
+
+        # Progressive rendering state (preview first, full resolution in background)
+        self.pending_slider_job = None
+        self.pending_slider_command = None
+        self.render_generation = 0
+        self.render_jobs = 0
+        self.latest_render = None
+        self.render_queue = queue.Queue()
+        # Latest full resolution job not yet started; one worker drains it at a time
+        self.render_lock = threading.Lock()
+        self.render_slot = None
+        self.render_worker_busy = False
+        self.proxy_cache = None
+
         # Create window
         self.window = tk.Toplevel(parent_controller.root)
         self.window.title("Nhận Diện và Làm Đẹp Khuôn Mặt - Từ Ảnh")
@@ -207,7 +227,7 @@ class FaceBeautifyImageView:
         label.pack(anchor="w")
 
         slider = ttk.Scale(frame, from_=from_, to=to, variable=variable,
-                          orient=tk.HORIZONTAL, command=lambda v: command())
+                          orient=tk.HORIZONTAL, command=lambda v: self.schedule_slider_update(command))
         slider.pack(fill=tk.X, pady=5)
 
         value_label = tk.Label(frame, textvariable=variable, font=("Arial", 8),
@@ -220,14 +240,15 @@ class FaceBeautifyImageView:
         self.status_label.config(text=message)
         self.window.update_idletasks()
 
-    def display_current_image(self):
-        if self.current_image is None:
+    def display_current_image(self, image=None):
+        image = self.current_image if image is None else image
+        if image is None:
             return
 
-        image_rgb = cv2.cvtColor(self.current_image, cv2.COLOR_BGR2RGB)
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         h, w = image_rgb.shape[:2]
 
-        max_width, max_height = 700, 550
+        max_width, max_height = self.PREVIEW_MAX_WIDTH, self.PREVIEW_MAX_HEIGHT
         aspect = w / h
 
         if w > max_width or h > max_height:
@@ -245,6 +266,133 @@ class FaceBeautifyImageView:
         self.image_label.configure(image=self.display_image, text="")
         self.image_label.image = self.display_image
 
+    # === PROGRESSIVE RENDERING ===
+
+    def schedule_slider_update(self, command):
+        """Debounce slider ticks: only the last position within DEBOUNCE_MS is rendered"""
+        if self.pending_slider_job is not None:
+            self.window.after_cancel(self.pending_slider_job)
+        self.pending_slider_command = command
+        self.pending_slider_job = self.window.after(self.DEBOUNCE_MS, self._run_slider_update)
+
+    def _run_slider_update(self):
+        self.pending_slider_job = None
+        self.pending_slider_command()
+
+    def cancel_render(self):
+        """Cancel pending slider updates and discard in-flight full resolution renders"""
+        if self.pending_slider_job is not None:
+            self.window.after_cancel(self.pending_slider_job)
+            self.pending_slider_job = None
+        self.render_generation += 1
+        self.latest_render = None
+
+    def get_proxy(self):
+        """
+        Get display-size copy of the original image with face rectangles scaled to it
+
+        Returns:
+            Tuple of (proxy_image, proxy_faces)
+        """
+        if self.proxy_cache is not None and self.proxy_cache[0] is self.faces:
+            return self.proxy_cache[1], self.proxy_cache[2]
+
+        h, w = self.original_image.shape[:2]
+        scale = min(self.PREVIEW_MAX_WIDTH / w, self.PREVIEW_MAX_HEIGHT / h, 1.0)
+
+        if scale < 1.0:
+            proxy = cv2.resize(self.original_image, (max(1, int(w * scale)), max(1, int(h * scale))),
+                               interpolation=cv2.INTER_AREA)
+            proxy_faces = [(int(x * scale), int(y * scale), max(1, int(fw * scale)), max(1, int(fh * scale)))
+                           for (x, y, fw, fh) in self.faces]
+        else:
+            proxy = self.original_image
+            proxy_faces = list(self.faces)
+
+        self.proxy_cache = (self.faces, proxy, proxy_faces)
+        return proxy, proxy_faces
+
+    def render_progressive(self, render, status_message):
+        """
+        Render an effect on a display-size proxy immediately, then refine at full
+        resolution in a background thread. Only one full resolution render runs
+        at a time; a newer request replaces one that has not started yet.
+
+        Args:
+            render: Callable (image, faces) -> image applying the effect
+            status_message: Status shown once the full resolution result is ready
+        """
+        self.cancel_render()
+        generation = self.render_generation
+        self.latest_render = render
+
+        proxy, proxy_faces = self.get_proxy()
+        self.display_current_image(render(proxy.copy(), proxy_faces))
+        self.update_status(f"{status_message} (đang xử lý...)")
+
+        job = (generation, render, self.original_image, list(self.faces), status_message)
+        with self.render_lock:
+            replaced = self.render_slot is not None
+            self.render_slot = job
+            start_worker = not self.render_worker_busy
+            self.render_worker_busy = True
+
+        # A replaced job never reports back, so the new one takes over its place in render_jobs
+        if not replaced:
+            if self.render_jobs == 0:
+                self.window.after(30, self._poll_render_queue)
+            self.render_jobs += 1
+        if start_worker:
+            threading.Thread(target=self._render_worker, daemon=True).start()
+
+    def _render_worker(self):
+        """Worker thread: render the latest job until none is left, skipping stale ones"""
+        while True:
+            with self.render_lock:
+                job, self.render_slot = self.render_slot, None
+                if job is None:
+                    self.render_worker_busy = False
+                    return
+            generation, render, original, faces, status_message = job
+            result = None
+            if generation == self.render_generation:
+                result = render(original.copy(), faces)
+                if generation != self.render_generation:
+                    result = None
+            self.render_queue.put((generation, result, status_message))
+
+    def _poll_render_queue(self):
+        """Main thread: apply finished full resolution renders (Tk is not thread-safe)"""
+        try:
+            if not self.window.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        while not self.render_queue.empty():
+            generation, result, status_message = self.render_queue.get_nowait()
+            self.render_jobs -= 1
+            if result is not None and generation == self.render_generation:
+                self.current_image = result
+                self.latest_render = None
+                self.display_current_image()
+                self.update_status(status_message)
+
+        if self.render_jobs > 0:
+            self.window.after(30, self._poll_render_queue)
+
+    def finish_pending_render(self):
+        """Render any pending or in-flight slider change synchronously"""
+        if self.pending_slider_job is not None:
+            self.window.after_cancel(self.pending_slider_job)
+            self.pending_slider_job = None
+            self.pending_slider_command()
+        render = self.latest_render
+        if render is not None:
+            self.render_generation += 1
+            self.latest_render = None
+            self.current_image = render(self.original_image.copy(), self.faces)
+
     def check_image(self):
         if self.current_image is None:
             messagebox.showwarning("Cảnh báo", "Không có ảnh để xử lý!")
@@ -262,6 +410,8 @@ class FaceBeautifyImageView:
         if not self.check_image():
             return
 
+        # Detect on the up-to-date image; a late render would overwrite the new rectangles
+        self.finish_pending_render()
         self.faces = FaceBeautify.detect_faces(self.current_image)
 
         if len(self.faces) > 0:
@@ -276,6 +426,7 @@ class FaceBeautifyImageView:
         if not self.check_image():
             return
 
+        self.cancel_render()
         self.current_image = self.original_image.copy()
         self.faces = FaceBeautify.detect_faces(self.current_image)
 
@@ -293,6 +444,7 @@ class FaceBeautifyImageView:
         if not self.check_image():
             return
 
+        self.cancel_render()
         self.current_image = self.original_image.copy()
         self.faces = []
         self.display_current_image()
@@ -302,6 +454,7 @@ class FaceBeautifyImageView:
         if not self.check_image() or not self.check_faces_detected():
             return
 
+        self.cancel_render()
         self.current_image = self.original_image.copy()
         self.current_image = FaceBeautify.beautify_face_auto(self.current_image, self.faces)
         self.display_current_image()
@@ -311,36 +464,37 @@ class FaceBeautifyImageView:
         if not self.check_image() or not self.check_faces_detected():
             return
 
-        self.current_image = self.original_image.copy()
-        self.current_image = FaceBeautify.smooth_skin(self.current_image, self.faces,
-                                                      smooth_level=self.smooth_level.get())
-        self.display_current_image()
-        self.update_status(f"✓ Làm mịn da: {self.smooth_level.get():.2f}")
+        smooth_level = self.smooth_level.get()
+        self.render_progressive(
+            lambda image, faces: FaceBeautify.smooth_skin(image, faces, smooth_level=smooth_level),
+            f"✓ Làm mịn da: {smooth_level:.2f}"
+        )
 
     def apply_brighten(self):
         if not self.check_image() or not self.check_faces_detected():
             return
 
-        self.current_image = self.original_image.copy()
-        self.current_image = FaceBeautify.brighten_face(self.current_image, self.faces,
-                                                        brightness_value=self.brightness_value.get())
-        self.display_current_image()
-        self.update_status(f"✓ Độ sáng: {self.brightness_value.get()}")
+        brightness_value = self.brightness_value.get()
+        self.render_progressive(
+            lambda image, faces: FaceBeautify.brighten_face(image, faces, brightness_value=brightness_value),
+            f"✓ Độ sáng: {brightness_value}"
+        )
 
     def apply_contrast(self):
         if not self.check_image() or not self.check_faces_detected():
             return
 
-        self.current_image = self.original_image.copy()
-        self.current_image = FaceBeautify.enhance_face_contrast(self.current_image, self.faces,
-                                                                contrast=self.contrast_value.get())
-        self.display_current_image()
-        self.update_status(f"✓ Tương phản: {self.contrast_value.get():.2f}")
+        contrast = self.contrast_value.get()
+        self.render_progressive(
+            lambda image, faces: FaceBeautify.enhance_face_contrast(image, faces, contrast=contrast),
+            f"✓ Tương phản: {contrast:.2f}"
+        )
 
     def apply_blur_bg(self):
         if not self.check_image() or not self.check_faces_detected():
             return
 
+        self.cancel_render()
         self.current_image = self.original_image.copy()
         self.current_image = FaceBeautify.apply_blur_background(self.current_image, self.faces)
         self.display_current_image()
@@ -350,6 +504,7 @@ class FaceBeautifyImageView:
         if not self.check_image():
             return
 
+        self.cancel_render()
         self.current_image = self.original_image.copy()
         self.current_image = FaceBeautify.add_soft_filter(self.current_image, intensity=0.3)
         self.display_current_image()
@@ -359,6 +514,7 @@ class FaceBeautifyImageView:
         if not self.check_image() or not self.check_faces_detected():
             return
 
+        self.cancel_render()
         self.current_image = self.original_image.copy()
         self.current_image = FaceBeautify.remove_blemishes(self.current_image, self.faces)
         self.display_current_image()
@@ -369,6 +525,7 @@ class FaceBeautifyImageView:
         if not self.check_image():
             return
 
+        self.cancel_render()
         self.current_image = self.original_image.copy()
 
         if len(self.faces) > 0:
@@ -386,6 +543,8 @@ class FaceBeautifyImageView:
         if not self.check_image():
             return
 
+        self.finish_pending_render()
+
         result = messagebox.askyesno(
             "Xác nhận",
             "Áp dụng các thay đổi vào ảnh chính?\n(Ảnh trong cửa sổ chính sẽ được cập nhật)"
@@ -2,12 +2,14 @@
 """MainView.py - Main UI View (MVC Pattern)"""
 
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import ttk, messagebox
 from PIL import Image, ImageDraw, ImageTk
 import cv2
 import numpy as np
 from typing import Optional, Callable, Dict, Any
 from UI import Button, Section, Layout, Colors
+from Services import Tracing
+from .Viewport import Viewport
 
 
 class MainView:
@@ -36,6 +38,18 @@ class MainView:
         # Icons for undo/redo
         self.icons = {}
 
+        # Zoom/pan state of the image display (never changes the image itself)
+        self.viewport = Viewport()
+        self._display_source = None
+        self._display_size = (800, 600)
+        self._drag_origin = None
+
+        # Performance panel (a separate window, created on first open)
+        self.performance_window = None
+        self.performance_table = None
+        self.performance_toggle_button = None
+        self.trace_toggle_button = None
+
         # Section frames for collapsible sections
         self.blur_frame = None
         self.brightness_frame = None
@@ -252,6 +266,16 @@ class MainView:
             pady_top=5
         )
 
+        Button.create_button(
+            scrollable_frame,
+            text="📊 Hiệu Năng (Performance)",
+            command=callbacks.get('open_performance_panel'),
+            bg="#455a64",
+            font_size=11,
+            bold=True,
+            pady_top=5
+        )
+
         Section.create_separator(scrollable_frame)
 
         # === CONTROL BUTTONS ===
@@ -308,6 +332,7 @@ class MainView:
         # === RIGHT PANEL - Image Display ===
         right_panel = Layout.create_right_panel(main_container)
         self.image_label = Layout.create_image_label(right_panel)
+        self._bind_viewport_events()
 
         # === STATUS BAR ===
         self.status_label = Layout.create_status_bar(self.root)
@@ -324,28 +349,76 @@ class MainView:
         if image is None:
             return
 
-        # Convert BGR to RGB
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        self._display_source = image
+        self._display_size = (max_width, max_height)
+        self._render_display()
 
-        # Resize for display
-        h, w = rgb_image.shape[:2]
-        scale = min(max_width / w, max_height / h, 1.0)
-
-        if scale < 1.0:
-            new_w = int(w * scale)
-            new_h = int(h * scale)
-            rgb_image = cv2.resize(rgb_image, (new_w, new_h), interpolation=cv2.INTER_AREA)
-
-        # Convert to PhotoImage
-        pil_image = Image.fromarray(rgb_image)
-        photo = ImageTk.PhotoImage(pil_image)
+    def _render_display(self):
+        """Render the visible part of the displayed image at display size"""
+        if self._display_source is None:
+            return
 
-        # Update label
-        self.image_label.config(image=photo, text="")
-        self.image_label.image = photo  # Keep reference
+        with Tracing.span('display_conversion', 'display'):
+            # Crop + resample only the visible region, then convert the small result
+            visible = self.viewport.render(self._display_source, *self._display_size)
+            rgb_image = cv2.cvtColor(visible, cv2.COLOR_BGR2RGB) if visible.ndim == 3 else visible
+
+            # Convert to PhotoImage
+            pil_image = Image.fromarray(rgb_image)
+            photo = ImageTk.PhotoImage(pil_image)
+
+        # Update label; Tk repaints it when idle, so a trace forces the redraw inside the span
+        with Tracing.span('tk_paint', 'display'):
+            self.image_label.config(image=photo, text="")
+            self.image_label.image = photo  # Keep reference
+            if Tracing.is_recording():
+                self.image_label.update_idletasks()
+
+    # === VIEWPORT (ZOOM / PAN) ===
+
+    def _bind_viewport_events(self):
+        """Drag to pan, mouse wheel to zoom"""
+        self.image_label.bind("<ButtonPress-1>", self._on_drag_start)
+        self.image_label.bind("<B1-Motion>", self._on_drag)
+        self.image_label.bind("<ButtonRelease-1>", lambda e: setattr(self, '_drag_origin', None))
+        self.image_label.bind("<MouseWheel>", lambda e: self.zoom_in() if e.delta > 0 else self.zoom_out())
+        self.image_label.bind("<Button-4>", lambda e: self.zoom_in())   # X11 wheel up
+        self.image_label.bind("<Button-5>", lambda e: self.zoom_out())  # X11 wheel down
+
+    def _on_drag_start(self, event):
+        self._drag_origin = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag_origin is None or self._display_source is None:
+            return
+        dx, dy = event.x - self._drag_origin[0], event.y - self._drag_origin[1]
+        self._drag_origin = (event.x, event.y)
+        h, w = self._display_source.shape[:2]
+        self.viewport.pan(dx, dy, w, h, *self._display_size)
+        self._render_display()
+
+    def zoom_in(self):
+        """Magnify the display around the visible centre"""
+        self.viewport.zoom_in()
+        self._render_display()
+
+    def zoom_out(self):
+        """Shrink the display around the visible centre"""
+        self.viewport.zoom_out()
+        self._render_display()
+
+    def reset_zoom(self):
+        """Show the whole image again"""
+        self.viewport.reset()
+        self._render_display()
+
+    def get_zoom(self) -> float:
+        """Zoom relative to fit-to-window (1.0 = whole image visible)"""
+        return self.viewport.zoom
 
     def clear_image_display(self):
         """Clear image display and show placeholder"""
+        self._display_source = None
         self.image_label.config(
             image='',
             text="Chưa có ảnh\n\n📷\n\nVui lòng chọn ảnh để bắt đầu"
@@ -362,6 +435,91 @@ class MainView:
         self.undo_button.config(state=tk.NORMAL if can_undo else tk.DISABLED)
         self.redo_button.config(state=tk.NORMAL if can_redo else tk.DISABLED)
 
+    # Columns of the performance panel: (summary key, heading, width, format)
+    PERFORMANCE_COLUMNS = (
+        ('operation', "Thao tác", 170, "{}"),
+        ('count', "Số lần", 55, "{}"),
+        ('errors', "Lỗi", 40, "{}"),
+        ('wall_p50_ms', "p50 ms", 70, "{:.1f}"),
+        ('wall_p95_ms', "p95 ms", 70, "{:.1f}"),
+        ('wall_p99_ms', "p99 ms", 70, "{:.1f}"),
+        ('cpu_p50_ms', "CPU p50 ms", 80, "{:.1f}"),
+        ('alloc_p95_bytes', "Cấp phát p95 MB", 105, "{:.1f}"),
+        ('rss_max_delta_bytes', "RSS tăng MB", 85, "{:.1f}"),
+        ('megapixels_per_s', "MP/s", 65, "{:.1f}"),
+    )
+
+    def show_performance_panel(self, callbacks: Dict[str, Callable]):
+        """
+        Open (or raise) the Performance panel
+
+        Args:
+            callbacks: 'toggle', 'refresh', 'clear', 'export_csv', 'export_json', 'toggle_trace'
+        """
+        if self.performance_window is not None and self.performance_window.winfo_exists():
+            self.performance_window.lift()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Hiệu Năng (Performance)")
+        window.geometry("860x360")
+        window.configure(bg="#16213e")
+        self.performance_window = window
+
+        button_bar = tk.Frame(window, bg="#16213e")
+        button_bar.pack(fill=tk.X, padx=8, pady=6)
+        self.performance_toggle_button = Button.create_control_button(
+            button_bar, text="▶ Bật đo", command=callbacks.get('toggle'), bg=Colors.get_color('success'), width=12)
+        self.performance_toggle_button.pack(side=tk.LEFT, padx=4)
+        for text, key, color in (("🔄 Làm mới", 'refresh', Colors.get_color('info')),
+                                 ("🗑 Xoá", 'clear', Colors.get_color('danger')),
+                                 ("💾 CSV", 'export_csv', Colors.get_color('primary')),
+                                 ("💾 JSON", 'export_json', Colors.get_color('primary'))):
+            Button.create_control_button(button_bar, text=text, command=callbacks.get(key),
+                                         bg=color, width=10).pack(side=tk.LEFT, padx=4)
+        self.trace_toggle_button = Button.create_control_button(
+            button_bar, text="⏺ Ghi trace", command=callbacks.get('toggle_trace'),
+            bg=Colors.get_color('success'), width=12)
+        self.trace_toggle_button.pack(side=tk.RIGHT, padx=4)
+
+        columns = [key for key, _, _, _ in self.PERFORMANCE_COLUMNS]
+        table = ttk.Treeview(window, columns=columns, show='headings')
+        for key, heading, width, _ in self.PERFORMANCE_COLUMNS:
+            table.heading(key, text=heading)
+            table.column(key, width=width, anchor=tk.W if key == 'operation' else tk.E)
+        table.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
+        self.performance_table = table
+
+    def is_performance_panel_open(self) -> bool:
+        return self.performance_window is not None and self.performance_window.winfo_exists()
+
+    def update_performance_panel(self, rows: list, enabled: bool, tracing: bool = False):
+        """
+        Show summary rows (see PerformanceStore.summary) and the measuring/tracing state
+        """
+        if not self.is_performance_panel_open():
+            return
+        self.performance_toggle_button.config(
+            text="⏸ Tắt đo" if enabled else "▶ Bật đo",
+            bg=Colors.get_color('warning') if enabled else Colors.get_color('success'))
+        self.trace_toggle_button.config(
+            text="⏹ Dừng & lưu trace" if tracing else "⏺ Ghi trace",
+            bg=Colors.get_color('danger') if tracing else Colors.get_color('success'))
+
+        table = self.performance_table
+        table.delete(*table.get_children())
+        for row in rows:
+            values = []
+            for key, _, _, fmt in self.PERFORMANCE_COLUMNS:
+                value = row.get(key)
+                if value is None:
+                    values.append("-")
+                    continue
+                if key.endswith('_bytes'):
+                    value = value / 2**20
+                values.append(fmt.format(value))
+            table.insert('', tk.END, values=values)
+
     def show_error(self, title: str, message: str):
         """Show error message box"""
         messagebox.showerror(title, message)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Viewport.py - Non-destructive zoom and pan for image display"""
+
+import cv2
+import numpy as np
+from typing import Tuple
+
+
+class Viewport:
+    """
+    Zoom level and centre of the visible part of an image.
+
+    Zooming never touches the image itself: render() crops the visible
+    rectangle and resamples only that crop to the display size, so the
+    cost depends on the display size, not the image size.
+    """
+
+    ZOOM_STEP = 1.3
+    MIN_ZOOM = 0.1
+    MAX_ZOOM = 32.0
+
+    def __init__(self):
+        self.zoom = 1.0          # Relative to the fit-to-display scale
+        self.center = (0.5, 0.5)  # Visible centre as a fraction of (width, height)
+
+    def reset(self):
+        self.zoom = 1.0
+        self.center = (0.5, 0.5)
+
+    def zoom_in(self):
+        self.set_zoom(self.zoom * self.ZOOM_STEP)
+
+    def zoom_out(self):
+        self.set_zoom(self.zoom / self.ZOOM_STEP)
+
+    def set_zoom(self, zoom: float):
+        self.zoom = min(max(zoom, self.MIN_ZOOM), self.MAX_ZOOM)
+
+    @staticmethod
+    def fit_scale(width: int, height: int, max_width: int, max_height: int) -> float:
+        """Scale at which the whole image fits the display (never enlarges)"""
+        return min(max_width / width, max_height / height, 1.0)
+
+    def scale(self, width: int, height: int, max_width: int, max_height: int) -> float:
+        """Display pixels per image pixel"""
+        return self.fit_scale(width, height, max_width, max_height) * self.zoom
+
+    def pan(self, dx: float, dy: float, width: int, height: int, max_width: int, max_height: int):
+        """
+        Move the view by a drag of (dx, dy) display pixels
+
+        Dragging right shows more of the left side, like moving the image.
+        """
+        s = self.scale(width, height, max_width, max_height)
+        cx, cy = self.center
+        self.center = (cx - dx / (s * width), cy - dy / (s * height))
+
+    def visible_rect(self, width: int, height: int,
+                     max_width: int, max_height: int) -> Tuple[Tuple[float, float, float, float], Tuple[int, int]]:
+        """
+        Visible part of the image and the size it is displayed at
+
+        Returns:
+            ((x0, y0, x1, y1) in image pixels, (display_width, display_height))
+        """
+        s = self.scale(width, height, max_width, max_height)
+        out_w = max(1, min(int(width * s), max_width))
+        out_h = max(1, min(int(height * s), max_height))
+        view_w, view_h = min(out_w / s, width), min(out_h / s, height)
+
+        # Keep the rectangle inside the image and remember the clamped centre
+        cx = min(max(self.center[0] * width, view_w / 2), width - view_w / 2)
+        cy = min(max(self.center[1] * height, view_h / 2), height - view_h / 2)
+        self.center = (cx / width, cy / height)
+        rect = (cx - view_w / 2, cy - view_h / 2, cx + view_w / 2, cy + view_h / 2)
+        return rect, (out_w, out_h)
+
+    def render(self, image: np.ndarray, max_width: int, max_height: int) -> np.ndarray:
+        """
+        Display-sized rendering of the visible part of image
+
+        Args:
+            image: Full image (not modified)
+            max_width: Display width
+            max_height: Display height
+
+        Returns:
+            New array of at most max_width x max_height pixels
+        """
+        h, w = image.shape[:2]
+        (x0, y0, x1, y1), (out_w, out_h) = self.visible_rect(w, h, max_width, max_height)
+        left, top = int(x0), int(y0)
+        crop = image[top:int(np.ceil(y1)), left:int(np.ceil(x1))]
+        if crop.shape[1] == out_w and crop.shape[0] == out_h:
+            return crop.copy()
+
+        s = self.scale(w, h, max_width, max_height)
+        if s <= 1.0:
+            return cv2.resize(crop, (out_w, out_h), interpolation=cv2.INTER_AREA)
+        # Magnified: one source pixel spans several display pixels, so map the
+        # sub-pixel rectangle exactly (display pixel centre -> source position)
+        offset = 0.5 / s - 0.5
+        inverse = np.float32([[1 / s, 0, x0 - left + offset], [0, 1 / s, y0 - top + offset]])
+        return cv2.warpAffine(crop, inverse, (out_w, out_h),
+                              flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                              borderMode=cv2.BORDER_REPLICATE)
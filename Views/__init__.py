@@ -4,5 +4,6 @@
 from .MainView import MainView
 from .FaceBeautifyImageView import FaceBeautifyImageView
 from .FaceBeautifyCameraView import FaceBeautifyCameraView
+from .Viewport import Viewport
 
-__all__ = ['MainView', 'FaceBeautifyImageView', 'FaceBeautifyCameraView']
+__all__ = ['MainView', 'FaceBeautifyImageView', 'FaceBeautifyCameraView', 'Viewport']